@@ -0,0 +1,46 @@
+"""add_load_checkpoints
+
+Revision ID: 3f2a8c1d9b47
+Revises: 67daed722540
+Create Date: 2026-10-16 10:12:31.482115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a8c1d9b47'
+down_revision: Union[str, Sequence[str], None] = '67daed722540'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('load_checkpoints',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('stream_key', sa.String(), nullable=False),
+    sa.Column('shard', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('last_page', sa.Integer(), nullable=False),
+    sa.Column('committed_pages', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('end_page', sa.Integer(), nullable=True),
+    sa.Column('pages', sa.Integer(), nullable=False),
+    sa.Column('loaded', sa.Integer(), nullable=False),
+    sa.Column('skipped', sa.Integer(), nullable=False),
+    sa.Column('errors', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_load_checkpoints_stream_key'), 'load_checkpoints', ['stream_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_load_checkpoints_stream_key'), table_name='load_checkpoints')
+    op.drop_table('load_checkpoints')
@@ -0,0 +1,47 @@
+"""add_raw_data_staging
+
+Revision ID: 8b1e4d7c2a93
+Revises: 3f2a8c1d9b47
+Create Date: 2026-10-16 13:41:07.215903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4d7c2a93'
+down_revision: Union[str, Sequence[str], None] = '3f2a8c1d9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('raw_data_staging',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('batch', sa.String(), nullable=False),
+    sa.Column('stream_key', sa.String(), nullable=False),
+    sa.Column('page', sa.Integer(), nullable=False),
+    sa.Column('inner_id', sa.String(), nullable=False),
+    sa.Column('change_type', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('first_loaded_at', sa.DateTime(), nullable=False),
+    sa.Column('last_updated_at', sa.DateTime(), nullable=False),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('active_status', sa.Integer(), nullable=False),
+    sa.Column('is_processed', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    prefixes=['UNLOGGED']
+    )
+    op.create_index('idx_raw_data_staging_batch', 'raw_data_staging', ['batch'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_raw_data_staging_batch', table_name='raw_data_staging')
+    op.drop_table('raw_data_staging')
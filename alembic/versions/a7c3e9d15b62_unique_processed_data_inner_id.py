@@ -0,0 +1,40 @@
+"""unique_processed_data_inner_id
+
+Revision ID: a7c3e9d15b62
+Revises: f2d94b7e6a18
+Create Date: 2026-10-16 19:12:40.518733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9d15b62'
+down_revision: Union[str, Sequence[str], None] = 'f2d94b7e6a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep only the most recently normalized row of each listing
+    op.execute("""
+        DELETE FROM processed_data p
+        USING processed_data q
+        WHERE p.inner_id = q.inner_id
+          AND (p.updated_at, p.id) < (q.updated_at, q.id)
+    """)
+    # Two plain indexes on inner_id are replaced by one unique index
+    op.drop_index('idx_processed_data_inner_id', table_name='processed_data')
+    op.drop_index(op.f('ix_processed_data_inner_id'), table_name='processed_data')
+    op.create_index(op.f('ix_processed_data_inner_id'), 'processed_data', ['inner_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_processed_data_inner_id'), table_name='processed_data')
+    op.create_index(op.f('ix_processed_data_inner_id'), 'processed_data', ['inner_id'], unique=False)
+    op.create_index('idx_processed_data_inner_id', 'processed_data', ['inner_id'], unique=False)
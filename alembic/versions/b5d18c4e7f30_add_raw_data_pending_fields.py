@@ -0,0 +1,30 @@
+"""add_raw_data_pending_fields
+
+Revision ID: b5d18c4e7f30
+Revises: a7c3e9d15b62
+Create Date: 2026-10-16 20:26:07.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d18c4e7f30'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e9d15b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL for existing rows: pending records get a full normalization
+    op.add_column('raw_data', sa.Column('pending_fields', postgresql.ARRAY(sa.String()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('raw_data', 'pending_fields')
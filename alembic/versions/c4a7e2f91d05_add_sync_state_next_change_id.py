@@ -0,0 +1,28 @@
+"""add_sync_state_next_change_id
+
+Revision ID: c4a7e2f91d05
+Revises: 8b1e4d7c2a93
+Create Date: 2026-10-16 16:05:48.337201
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e2f91d05'
+down_revision: Union[str, Sequence[str], None] = '8b1e4d7c2a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sync_state', sa.Column('next_change_id', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('sync_state', 'next_change_id')
@@ -0,0 +1,42 @@
+"""add_raw_changes
+
+Revision ID: e81b3f6a2c47
+Revises: c4a7e2f91d05
+Create Date: 2026-10-16 17:22:10.904316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81b3f6a2c47'
+down_revision: Union[str, Sequence[str], None] = 'c4a7e2f91d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('raw_changes',
+    sa.Column('event_date', sa.Date(), nullable=False),
+    sa.Column('change_id', sa.BigInteger(), nullable=False),
+    sa.Column('inner_id', sa.String(), nullable=False),
+    sa.Column('change_type', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('recorded_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('event_date', 'change_id'),
+    postgresql_partition_by='RANGE (event_date)'
+    )
+    op.create_index('idx_raw_changes_inner_id', 'raw_changes', ['inner_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_raw_changes_inner_id', table_name='raw_changes')
+    # Drops the monthly partitions too
+    op.drop_table('raw_changes')
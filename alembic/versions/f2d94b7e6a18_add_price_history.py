@@ -0,0 +1,59 @@
+"""add_price_history
+
+Revision ID: f2d94b7e6a18
+Revises: e81b3f6a2c47
+Create Date: 2026-10-16 18:03:55.129470
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d94b7e6a18'
+down_revision: Union[str, Sequence[str], None] = 'e81b3f6a2c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('price_history',
+    sa.Column('inner_id', sa.String(), nullable=False),
+    sa.Column('recorded_at', postgresql.ARRAY(sa.DateTime()), nullable=False),
+    sa.Column('prices', postgresql.ARRAY(sa.Integer()), nullable=False),
+    sa.Column('first_price', sa.Integer(), nullable=False),
+    sa.Column('current_price', sa.Integer(), nullable=False),
+    sa.Column('price_drops', sa.Integer(), nullable=False),
+    sa.Column('last_drop_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('inner_id')
+    )
+    op.create_index('idx_price_history_last_drop_at', 'price_history', ['last_drop_at'], unique=False)
+    op.create_index('idx_price_history_current_price', 'price_history', ['current_price'], unique=False)
+
+    # Seed one point per listing from the price currently stored in raw_data
+    op.execute("""
+        INSERT INTO price_history
+            (inner_id, recorded_at, prices, first_price, current_price, price_drops, last_drop_at, updated_at)
+        SELECT inner_id, ARRAY[last_updated_at], ARRAY[price], price, price, 0, NULL, now()
+        FROM (
+            SELECT inner_id, last_updated_at,
+                   CASE WHEN length(digits) BETWEEN 1 AND 9 THEN digits::int END AS price
+            FROM (
+                SELECT inner_id, last_updated_at, regexp_replace(data->>'price', '[^0-9]', '', 'g') AS digits
+                FROM raw_data
+            ) AS d
+        ) AS p
+        WHERE price > 0
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_price_history_current_price', table_name='price_history')
+    op.drop_index('idx_price_history_last_drop_at', table_name='price_history')
+    op.drop_table('price_history')
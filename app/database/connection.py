@@ -3,6 +3,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from typing import AsyncGenerator
 
+from app.utils import json_codec
 from app.utils.config import env_config
 # Import models to ensure they are registered with Base
 from app.database import models  # noqa: F401
@@ -26,6 +27,9 @@ engine = create_async_engine(
     pool_pre_ping=True,  # Verify connections before using
     pool_size=10,
     max_overflow=20,
+    # JSONB values (full offer data) go through the configured fast codec
+    json_serializer=json_codec.dumps,
+    json_deserializer=json_codec.loads,
 )
 
 # Create async session factory
@@ -6,7 +6,7 @@ from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime, Text, Date, BigInteger,
     Index, UniqueConstraint, Float
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -24,9 +24,11 @@ class RawData(Base):
     data = Column(JSONB, nullable=False)  # Full offer data as JSON
     first_loaded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     last_updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
-    source = Column(String, nullable=False)  # "initial_load" or "daily_update"
+    source = Column(String, nullable=False)  # "initial_load", "daily_update" or "csv_import"
     active_status = Column(Integer, nullable=False, default=0)  # 0 = active, 1 = inactive
     is_processed = Column(Boolean, nullable=False, default=False)
+    # Top-level data fields changed since last normalization (NULL = full normalization)
+    pending_fields = Column(ARRAY(String), nullable=True)
     
     # Indexes
     __table_args__ = (
@@ -43,7 +45,7 @@ class ProcessedData(Base):
     __tablename__ = "processed_data"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    inner_id = Column(String, nullable=False, index=True)  # Link to raw_data by inner_id
+    inner_id = Column(String, unique=True, nullable=False, index=True)  # Link to raw_data by inner_id
     active_status = Column(Integer, nullable=False, default=0)  # 0 = active, 1 = inactive
     created_at = Column(DateTime, nullable=False)  # Date from raw_data.created_at
     
@@ -77,7 +79,6 @@ class ProcessedData(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_processed_data_inner_id', 'inner_id'),
         Index('idx_processed_data_active_status', 'active_status'),
         Index('idx_processed_data_mark', 'mark'),
         Index('idx_processed_data_model', 'model'),
@@ -133,9 +134,99 @@ class SyncState(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     last_successful_date = Column(Date, nullable=False, index=True)
     last_change_id = Column(BigInteger, nullable=True)
+    next_change_id = Column(BigInteger, nullable=True)  # Feed cursor to continue from (tail mode)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Only one record should exist
     __table_args__ = (
         UniqueConstraint('id', name='uq_sync_state_single_record'),
     )
+
+
+class LoadCheckpoint(Base):
+    """Durable progress of one initial load page stream (whole catalogue or a shard)."""
+    
+    __tablename__ = "load_checkpoints"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    stream_key = Column(String, unique=True, nullable=False, index=True)  # "all" or shard key
+    shard = Column(JSONB(none_as_null=True), nullable=True)  # Shard filters (NULL for the unfiltered catalogue)
+    status = Column(String, nullable=False, default="pending")  # "pending", "running", "completed", "stopped", "failed"
+    last_page = Column(Integer, nullable=False, default=0)  # All pages up to this one are committed
+    committed_pages = Column(JSONB, nullable=False, default=list)  # Committed pages above last_page
+    end_page = Column(Integer, nullable=True)  # Last page of the stream, once known
+    pages = Column(Integer, nullable=False, default=0)
+    loaded = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Start of the load (kept on resume)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class RawDataStaging(Base):
+    """Unlogged staging area for COPY-based initial load (merged into raw_data at checkpoints)."""
+    
+    __tablename__ = "raw_data_staging"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)  # Arrival order (first copy wins on merge)
+    batch = Column(String, nullable=False)  # Loader worker that staged the row
+    stream_key = Column(String, nullable=False)  # Stream the page belongs to
+    page = Column(Integer, nullable=False)
+    inner_id = Column(String, nullable=False)
+    change_type = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    data = Column(JSONB, nullable=False)
+    first_loaded_at = Column(DateTime, nullable=False)
+    last_updated_at = Column(DateTime, nullable=False)
+    source = Column(String, nullable=False)
+    active_status = Column(Integer, nullable=False, default=0)
+    is_processed = Column(Boolean, nullable=False, default=False)
+    
+    # Not WAL-logged: contents are lost on crash, which is fine since pages
+    # are checkpointed only after they are merged into raw_data
+    __table_args__ = (
+        Index('idx_raw_data_staging_batch', 'batch'),
+        {'prefixes': ['UNLOGGED']},
+    )
+
+
+class RawChange(Base):
+    """Append-only log of /changes events (range-partitioned by event date, one partition per month)."""
+    
+    __tablename__ = "raw_changes"
+    
+    event_date = Column(Date, primary_key=True)  # Partition key (date of created_at)
+    change_id = Column(BigInteger, primary_key=True)  # Record id in the change feed
+    inner_id = Column(String, nullable=False)
+    change_type = Column(String, nullable=False)  # "added", "changed", "removed"
+    created_at = Column(DateTime, nullable=False)  # Date from API
+    data = Column(JSONB, nullable=True)  # Event data as received: full offer for "added", delta for "changed"
+    recorded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Partitions (raw_changes_YYYY_MM) are created on first write by
+    # app.loaders.change_store and dropped whole for retention
+    __table_args__ = (
+        Index('idx_raw_changes_inner_id', 'inner_id'),
+        {'postgresql_partition_by': 'RANGE (event_date)'},
+    )
+
+
+class PriceHistory(Base):
+    """Price points of a listing from change events, with precomputed summary."""
+    
+    __tablename__ = "price_history"
+    
+    inner_id = Column(String, primary_key=True)
+    recorded_at = Column(ARRAY(DateTime), nullable=False)  # Point times (created_at of the events), in order
+    prices = Column(ARRAY(Integer), nullable=False)  # Point prices in CNY, parallel to recorded_at
+    first_price = Column(Integer, nullable=False)
+    current_price = Column(Integer, nullable=False)
+    price_drops = Column(Integer, nullable=False, default=0)  # Points lower than the previous one
+    last_drop_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_price_history_last_drop_at', 'last_drop_at'),
+        Index('idx_price_history_current_price', 'current_price'),
+    )
@@ -0,0 +1,241 @@
+"""Append-only store of /changes events (raw_changes, range-partitioned by month)."""
+
+import re
+from datetime import date, datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+from sqlalchemy import Table, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import RawChange
+from app.utils.logger import logger
+
+
+RAW_CHANGES_TABLE: Table = RawChange.__table__
+
+PARTITION_NAME = re.compile(r'^raw_changes_(\d{4})_(\d{2})$')
+
+# Months whose partition is known to exist (cleared when a transaction that
+# may have created one is rolled back)
+_known_partitions: Set[date] = set()
+
+
+def month_start(day: date) -> date:
+    """Get first day of the month of a date."""
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    """Get first day of the following month."""
+    return date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Get name of the raw_changes partition holding a month."""
+    return f"raw_changes_{month:%Y_%m}"
+
+
+def forget_partitions() -> None:
+    """Drop the cache of existing partitions (after a rollback)."""
+    _known_partitions.clear()
+
+
+async def ensure_partitions(session: AsyncSession, days: Iterable[date]) -> None:
+    """
+    Create monthly partitions for dates that do not have one yet.
+
+    Args:
+        session: Database session (caller commits)
+        days: Event dates about to be written
+    """
+    for month in sorted({month_start(day) for day in days} - _known_partitions):
+        await session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF raw_changes "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+        ))
+        _known_partitions.add(month)
+
+
+def parse_event_time(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse created_at of a change event into a naive UTC datetime.
+
+    Unlike parse_created_at there is no fallback: event_date is part of the
+    deduplication key and must not depend on when or where the event is stored.
+
+    Args:
+        value: ISO datetime string (may end with 'Z' or have an offset; naive is UTC)
+
+    Returns:
+        Naive UTC datetime, None if missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        created_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    if created_at.tzinfo:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return created_at
+
+
+def change_row(record: Dict[str, Any], now: datetime) -> Optional[Dict[str, Any]]:
+    """
+    Build raw_changes column values for a change event.
+
+    Args:
+        record: Change record from API (with id and inner_id)
+        now: Time the event is recorded
+
+    Returns:
+        Dictionary of raw_changes column values (None if the record has no id
+        or no valid created_at)
+    """
+    change_id = record.get('id')
+    if not isinstance(change_id, int):
+        return None
+    created_at = parse_event_time(record.get('created_at'))
+    if created_at is None:
+        return None
+    change_type = record.get('change_type', 'added')
+    return {
+        'event_date': created_at.date(),
+        'change_id': change_id,
+        'inner_id': record['inner_id'],
+        'change_type': change_type,
+        'created_at': created_at,
+        # "changed" carries only the changed fields; "removed" carries nothing
+        'data': record.get('data') or None,
+        'recorded_at': now,
+    }
+
+
+async def append_changes(session: AsyncSession, events: List[Dict[str, Any]], now: datetime) -> int:
+    """
+    Append change events to raw_changes, in one statement.
+
+    Events already stored (same change_id, e.g. a page applied again after
+    a restart) are skipped. Events without id or created_at are not stored:
+    without a stable event_date they could not be deduplicated.
+
+    Args:
+        session: Database session (caller commits)
+        events: Change records with inner_id, in feed order
+        now: Time the events are recorded
+
+    Returns:
+        Number of events offered for storing
+    """
+    rows = [row for row in (change_row(record, now) for record in events) if row is not None]
+    if len(rows) < len(events):
+        logger.warning(
+            f"{len(events) - len(rows)} change record(s) without id or created_at not stored in raw_changes"
+        )
+    if not rows:
+        return 0
+
+    await ensure_partitions(session, {row['event_date'] for row in rows})
+    await session.execute(
+        insert(RAW_CHANGES_TABLE)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=['event_date', 'change_id'])
+    )
+    return len(rows)
+
+
+async def list_partitions(session: AsyncSession) -> List[date]:
+    """
+    Get months that have a raw_changes partition.
+
+    Args:
+        session: Database session
+
+    Returns:
+        First days of the months, in order
+    """
+    result = await session.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'raw_changes'"
+    ))
+    months = []
+    for name in result.scalars():
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+async def drop_expired_partitions(session: AsyncSession, retention_months: int, today: Optional[date] = None) -> List[str]:
+    """
+    Drop partitions older than the retention period (whole months).
+
+    Args:
+        session: Database session (caller commits)
+        retention_months: Months kept in addition to the current one
+        today: Reference date (default: today)
+
+    Returns:
+        Names of dropped partitions
+    """
+    cutoff = month_start(today or date.today())
+    for _ in range(retention_months):
+        cutoff = month_start(date.fromordinal(cutoff.toordinal() - 1))
+
+    dropped = []
+    for month in await list_partitions(session):
+        if month >= cutoff:
+            break
+        name = partition_name(month)
+        await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        _known_partitions.discard(month)
+        dropped.append(name)
+    return dropped
+
+
+async def iter_changes(
+    session: AsyncSession,
+    until: date,
+    since: Optional[date] = None,
+    chunk_size: int = 1000
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream stored change events in feed order, one partition at a time.
+
+    Args:
+        session: Database session
+        until: Last event date included
+        since: First event date included (None for all stored events)
+        chunk_size: Events per yielded chunk
+
+    Yields:
+        Lists of change records in the /changes format (id, inner_id, change_type, created_at, data)
+    """
+    table = RAW_CHANGES_TABLE
+    for month in await list_partitions(session):
+        if month > until or (since and next_month(month) <= since):
+            continue
+        stmt = (
+            select(table.c.change_id, table.c.inner_id, table.c.change_type, table.c.created_at, table.c.data)
+            .where(table.c.event_date >= month, table.c.event_date < next_month(month))
+            .where(table.c.event_date <= until)
+            .order_by(table.c.change_id)
+            .execution_options(yield_per=chunk_size)
+        )
+        if since:
+            stmt = stmt.where(table.c.event_date >= since)
+
+        result = await session.stream(stmt)
+        async for rows in result.partitions(chunk_size):
+            yield [
+                {
+                    'id': row.change_id,
+                    'inner_id': row.inner_id,
+                    'change_type': row.change_type,
+                    'created_at': row.created_at.isoformat(),
+                    'data': row.data or {},
+                }
+                for row in rows
+            ]
@@ -0,0 +1,192 @@
+"""COPY-based ingest of initial load pages through an unlogged staging table."""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database.connection import AsyncSessionLocal
+from app.database.models import RawDataStaging
+from app.loaders.load_checkpoints import StreamProgress, save_checkpoint
+from app.loaders.raw_data_writer import RAW_DATA_TABLE
+from app.loaders.stage_stats import StageStats
+from app.utils import json_codec
+from app.utils.logger import logger
+
+
+STAGING_TABLE = RawDataStaging.__table__
+
+# raw_data columns filled from staging (id is assigned by raw_data itself)
+ROW_COLUMNS = (
+    'inner_id', 'change_type', 'created_at', 'data', 'first_loaded_at',
+    'last_updated_at', 'source', 'active_status', 'is_processed'
+)
+COPY_COLUMNS = ('batch', 'stream_key', 'page') + ROW_COLUMNS
+
+
+class CopyIngestor:
+    """
+    Stage page rows with binary COPY and merge them into raw_data in bulk.
+
+    Pages are copied into the unlogged raw_data_staging table as they arrive.
+    Every merge_every_pages pages (and at the end of each stream) the staged
+    rows are moved into raw_data with one INSERT ... SELECT ... ON CONFLICT DO
+    NOTHING, and the checkpoints of the merged pages are committed in the same
+    transaction. A crash loses only staged, not yet checkpointed pages, which
+    are fetched again on --resume.
+
+    Staged rows are tagged with a batch name, so workers on other machines can
+    share the table.
+    """
+
+    def __init__(self, batch: str, merge_every_pages: int = 50, stats: Optional[StageStats] = None):
+        """
+        Initialize COPY ingestor.
+
+        Args:
+            batch: Name of this loader worker (e.g. "worker-0")
+            merge_every_pages: Number of staged pages that triggers a merge
+            stats: Stage statistics to record copy/merge timings into
+        """
+        self.batch = batch
+        self.merge_every_pages = max(1, merge_every_pages)
+        self.stats = stats or StageStats()
+        # Staged, not yet merged pages: (stream, page, staged rows, invalid records)
+        self.pending: List[Tuple[StreamProgress, int, int, int]] = []
+        # COPY and merge must not interleave: rows copied while a merge runs would be deleted unmerged
+        self._lock = asyncio.Lock()
+
+    @property
+    def merge_due(self) -> bool:
+        """Check if enough pages are staged for a merge."""
+        return len(self.pending) >= self.merge_every_pages
+
+    async def clear(self) -> None:
+        """Drop rows left in staging by a previous run of this worker (never checkpointed)."""
+        async with self._lock:
+            async with AsyncSessionLocal() as session:
+                await session.execute(delete(STAGING_TABLE).where(STAGING_TABLE.c.batch == self.batch))
+                await session.commit()
+
+    async def stage(
+        self,
+        stream: StreamProgress,
+        page: int,
+        rows: List[Dict[str, Any]],
+        invalid: int = 0
+    ) -> None:
+        """
+        Copy rows of one page into staging.
+
+        Args:
+            stream: Stream the page belongs to
+            page: Page number
+            rows: Column values built by build_row
+            invalid: Records of the page that were dropped before staging
+        """
+        records = [
+            (self.batch, stream.key, page) + tuple(
+                # asyncpg expects jsonb values as JSON text
+                json_codec.dumps(row[name]) if name == 'data' else row[name]
+                for name in ROW_COLUMNS
+            )
+            for row in rows
+        ]
+
+        async with self._lock:
+            started = time.perf_counter()
+            if records:
+                async with AsyncSessionLocal() as session:
+                    connection = await session.connection()
+                    raw_connection = await connection.get_raw_connection()
+                    await raw_connection.driver_connection.copy_records_to_table(
+                        STAGING_TABLE.name,
+                        records=records,
+                        columns=list(COPY_COLUMNS)
+                    )
+                    await session.commit()
+            self.stats.record('copy', len(records), time.perf_counter() - started)
+            self.pending.append((stream, page, len(records), invalid))
+
+    async def merge(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Move staged rows into raw_data and checkpoint the staged pages.
+
+        The first staged copy of each inner_id wins; listings that already
+        exist in raw_data are left untouched and counted as skipped.
+
+        Returns:
+            Dictionary of stream key -> (loaded, skipped) added by this merge
+        """
+        async with self._lock:
+            if not self.pending:
+                return {}
+
+            pending = self.pending
+            streams = {stream.key: stream for stream, _, _, _ in pending}
+            snapshots = {key: stream.snapshot() for key, stream in streams.items()}
+            started = time.perf_counter()
+
+            async with AsyncSessionLocal() as session:
+                try:
+                    inserted = await self._merge_staged(session)
+
+                    totals: Dict[str, Tuple[int, int]] = {}
+                    for stream, page, staged, invalid in pending:
+                        loaded = inserted.get((stream.key, page), 0)
+                        skipped = staged - loaded + invalid
+                        stream.advance(page, loaded, skipped)
+                        stream_loaded, stream_skipped = totals.get(stream.key, (0, 0))
+                        totals[stream.key] = (stream_loaded + loaded, stream_skipped + skipped)
+
+                    for stream in streams.values():
+                        await save_checkpoint(session, stream)
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    for key, stream in streams.items():
+                        stream.restore(snapshots[key])
+                    raise
+
+            self.pending = []
+            merged_rows = sum(staged for _, _, staged, _ in pending)
+            elapsed = time.perf_counter() - started
+            self.stats.record('merge', merged_rows, elapsed)
+            logger.debug(f"Merged {len(pending)} staged pages ({merged_rows} rows) in {elapsed:.2f}s")
+            return totals
+
+    async def _merge_staged(self, session) -> Dict[Tuple[str, int], int]:
+        """
+        Insert staged rows of this batch into raw_data and clear them from staging.
+
+        Args:
+            session: Database session (caller commits)
+
+        Returns:
+            Dictionary of (stream key, page) -> number of inserted listings
+        """
+        # One row per inner_id, in arrival order
+        source = (
+            select(STAGING_TABLE.c.stream_key, STAGING_TABLE.c.page, *[STAGING_TABLE.c[name] for name in ROW_COLUMNS])
+            .where(STAGING_TABLE.c.batch == self.batch)
+            .distinct(STAGING_TABLE.c.inner_id)
+            .order_by(STAGING_TABLE.c.inner_id, STAGING_TABLE.c.id)
+            .cte('source')
+        )
+        inserted = (
+            insert(RAW_DATA_TABLE)
+            .from_select(list(ROW_COLUMNS), select(*[source.c[name] for name in ROW_COLUMNS]))
+            .on_conflict_do_nothing(index_elements=[RAW_DATA_TABLE.c.inner_id])
+            .returning(RAW_DATA_TABLE.c.inner_id)
+            .cte('inserted')
+        )
+        result = await session.execute(
+            select(source.c.stream_key, source.c.page, func.count())
+            .select_from(inserted.join(source, source.c.inner_id == inserted.c.inner_id))
+            .group_by(source.c.stream_key, source.c.page)
+        )
+        counts = {(row[0], row[1]): row[2] for row in result}
+
+        await session.execute(delete(STAGING_TABLE).where(STAGING_TABLE.c.batch == self.batch))
+        return counts
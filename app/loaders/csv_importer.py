@@ -0,0 +1,470 @@
+"""Bulk importer for the daily CSV exports."""
+
+import asyncio
+import csv
+import gzip
+import io
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+from sqlalchemy import String, column, exists, func, literal, select, table, text, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.loaders.base_loader import BaseLoader
+from app.loaders.pipeline import Pipeline
+from app.loaders.raw_data_writer import (
+    ACTIVE_STATUS_FIELD, RAW_DATA_TABLE, build_row, fetch_existing, insert_missing, mark_removed,
+    pending_fields_after, update_rows
+)
+from app.loaders.stage_stats import StageStats
+from app.utils import json_codec
+from app.utils.config import config
+from app.utils.logger import logger
+
+
+# Export kinds: all active listings, or listings sold during the previous day
+EXPORT_KINDS = ("active", "sold")
+
+# Typed listing fields; all other columns are stored as strings
+INT_FIELDS = {'year', 'price', 'km_age', 'power'}
+FLOAT_FIELDS = {'displacement'}
+BOOL_FIELDS = {'is_dealer'}
+LIST_FIELDS = {'images'}
+
+# Temporary table with inner_ids seen in the export (reconciliation)
+SEEN_TABLE = table('csv_import_seen', column('inner_id'))
+
+
+def _convert(name: str, value: str) -> Any:
+    """
+    Convert one CSV cell to the type the API uses for the field.
+
+    Args:
+        name: Field name
+        value: Cell text (not empty)
+
+    Returns:
+        Converted value (the text itself if it cannot be converted)
+    """
+    try:
+        if name in INT_FIELDS:
+            return int(float(value))
+        if name in FLOAT_FIELDS:
+            return float(value)
+        if name in BOOL_FIELDS:
+            return value.strip().lower() in ('1', 'true', 'yes', 't')
+        if value[0] in '[{':
+            # Nested values (images, configuration) are exported as JSON
+            return json_codec.loads(value)
+        if name in LIST_FIELDS:
+            return [item.strip() for item in value.split(',') if item.strip()]
+    except ValueError:
+        pass
+    return value
+
+
+def csv_record(row: Dict[str, str], columns: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Map one CSV row onto the shape of an /offers record.
+
+    Args:
+        row: Row from csv.DictReader
+        columns: Renames of CSV columns to listing field names
+
+    Returns:
+        Record with inner_id, created_at and data (empty cells are left out)
+    """
+    data = {}
+    for name, value in row.items():
+        if name is None or value is None or value == '':
+            continue
+        name = (columns or {}).get(name, name)
+        data[name] = _convert(name, value)
+
+    inner_id = data.get('inner_id')
+    if inner_id is not None:
+        inner_id = str(inner_id)
+        data['inner_id'] = inner_id
+    return {
+        'inner_id': inner_id,
+        'created_at': data.get('created_at'),
+        'data': data,
+    }
+
+
+def open_export(path: Path) -> TextIO:
+    """Open a CSV export (plain or .gz) as text."""
+    if path.suffix == '.gz':
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8-sig', newline='')
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+
+def iter_csv_chunks(
+    path: Path,
+    chunk_size: int,
+    delimiter: str = '|',
+    columns: Optional[Dict[str, str]] = None
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream-parse a CSV export in chunks of records.
+
+    Args:
+        path: CSV file (plain or .gz)
+        chunk_size: Records per chunk
+        delimiter: Column delimiter
+        columns: Renames of CSV columns to listing field names
+
+    Yields:
+        Lists of records as returned by csv_record
+    """
+    # Descriptions and option lists exceed the default 128 KB cell limit
+    csv.field_size_limit(sys.maxsize)
+    with open_export(path) as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        chunk = []
+        for row in reader:
+            chunk.append(csv_record(row, columns))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class CsvImporter(BaseLoader):
+    """
+    Loader for the daily |-delimited CSV exports.
+
+    An "active" export (all active listings) inserts new listings and
+    rewrites existing ones whose data differs or that were inactive; with
+    reconcile=True, active listings missing from the export are marked
+    removed afterwards. A "sold" export marks its listings removed. The file
+    is parsed in a thread and written chunk by chunk with set-based statements.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        kind: str = "active",
+        reconcile: bool = False,
+        chunk_size: Optional[int] = None,
+        snapshot_at: Optional[datetime] = None
+    ):
+        """
+        Initialize CSV importer.
+
+        Args:
+            path: CSV export file (plain or .gz)
+            kind: "active" (all active listings) or "sold" (sold during the previous day)
+            reconcile: Mark active listings missing from an "active" export as removed
+            chunk_size: Records written per statement batch (default from config)
+            snapshot_at: Time the export was taken (UTC). Defaults to the file
+                modification time, which is only right for files written by the
+                export itself; downloaded exports pass their Last-Modified time.
+                Listings updated later are never reconciled away.
+        """
+        if kind not in EXPORT_KINDS:
+            raise ValueError(f"Unknown export kind: {kind}")
+        if reconcile and kind != "active":
+            raise ValueError("Reconciliation requires an export of active listings")
+
+        super().__init__("data_fetch")
+        self.path = Path(path)
+        self.kind = kind
+        self.reconcile = reconcile
+        self.source = "csv_import"
+
+        import_config = config.get('csv_import', {})
+        # 9 columns per row: keep INSERT below the 32767 bind parameter limit
+        self.chunk_size = chunk_size or import_config.get('chunk_size', 2000)
+        self.delimiter = import_config.get('delimiter', '|')
+        self.columns = import_config.get('columns') or {}
+        self.reconcile_min_ratio = import_config.get('reconcile_min_ratio', 0.9)
+        self.pipeline_config = config.get_pipeline_config()
+        self.snapshot_at = snapshot_at or datetime.utcfromtimestamp(self.path.stat().st_mtime)
+        self.stage_stats = StageStats()
+        self.seen: Set[str] = set()
+
+    async def load(self) -> Dict[str, Any]:
+        """
+        Import the export file.
+
+        Returns:
+            Dictionary with statistics: total_records, total_loaded, total_updated,
+            total_unchanged, total_removed, total_reconciled, total_skipped,
+            total_errors and stages (rows, seconds and rows_per_sec per stage)
+        """
+        await self.start_operation()
+
+        stats = {
+            'total_records': 0,
+            'total_loaded': 0,
+            'total_updated': 0,
+            'total_unchanged': 0,
+            'total_removed': 0,
+            'total_reconciled': 0,
+            'total_skipped': 0,
+            'total_errors': 0,
+            'stages': {}
+        }
+
+        try:
+            logger.info(
+                f"Starting CSV import of {self.path} (kind={self.kind}, "
+                f"chunk_size={self.chunk_size}, reconcile={self.reconcile})"
+            )
+
+            pipeline = Pipeline(
+                f"csv import {self.path.name}",
+                queue_size=self.pipeline_config.get('queue_size', 4),
+                log_interval=self.pipeline_config.get('log_interval_seconds', 30)
+            )
+
+            async def write(chunk):
+                try:
+                    counts = await self._save_chunk(chunk)
+                except Exception as e:
+                    self.record_error(e, f"chunk ending at record {stats['total_records'] + len(chunk)}")
+                    stats['total_errors'] += 1
+                    if stats['total_errors'] > 10 and not pipeline.stopped:
+                        logger.error("Too many errors, stopping CSV import")
+                        pipeline.stop()
+                    return
+                stats['total_records'] += len(chunk)
+                for name, value in counts.items():
+                    stats[f'total_{name}'] += value
+                self._write_progress(stats)
+
+            pipeline.add_stage('write', write, workers=self.pipeline_config.get('writers', 1))
+            await pipeline.run(self._chunks())
+
+            # Finish progress line
+            sys.stdout.write('\n')
+            sys.stdout.flush()
+
+            if self.reconcile:
+                if stats['total_errors']:
+                    logger.warning("Import had errors, reconciliation skipped")
+                else:
+                    stats['total_reconciled'] = await self._reconcile()
+
+            stats['stages'] = self.stage_stats.summary()
+
+            await self.finish_operation(
+                "ERROR" if stats['total_errors'] > 0 else "OK"
+            )
+
+            logger.info(
+                f"CSV import completed: "
+                f"records={stats['total_records']}, "
+                f"loaded={stats['total_loaded']}, "
+                f"updated={stats['total_updated']}, "
+                f"unchanged={stats['total_unchanged']}, "
+                f"removed={stats['total_removed']}, "
+                f"reconciled={stats['total_reconciled']}, "
+                f"skipped={stats['total_skipped']}, "
+                f"errors={stats['total_errors']}"
+            )
+
+            return stats
+
+        except Exception as e:
+            self.record_error(e, "CSV import")
+            await self.finish_operation("ERROR")
+            raise
+
+    async def _chunks(self):
+        """Yield record chunks, parsing the file in a worker thread."""
+        chunks = iter_csv_chunks(self.path, self.chunk_size, self.delimiter, self.columns)
+        while True:
+            started = time.perf_counter()
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                return
+            self.stage_stats.record('parse', len(chunk), time.perf_counter() - started)
+            yield chunk
+
+    def _write_progress(self, stats: Dict[str, Any]) -> None:
+        """Write one-line progress to console."""
+        sys.stdout.write(
+            f"\rCSV import: Records: {stats['total_records']:,} | "
+            f"Loaded: {stats['total_loaded']:,} | Updated: {stats['total_updated']:,} | "
+            f"Removed: {stats['total_removed']:,} | Errors: {stats['total_errors']}"
+        )
+        sys.stdout.flush()
+
+    async def _save_chunk(self, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Write one chunk of records.
+
+        Args:
+            records: Records built by csv_record
+
+        Returns:
+            Counts: loaded, updated, unchanged, removed, skipped
+        """
+        started = time.perf_counter()
+        counts = {'loaded': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'skipped': 0}
+        now = datetime.utcnow()
+
+        # Last row of a listing repeated within the chunk wins
+        chunk: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            if not record['inner_id']:
+                counts['skipped'] += 1
+                continue
+            chunk[record['inner_id']] = record
+        counts['skipped'] += len(records) - counts['skipped'] - len(chunk)
+        self.seen.update(chunk)
+
+        async with self.get_db_session() as session:
+            try:
+                existing = await fetch_existing(session, chunk.keys())
+
+                new_rows, updated_rows, removed = self._classify(chunk, existing, now, counts)
+
+                inserted = await insert_missing(session, new_rows)
+                await update_rows(session, updated_rows)
+                await mark_removed(session, removed, now)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+        # Listings inserted concurrently by another process
+        lost = len(new_rows) - len(inserted)
+        counts['loaded'] -= lost
+        counts['skipped'] += lost
+
+        self.stage_stats.record('write', len(records), time.perf_counter() - started)
+        return counts
+
+    def _classify(
+        self,
+        chunk: Dict[str, Dict[str, Any]],
+        existing: Dict[str, Dict[str, Any]],
+        now: datetime,
+        counts: Dict[str, int]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Split records into new, rewritten and removed listings.
+
+        Args:
+            chunk: Records by inner_id
+            existing: Current state of the stored listings (fetch_existing)
+            now: Import timestamp
+            counts: Counters (updated in place)
+
+        Returns:
+            Tuple of (rows to insert, rows to update by inner_id, inner_ids to mark removed)
+        """
+        new_rows: List[Dict[str, Any]] = []
+        updated_rows: Dict[str, Dict[str, Any]] = {}
+        removed: List[str] = []
+        sold = self.kind == "sold"
+
+        for inner_id, record in chunk.items():
+            current = existing.get(inner_id)
+
+            if current is None:
+                # Sold listings never seen before are stored as inactive
+                new_rows.append(build_row(
+                    record, self.source, now,
+                    change_type="removed" if sold else "added",
+                    active_status=1 if sold else 0
+                ))
+                counts['loaded'] += 1
+                continue
+
+            if sold:
+                if current['active_status'] == 1:
+                    counts['unchanged'] += 1
+                else:
+                    removed.append(inner_id)
+                    counts['removed'] += 1
+                continue
+
+            # Fields the export lacks (e.g. from /offer) are kept
+            data = {**(current['data'] or {}), **record['data']}
+            if data == current['data'] and current['active_status'] == 0:
+                counts['unchanged'] += 1
+                continue
+
+            updated_rows[inner_id] = {
+                'change_type': "changed",
+                'created_at': current['created_at'],
+                'data': data,
+                'active_status': 0,
+                'last_updated_at': now,
+                'is_processed': False,
+            }
+            counts['updated'] += 1
+
+        return new_rows, updated_rows, removed
+
+    async def _reconcile(self) -> int:
+        """
+        Mark active listings missing from the export as removed.
+
+        Only listings last updated before the export snapshot are touched, so
+        listings added by the change feed after the export survive. Skipped
+        when the export covers fewer than reconcile_min_ratio of the active
+        listings (a truncated or wrong file).
+
+        Returns:
+            Number of listings marked removed
+        """
+        started = time.perf_counter()
+        async with self.get_db_session() as session:
+            try:
+                active = await session.scalar(
+                    select(func.count()).select_from(RAW_DATA_TABLE).where(RAW_DATA_TABLE.c.active_status == 0)
+                )
+                if len(self.seen) < active * self.reconcile_min_ratio:
+                    logger.warning(
+                        f"Export has {len(self.seen):,} listings but {active:,} are active "
+                        f"(below {self.reconcile_min_ratio:.0%}), reconciliation skipped"
+                    )
+                    return 0
+
+                await session.execute(text(
+                    f"CREATE TEMPORARY TABLE {SEEN_TABLE.name} (inner_id VARCHAR PRIMARY KEY) ON COMMIT DROP"
+                ))
+                connection = await session.connection()
+                raw_connection = await connection.get_raw_connection()
+                await raw_connection.driver_connection.copy_records_to_table(
+                    SEEN_TABLE.name,
+                    records=[(inner_id,) for inner_id in self.seen],
+                    columns=['inner_id']
+                )
+
+                result = await session.execute(
+                    update(RAW_DATA_TABLE)
+                    .where(
+                        RAW_DATA_TABLE.c.active_status == 0,
+                        RAW_DATA_TABLE.c.last_updated_at < self.snapshot_at,
+                        ~exists().where(SEEN_TABLE.c.inner_id == RAW_DATA_TABLE.c.inner_id)
+                    )
+                    .values(
+                        change_type='removed',
+                        active_status=1,
+                        last_updated_at=datetime.utcnow(),
+                        pending_fields=pending_fields_after(
+                            RAW_DATA_TABLE, literal([ACTIVE_STATUS_FIELD], ARRAY(String))
+                        ),
+                        is_processed=False
+                    )
+                    .returning(RAW_DATA_TABLE.c.inner_id)
+                )
+                reconciled = len(result.scalars().all())
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                self.record_error(e, "reconcile")
+                raise
+
+        self.stage_stats.record('reconcile', reconciled, time.perf_counter() - started)
+        logger.info(f"Reconciliation marked {reconciled:,} listing(s) missing from the export as removed")
+        return reconciled
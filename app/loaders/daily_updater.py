@@ -2,43 +2,81 @@
 
 import asyncio
 from datetime import datetime, date, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Callable, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.loaders.base_loader import BaseLoader
-from app.database.models import RawData, SyncState
-from app.utils.che168_client import CHE168Client
-from app.utils.json_merger import merge_json
+from app.loaders.change_store import append_changes, drop_expired_partitions, forget_partitions
+from app.loaders.pipeline import Pipeline
+from app.loaders.price_history import append_prices, price_points
+from app.loaders.raw_data_writer import (
+    ACTIVE_STATUS_FIELD, RAW_DATA_TABLE, STATE_COLUMNS, build_row, fetch_existing, insert_missing,
+    mark_removed, parse_created_at, patch_rows
+)
+from app.database.models import SyncState
+from app.utils.che168_async_client import AsyncCHE168Client
+from app.utils.config import config
+from app.utils.json_merger import map_new_fields, merge_json
 from app.utils.logger import logger
+from app.utils.rate_controller import RateController
 
 
 class DailyUpdater(BaseLoader):
     """Updater for daily incremental data updates."""
     
-    def __init__(self, max_dates: Optional[int] = None, start_date: Optional[date] = None):
+    def __init__(
+        self,
+        max_dates: Optional[int] = None,
+        start_date: Optional[date] = None,
+        client: Optional[Any] = None,
+        reapply: bool = False
+    ):
         """
         Initialize daily updater.
         
         Args:
             max_dates: Maximum number of dates to process (None for unlimited, useful for testing)
             start_date: Start date for processing (None means today - 1 day)
+            client: API client (default AsyncCHE168Client; e.g. ReplayCHE168Client to re-apply archived changes)
+            reapply: Process the date even if sync_state marks it as done, and leave sync_state unchanged
         """
         super().__init__("data_fetch")
-        self.client = CHE168Client()
+        self.client = client or AsyncCHE168Client()
+        self.reapply = reapply
+        # Adaptive request rate (starts at 1 request per 2 seconds); replay is not throttled
+        self.rate_controller: Optional[RateController] = None
+        if self.client.rate_limited:
+            self.rate_controller = RateController.from_config(
+                rate=config.get('daily_update.requests_per_second', 0.5),
+                name="daily update"
+            )
+            self.client.rate_controller = self.rate_controller
         self.source = "daily_update"
+        # Listings table written by _apply_changes (rebuild_raw_data.py points it elsewhere)
+        self.table = RAW_DATA_TABLE
+        # Append every applied event to raw_changes (not when re-applying already stored changes)
+        self.store_changes = config.get('raw_changes.enabled', True) and not reapply
+        # Append price points of applied events to price_history (same condition)
+        self.record_prices = config.get('price_history.enabled', True) and not reapply
         self.max_dates = max_dates
         self.start_date = start_date
+        self.pipeline_config = config.get_pipeline_config()
+        # /changes pages applied together (net effect per listing within the window)
+        self.window_pages = max(1, config.get('daily_update.window_pages', 10))
     
     async def update(self) -> Dict[str, Any]:
         """
         Update data from API changes.
         
         Logic:
-        1. Get change_id for date = today - 1 day
-        2. Request /changes with change_id
-        3. Process changes and get next_change_id from meta
-        4. Repeat step 2-3 until next_change_id is null
+        1. Collect dates to process: from the day after sync_state.last_successful_date
+           (or start_date, default today - 1 day) to yesterday, at most max_dates
+        2. Get the initial change_id of every date (requests in parallel)
+        3. Request /changes from the change_id of the first date and follow
+           next_change_id across date boundaries until it is null (or until the
+           date after the last one when max_dates cut the range)
+        4. Advance sync_state for each date once the feed has passed its end
         
         Returns:
             Dictionary with statistics
@@ -55,137 +93,198 @@ class DailyUpdater(BaseLoader):
         }
         
         try:
-            # Get date to process
-            if self.start_date:
-                process_date = self.start_date
-            else:
-                # Default: today - 1 day
-                today = date.today()
-                process_date = today - timedelta(days=1)
-            
-            # Check if already processed
-            async with self.get_db_session() as session:
-                result = await session.execute(select(SyncState))
-                sync_state = result.scalar_one_or_none()
-                
-                if sync_state and sync_state.last_successful_date >= process_date:
-                    logger.info(f"Date {process_date} already processed (last_date={sync_state.last_successful_date})")
-                    await self.finish_operation("OK")
-                    return stats
+            await self._expire_changes()
             
-            logger.info(f"Processing date: {process_date}")
+            # Step 1: Get dates to process
+            dates, end_date, cursor = await self._pending_dates()
+            if not dates:
+                await self.finish_operation("OK")
+                return stats
+            
+            if len(dates) > 1:
+                logger.info(f"Catching up {len(dates)} dates: {dates[0]} .. {dates[-1]}")
+            else:
+                logger.info(f"Processing date: {dates[0]}")
             
-            # Step 1: Get initial change_id for this date
+            # Step 2: Get initial change_id of every date (and of the date after
+            # the last one when the range was cut, to know where to stop)
             try:
-                change_id_response = await asyncio.to_thread(
-                    self.client.get_change_id, 
-                    process_date
-                )
-                
-                if not change_id_response:
-                    logger.warning(f"No change_id returned for date {process_date}")
-                    await self.finish_operation("OK")
-                    return stats
-                
-                # Response format: {"change_id": 123456789}
-                # get_change_id returns int directly
-                initial_change_id = change_id_response
-                
-                if not initial_change_id:
-                    logger.warning(f"change_id is None for date {process_date}")
-                    await self.finish_operation("OK")
-                    return stats
-                
-                logger.info(f"Got initial change_id: {initial_change_id} for date {process_date}")
-                
+                starts = await self._resolve_change_ids(dates + ([end_date] if end_date else []))
             except Exception as e:
-                self.record_error(e, f"get_change_id for {process_date}")
+                self.record_error(e, f"get_change_id for {dates[0]}")
                 stats['total_errors'] += 1
                 await self.finish_operation("ERROR")
                 return stats
             
-            # Step 2-3: Process all pages of changes
-            current_change_id = initial_change_id
-            page_number = 0
-            last_change_id = None
-            total_records_processed = 0
+            end_change_id = starts.pop(end_date, None) if end_date else None
+            # A date without change_id is merged into the previous date (the feed is continuous)
+            for process_date in dates:
+                if process_date not in starts:
+                    logger.warning(f"No change_id returned for date {process_date}, processed with the previous date")
+            resolved = [d for d in dates if d in starts]
+            if not resolved:
+                logger.warning(f"No change_id returned for dates {dates[0]} .. {dates[-1]}")
+                await self.finish_operation("OK")
+                return stats
             
-            logger.info("Starting pagination...")
+            # Dates not finished yet, with the change_id where each one ends
+            # (None: end of the feed)
+            pending = [
+                (process_date, starts[resolved[i + 1]] if i + 1 < len(resolved) else end_change_id)
+                for i, process_date in enumerate(resolved)
+            ]
+            initial_change_id = starts[resolved[0]]
+            logger.info(f"Got initial change_id: {initial_change_id} for date {resolved[0]}")
+            if cursor and cursor > initial_change_id and (end_change_id is None or cursor < end_change_id):
+                # An interrupted run already applied the feed up to the saved cursor
+                logger.info(f"Resuming from saved cursor: change_id {cursor}")
+                initial_change_id = cursor
+            
+            # Step 3: Process all pages of changes
+            # Pages are fetched, decoded and written by concurrent pipeline stages;
+            # the writer applies them strictly in feed order
+            progress = {'pages': 0, 'records': 0, 'last_change_id': None}
+            pipeline = Pipeline(
+                f"daily update {resolved[0]}" + (f" .. {resolved[-1]}" if len(resolved) > 1 else ""),
+                queue_size=self.pipeline_config.get('queue_size', 4),
+                log_interval=self.pipeline_config.get('log_interval_seconds', 30)
+            )
+            
+            async def decode(item):
+                page_number, change_id, response = item
+                # Extract result and meta
+                result = response.get('result', [])
+                meta = response.get('meta', {})
+                events, invalid = self._decode_changes(result)
+                return (
+                    page_number, meta.get('cur_change_id') or change_id, meta.get('next_change_id'),
+                    events, invalid, len(result)
+                )
+            
+            # Decoded pages waiting to be applied together (one prefetch and
+            # one set of statements per window instead of per page)
+            window = {'events': [], 'invalid': 0, 'records': 0, 'pages': 0, 'last': None}
             
-            while True:
-                page_number += 1
+            async def flush():
+                if not window['pages']:
+                    return
+                first_page, last_page, change_id = window['first'], window['last'], window['change_id']
+                next_change_id = window['next_change_id']
+                events, invalid, records = window['events'], window['invalid'], window['records']
+                window.update(events=[], invalid=0, records=0, pages=0, last=None)
+                
+                # Dates whose changes have all been applied with this window
+                # (the feed moved past their end)
+                completed = 0
+                while completed < len(pending) and (
+                    next_change_id is None
+                    or (pending[completed][1] is not None and next_change_id >= pending[completed][1])
+                ):
+                    completed += 1
+                # A date is marked processed only if no window of this run had errors,
+                # this one included (invalid records and per-record failures)
+                mark_date = (
+                    pending[completed - 1][0] if completed and stats['total_errors'] + invalid == 0 else None
+                )
+                
+                # The cursor is committed together with the window's changes:
+                # a restart resumes after the last applied page. The completed
+                # date is written only after the window turned out free of errors
+                cursor = None
+                if not self.reapply:
+                    cursor = {
+                        'last_change_id': change_id,
+                        # End of the feed: the last page is requested again next time
+                        'next_change_id': change_id if next_change_id is None else next_change_id,
+                    }
                 try:
-                    # Rate limiting: wait 2 seconds between requests (1 request per 2 seconds max)
-                    if page_number > 1:
-                        await asyncio.sleep(2)
-                    
-                    # Request /changes with current_change_id
-                    response = await asyncio.to_thread(
-                        self.client.get_changes,
-                        change_id=current_change_id
-                    )
-                    
-                    # Extract result and meta
-                    result = response.get('result', [])
-                    meta = response.get('meta', {})
-                    
-                    # Get next_change_id from meta
-                    next_change_id = meta.get('next_change_id')
-                    cur_change_id = meta.get('cur_change_id')
-                    
-                    # Process records if any
-                    if result:
-                        page_stats = await self._save_changes(result)
-                        stats['total_loaded'] += page_stats.get('loaded', 0)
-                        stats['total_updated'] += page_stats.get('updated', 0)
-                        stats['total_removed'] += page_stats.get('removed', 0)
-                        stats['total_errors'] += page_stats.get('errors', 0)
-                        stats['total_duplicates'] += page_stats.get('duplicates', 0)
-                        
-                        # Update progress
-                        total_records_processed += len(result)
-                        # Progress output to logs (for VPS monitoring)
-                        logger.info(
-                            f"Daily update: Page {page_number} | "
-                            f"Records: {total_records_processed:,} | "
-                            f"Loaded: {stats['total_loaded']:,} | "
-                            f"Updated: {stats['total_updated']:,} | "
-                            f"Removed: {stats['total_removed']:,} | "
-                            f"Duplicates: {stats['total_duplicates']:,}"
-                        )
-                    
-                    # Update last_change_id
-                    if cur_change_id:
-                        last_change_id = cur_change_id
-                    else:
-                        last_change_id = current_change_id
-                    
-                    # Check if there's more pages
-                    # Stop when next_change_id is None or null
-                    if next_change_id is None:
-                        logger.info(f"Pagination complete: processed {page_number} page(s), {total_records_processed} records")
-                        break
-                    
-                    # Continue with next_change_id
-                    current_change_id = next_change_id
-                    
+                    page_stats = await self._apply_changes(events, cursor)
                 except Exception as e:
-                    self.record_error(e, f"changes page {page_number} for {process_date}")
+                    self.record_error(e, f"changes pages {first_page}-{last_page} for {pending[0][0]}")
                     stats['total_errors'] += 1
-                    break
+                    pipeline.stop()
+                    return
+                
+                stats['total_loaded'] += page_stats.get('loaded', 0)
+                stats['total_updated'] += page_stats.get('updated', 0)
+                stats['total_removed'] += page_stats.get('removed', 0)
+                stats['total_errors'] += page_stats.get('errors', 0) + invalid
+                stats['total_duplicates'] += page_stats.get('duplicates', 0)
+                
+                if page_stats.get('errors', 0):
+                    mark_date = None
+                elif mark_date and cursor:
+                    try:
+                        await self._save_cursor(**cursor, completed_date=mark_date)
+                    except Exception as e:
+                        self.record_error(e, f"mark date {mark_date} completed")
+                        stats['total_errors'] += 1
+                        mark_date = None
+                
+                # Update last_change_id
+                progress['last_change_id'] = change_id
+                progress['pages'] = last_page
+                
+                if records:
+                    # Update progress
+                    progress['records'] += records
+                    # Progress output to logs (for VPS monitoring)
+                    logger.info(
+                        f"Daily update {pending[0][0]}: Page {last_page} | "
+                        f"Records: {progress['records']:,} | "
+                        f"Loaded: {stats['total_loaded']:,} | "
+                        f"Updated: {stats['total_updated']:,} | "
+                        f"Removed: {stats['total_removed']:,} | "
+                        f"Duplicates: {stats['total_duplicates']:,}"
+                        + (f" | Rate: {self.rate_controller.rate:.2f} req/s" if self.rate_controller else "")
+                    )
+                
+                for process_date, _ in pending[:completed]:
+                    if mark_date:
+                        stats['dates_processed'] += 1
+                        logger.info(f"Date {process_date} completed (change_id {change_id})")
+                del pending[:completed]
             
-            # Update sync_state after successful processing
-            if stats['total_errors'] == 0:
-                await self._update_sync_state(process_date, last_change_id)
-                stats['dates_processed'] = 1
+            async def write(item):
+                page_number, change_id, next_change_id, events, invalid, total = item
+                # A failed window stops the feed: later pages must not be applied before it
+                if pipeline.stopped:
+                    return
+                if not window['pages']:
+                    window['first'] = page_number
+                window['events'].extend(events)
+                window['invalid'] += invalid
+                window['records'] += total
+                window['pages'] += 1
+                window['last'] = page_number
+                window['change_id'] = change_id
+                window['next_change_id'] = next_change_id
+                # A window ends at a date boundary, so sync_state follows the applied changes
+                boundary = next_change_id is None or (
+                    pending[0][1] is not None and next_change_id >= pending[0][1]
+                )
+                if window['pages'] >= self.window_pages or boundary:
+                    await flush()
+            
+            logger.info("Starting pagination...")
+            
+            pipeline.add_stage('decode', decode)
+            pipeline.add_stage('write', write)
+            await pipeline.run(
+                self._change_pages(initial_change_id, resolved[0], stats, pipeline, end_change_id)
+            )
+            if not pipeline.stopped:
+                await flush()
             
             await self.finish_operation(
                 "ERROR" if stats['total_errors'] > 0 else "OK"
             )
             
             logger.info(
-                f"Daily update completed for {process_date}: "
-                f"pages={page_number}, "
+                f"Daily update completed for {resolved[0]}"
+                + (f" .. {resolved[-1]}" if len(resolved) > 1 else "") + ": "
+                f"dates={stats['dates_processed']}, "
+                f"pages={progress['pages']}, "
                 f"loaded={stats['total_loaded']}, "
                 f"updated={stats['total_updated']}, "
                 f"removed={stats['total_removed']}, "
@@ -199,6 +298,337 @@ class DailyUpdater(BaseLoader):
             self.record_error(e, "daily update")
             await self.finish_operation("ERROR")
             raise
+        finally:
+            await self.client.close()
+    
+    async def tail(
+        self,
+        stop: Optional[asyncio.Event] = None,
+        on_idle: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Follow the change feed continuously until stopped.
+        
+        Starts from the cursor in sync_state (next_change_id, else
+        last_change_id, else the change_id of start_date / yesterday) and
+        applies /changes pages one by one as they become available, committing
+        the cursor together with every applied page. When the feed is drained
+        (next_change_id is null) the last page is polled again after an idle
+        delay that doubles up to daily_update.tail.max_idle_seconds; records
+        already applied from it are skipped. Draining also marks yesterday as
+        processed, so the daily run has nothing left to do.
+        
+        Args:
+            stop: Event that ends the loop (e.g. set by a signal handler)
+            on_idle: Coroutine function called when the feed is drained after
+                new changes were applied (e.g. normalization)
+            
+        Returns:
+            Dictionary with statistics
+        """
+        await self.start_operation()
+        stop = stop or asyncio.Event()
+        tail_config = config.get('daily_update.tail', {})
+        poll_interval = tail_config.get('poll_interval_seconds', 30)
+        max_idle = tail_config.get('max_idle_seconds', 300)
+        
+        stats = {
+            'pages': 0,
+            'total_loaded': 0,
+            'total_updated': 0,
+            'total_removed': 0,
+            'total_errors': 0,
+            'total_duplicates': 0
+        }
+        
+        async def idle(seconds: float) -> None:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=seconds)
+            except asyncio.TimeoutError:
+                pass
+        
+        try:
+            await self._expire_changes()
+            change_id, synced_date = await self._tail_start()
+            logger.info(f"Tailing change feed from change_id {change_id}")
+            
+            delay = poll_interval
+            last_applied_id = None  # Highest record id applied from the page being re-polled
+            applied_since_idle = 0
+            
+            while not stop.is_set():
+                try:
+                    if self.rate_controller:
+                        await self.rate_controller.acquire()
+                    response = await self.client.get_changes(change_id=change_id)
+                except Exception as e:
+                    self.record_error(e, f"changes from change_id {change_id}")
+                    stats['total_errors'] += 1
+                    await idle(delay)
+                    delay = min(delay * 2, max_idle)
+                    continue
+                
+                result = response.get('result', [])
+                meta = response.get('meta') or {}
+                cur_change_id = meta.get('cur_change_id') or change_id
+                next_change_id = meta.get('next_change_id')
+                events, invalid = self._decode_changes(result)
+                if last_applied_id is not None:
+                    events = [e for e in events if not isinstance(e.get('id'), int) or e['id'] > last_applied_id]
+                
+                drained = next_change_id is None
+                # Drained: everything up to yesterday has been applied
+                completed = date.today() - timedelta(days=1) if drained else None
+                if completed and synced_date and completed <= synced_date:
+                    completed = None
+                cursor = {
+                    'last_change_id': cur_change_id,
+                    'next_change_id': cur_change_id if drained else next_change_id,
+                    'completed_date': completed,
+                }
+                
+                if events or invalid:
+                    try:
+                        page_stats = await self._apply_changes(events, cursor)
+                    except Exception as e:
+                        # The page is fetched and applied again after the delay
+                        self.record_error(e, f"changes page {cur_change_id}")
+                        stats['total_errors'] += 1
+                        await idle(delay)
+                        delay = min(delay * 2, max_idle)
+                        continue
+                    
+                    stats['total_loaded'] += page_stats.get('loaded', 0)
+                    stats['total_updated'] += page_stats.get('updated', 0)
+                    stats['total_removed'] += page_stats.get('removed', 0)
+                    stats['total_errors'] += page_stats.get('errors', 0) + invalid
+                    stats['total_duplicates'] += page_stats.get('duplicates', 0)
+                    stats['pages'] += 1
+                    applied_since_idle += len(events)
+                    ids = [e['id'] for e in events if isinstance(e.get('id'), int)]
+                    last_applied_id = max(ids) if ids else last_applied_id
+                elif completed or cur_change_id != change_id:
+                    await self._save_cursor(**cursor)
+                synced_date = completed or synced_date
+                
+                if events:
+                    logger.info(
+                        f"Tail: change_id {cur_change_id} | "
+                        f"Loaded: {stats['total_loaded']:,} | "
+                        f"Updated: {stats['total_updated']:,} | "
+                        f"Removed: {stats['total_removed']:,} | "
+                        f"Duplicates: {stats['total_duplicates']:,}"
+                        + (f" | Rate: {self.rate_controller.rate:.2f} req/s" if self.rate_controller else "")
+                    )
+                
+                if not drained:
+                    change_id = next_change_id
+                    last_applied_id = None
+                    delay = poll_interval
+                    continue
+                
+                change_id = cur_change_id
+                if applied_since_idle and on_idle:
+                    logger.info(f"Feed drained after {applied_since_idle:,} change(s)")
+                    applied_since_idle = 0
+                    try:
+                        await on_idle()
+                    except Exception as e:
+                        self.record_error(e, "tail idle callback")
+                        stats['total_errors'] += 1
+                await idle(delay)
+                delay = min(delay * 2, max_idle)
+            
+            await self.finish_operation("ERROR" if stats['total_errors'] > 0 else "OK")
+            logger.info(
+                f"Tail stopped at change_id {change_id}: "
+                f"pages={stats['pages']}, "
+                f"loaded={stats['total_loaded']}, "
+                f"updated={stats['total_updated']}, "
+                f"removed={stats['total_removed']}, "
+                f"duplicates={stats['total_duplicates']}, "
+                f"errors={stats['total_errors']}"
+            )
+            return stats
+            
+        except Exception as e:
+            self.record_error(e, "tail")
+            await self.finish_operation("ERROR")
+            raise
+        finally:
+            await self.client.close()
+    
+    async def _tail_start(self) -> Tuple[int, Optional[date]]:
+        """
+        Get the change_id to start tailing from.
+        
+        Returns:
+            Tuple of (change_id, sync_state.last_successful_date or None)
+            
+        Raises:
+            ValueError: If there is no cursor and the API returns no change_id
+        """
+        async with self.get_db_session() as session:
+            result = await session.execute(select(SyncState))
+            sync_state = result.scalar_one_or_none()
+        
+        if sync_state and not self.start_date:
+            change_id = sync_state.next_change_id or sync_state.last_change_id
+            if change_id:
+                return change_id, sync_state.last_successful_date
+        
+        process_date = self.start_date or date.today() - timedelta(days=1)
+        if self.rate_controller:
+            await self.rate_controller.acquire()
+        change_id = await self.client.get_change_id(process_date)
+        if not change_id:
+            raise ValueError(f"No change_id returned for date {process_date}")
+        return change_id, sync_state.last_successful_date if sync_state else None
+    
+    async def _pending_dates(self) -> Tuple[List[date], Optional[date], Optional[int]]:
+        """
+        Get dates to process.
+        
+        Dates already marked done in sync_state are skipped unless reapply is set.
+        
+        Returns:
+            Tuple of (dates in order, date after the last one if max_dates cut the range, else None,
+            saved feed cursor to resume from or None)
+        """
+        yesterday = date.today() - timedelta(days=1)
+        
+        async with self.get_db_session() as session:
+            result = await session.execute(select(SyncState))
+            sync_state = result.scalar_one_or_none()
+        last_date = sync_state.last_successful_date if sync_state else None
+        
+        if self.start_date:
+            first_date = self.start_date
+        elif last_date:
+            # Catch up every date missed since the last successful run
+            first_date = last_date + timedelta(days=1)
+        else:
+            first_date = yesterday
+        last_to_process = max(yesterday, self.start_date or yesterday)
+        
+        if last_date and not self.reapply and first_date <= last_date:
+            first_date = last_date + timedelta(days=1)
+        if first_date > last_to_process:
+            logger.info(f"Date {last_to_process} already processed (last_date={last_date})")
+            return [], None, None
+        
+        cursor = sync_state.next_change_id if sync_state and not self.reapply else None
+        dates = [first_date + timedelta(days=i) for i in range((last_to_process - first_date).days + 1)]
+        if self.max_dates and len(dates) > self.max_dates:
+            dates = dates[:self.max_dates]
+            return dates, dates[-1] + timedelta(days=1), cursor
+        return dates, None, cursor
+    
+    async def _resolve_change_ids(self, dates: List[date]) -> Dict[date, int]:
+        """
+        Get initial change_id of several dates with requests in parallel.
+        
+        Args:
+            dates: Dates to look up
+            
+        Returns:
+            Dictionary of date -> change_id (dates without change_id are left out)
+            
+        Raises:
+            Exception: If the change_id of the first date cannot be fetched
+        """
+        async def resolve(process_date: date) -> Optional[int]:
+            if self.rate_controller:
+                await self.rate_controller.acquire()
+            return await self.client.get_change_id(process_date)
+        
+        results = await asyncio.gather(*(resolve(d) for d in dates), return_exceptions=True)
+        if isinstance(results[0], Exception):
+            raise results[0]
+        
+        starts = {}
+        for process_date, change_id in zip(dates, results):
+            if isinstance(change_id, Exception):
+                # Its changes are still read from the previous date's start
+                logger.warning(f"Failed to get change_id for {process_date}: {change_id}")
+            elif change_id:
+                starts[process_date] = change_id
+        return starts
+    
+    async def _change_pages(
+        self,
+        initial_change_id: int,
+        process_date: date,
+        stats: Dict[str, Any],
+        pipeline: Pipeline,
+        end_change_id: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, int, Dict[str, Any]]]:
+        """
+        Fetch /changes pages following next_change_id.
+        
+        Each request needs the cursor from the previous response, so pages are
+        fetched one by one; the pipeline overlaps them with writing.
+        
+        Args:
+            initial_change_id: change_id to start from
+            process_date: First date being processed (for logging)
+            stats: Statistics dictionary (errors are counted here)
+            pipeline: Pipeline consuming the pages
+            end_change_id: Stop once next_change_id reaches it (None: follow the feed to its end)
+            
+        Yields:
+            Tuples of (page_number, change_id, response)
+        """
+        current_change_id = initial_change_id
+        page_number = 0
+        
+        while not pipeline.stopped:
+            page_number += 1
+            try:
+                if self.rate_controller:
+                    await self.rate_controller.acquire()
+                
+                # Request /changes with current_change_id
+                response = await self.client.get_changes(change_id=current_change_id)
+            except Exception as e:
+                self.record_error(e, f"changes page {page_number} from {process_date}")
+                stats['total_errors'] += 1
+                return
+            
+            yield page_number, current_change_id, response
+            
+            # Get next_change_id from meta
+            # Stop when next_change_id is None or null
+            next_change_id = (response.get('meta') or {}).get('next_change_id')
+            if next_change_id is None:
+                logger.info(f"Pagination complete: fetched {page_number} page(s)")
+                return
+            if end_change_id is not None and next_change_id >= end_change_id:
+                logger.info(f"Pagination reached the last date: fetched {page_number} page(s)")
+                return
+            
+            # Continue with next_change_id
+            current_change_id = next_change_id
+    
+    def _decode_changes(self, records: list) -> Tuple[list, int]:
+        """
+        Drop change records that cannot be applied.
+        
+        Args:
+            records: List of change records from API
+            
+        Returns:
+            Tuple of (records with inner_id, number of dropped records)
+        """
+        events = []
+        invalid = 0
+        for record in records:
+            if not record.get('inner_id'):
+                logger.warning(f"Record without inner_id skipped: {record.get('id', 'unknown')}")
+                invalid += 1
+                continue
+            events.append(record)
+        return events, invalid
     
     async def _save_changes(self, records: list) -> Dict[str, int]:
         """
@@ -207,6 +637,40 @@ class DailyUpdater(BaseLoader):
         Args:
             records: List of change records from API
             
+        Returns:
+            Statistics dictionary
+        """
+        events, invalid = self._decode_changes(records)
+        stats = await self._apply_changes(events)
+        stats['errors'] += invalid
+        return stats
+    
+    async def _apply_changes(self, events: list, cursor: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """
+        Apply decoded change events to database.
+        
+        Events are applied in feed order against one prefetch of the affected
+        listings' state (without data), so several events of one listing
+        (added -> changed -> removed) collapse into its net final state. The
+        result is written with set-based statements: one INSERT for new
+        listings, one executemany UPDATE for changed ones and one UPDATE for
+        listings that were only removed.
+        
+        Stored documents are never read: "changed" events of an existing
+        listing accumulate a patch (new_* fields mapped) that PostgreSQL
+        merges with data || patch. Only listings created in this window are
+        merged in Python with merge_json. The fields touched by the events are
+        recorded in pending_fields, so the normalizer can recompute only them.
+        
+        With store_changes the events themselves are appended to raw_changes,
+        and with record_prices their prices to price_history, in the same
+        transaction.
+        
+        Args:
+            events: Change records with inner_id, in feed order (one page or a window of pages)
+            cursor: Feed cursor committed in the same transaction (arguments of
+                _write_cursor: last_change_id, next_change_id, completed_date)
+            
         Returns:
             Statistics dictionary
         """
@@ -214,157 +678,190 @@ class DailyUpdater(BaseLoader):
         now = datetime.utcnow()
         
         async with self.get_db_session() as session:
-            for record in records:
+            try:
+                existing = await fetch_existing(
+                    session, [r['inner_id'] for r in events], self.table, columns=STATE_COLUMNS
+                )
+            except Exception as e:
+                await session.rollback()
+                self.record_error(e, "prefetch changes")
+                raise
+            
+            new_rows: Dict[str, Dict[str, Any]] = {}  # Listings created by this window
+            patched: Dict[str, Dict[str, Any]] = {}  # Existing listings: state and data patch
+            removed_only: Dict[str, Dict[str, Any]] = {}  # Existing listings only flipped to inactive
+            applied: List[Dict[str, Any]] = []  # Events that changed a listing (price history source)
+            
+            for record in events:
                 try:
-                    inner_id = record.get('inner_id')
-                    if not inner_id:
-                        logger.warning(f"Record without inner_id skipped: {record.get('id', 'unknown')}")
-                        stats['errors'] += 1
-                        continue
-                    
+                    inner_id = record['inner_id']
                     change_type = record.get('change_type', 'added')
-                    created_at_str = record.get('created_at')
-                    
-                    # Parse created_at
-                    if created_at_str:
-                        try:
-                            created_at = datetime.fromisoformat(
-                                created_at_str.replace('Z', '+00:00')
-                            )
-                            # Convert to UTC naive datetime
-                            if created_at.tzinfo:
-                                created_at = created_at.astimezone().replace(tzinfo=None)
-                        except Exception:
-                            created_at = now
-                    else:
-                        created_at = now
                     
-                    # Check if record exists
-                    existing = await session.execute(
-                        select(RawData).where(RawData.inner_id == inner_id)
+                    # Current state of the listing: created earlier in this window,
+                    # already pending a patch, or as stored in the database
+                    current = (
+                        new_rows.get(inner_id)
+                        or patched.get(inner_id)
+                        or removed_only.get(inner_id)
+                        or existing.get(inner_id)
                     )
-                    existing_record = existing.scalar_one_or_none()
                     
                     if change_type == "added":
-                        if existing_record:
+                        if current is not None:
                             # Already exists, skip (duplicate)
                             stats['duplicates'] += 1
                             continue
                         
-                        # Create new record
-                        raw_data = RawData(
-                            inner_id=inner_id,
-                            change_type=change_type,
-                            created_at=created_at,
-                            data=record.get('data', {}),
-                            first_loaded_at=now,
-                            last_updated_at=now,
-                            source=self.source,
-                            active_status=0,
-                            is_processed=False
-                        )
-                        session.add(raw_data)
+                        new_rows[inner_id] = build_row(record, self.source, now, change_type)
                         stats['loaded'] += 1
                         
                     elif change_type == "changed":
-                        if existing_record:
-                            # Update existing record
-                            existing_data = existing_record.data or {}
-                            new_data = record.get('data', {})
-                            
-                            # Merge JSON with field mapping
-                            merged_data = merge_json(existing_data, new_data)
-                            
-                            existing_record.change_type = change_type
-                            existing_record.created_at = created_at
-                            existing_record.data = merged_data
-                            existing_record.last_updated_at = now
-                            existing_record.is_processed = False
+                        if current is not None:
+                            current = dict(current)
+                            current['change_type'] = change_type
+                            current['created_at'] = parse_created_at(record.get('created_at'), now)
+                            current['last_updated_at'] = now
+                            current['is_processed'] = False
                             
+                            if inner_id in new_rows:
+                                # Merge JSON with field mapping
+                                current['data'] = merge_json(current['data'] or {}, record.get('data', {}))
+                                new_rows[inner_id] = current
+                            else:
+                                # Later events win, as with data || patch
+                                patch = map_new_fields(record.get('data', {}))
+                                current['patch'] = {**current.get('patch', {}), **patch}
+                                # Fields the normalizer has to recompute
+                                current['fields'] = current.get('fields', set()) | patch.keys()
+                                patched[inner_id] = current
+                                removed_only.pop(inner_id, None)
                             stats['updated'] += 1
                         else:
                             # Edge case: record doesn't exist, create it
-                            raw_data = RawData(
-                                inner_id=inner_id,
-                                change_type=change_type,
-                                created_at=created_at,
-                                data=record.get('data', {}),
-                                first_loaded_at=now,
-                                last_updated_at=now,
-                                source=self.source,
-                                active_status=0,
-                                is_processed=False
-                            )
-                            session.add(raw_data)
+                            new_rows[inner_id] = build_row(record, self.source, now, change_type)
                             stats['loaded'] += 1
                             
                     elif change_type == "removed":
-                        if existing_record:
+                        if current is not None:
                             # Mark as inactive
-                            existing_record.change_type = change_type
-                            existing_record.active_status = 1
-                            existing_record.last_updated_at = now
-                            existing_record.is_processed = False
+                            current = dict(current)
+                            current['change_type'] = change_type
+                            current['active_status'] = 1
+                            current['last_updated_at'] = now
+                            current['is_processed'] = False
                             
+                            if inner_id in new_rows:
+                                new_rows[inner_id] = current
+                            else:
+                                current['fields'] = current.get('fields', set()) | {ACTIVE_STATUS_FIELD}
+                                if inner_id in patched:
+                                    patched[inner_id] = current
+                                else:
+                                    removed_only[inner_id] = current
                             stats['removed'] += 1
                         else:
                             # Edge case: record doesn't exist, create it as inactive
-                            raw_data = RawData(
-                                inner_id=inner_id,
-                                change_type=change_type,
-                                created_at=created_at,
-                                data={},
-                                first_loaded_at=now,
-                                last_updated_at=now,
-                                source=self.source,
-                                active_status=1,
-                                is_processed=False
+                            new_rows[inner_id] = build_row(
+                                record, self.source, now, change_type, data={}, active_status=1
                             )
-                            session.add(raw_data)
                             stats['loaded'] += 1
                     
+                    applied.append(record)
+                    
                 except Exception as e:
                     self.record_error(e, f"record {record.get('inner_id', 'unknown')}")
                     stats['errors'] += 1
             
-            # Commit all changes
+            # Write and commit all changes
             try:
+                inserted = await insert_missing(session, list(new_rows.values()), self.table)
+                await patch_rows(session, patched, self.table)
+                await mark_removed(session, removed_only.keys(), now, self.table)
+                if self.store_changes:
+                    await append_changes(session, events, now)
+                if self.record_prices:
+                    # Listings another process inserted first were not written by this window
+                    lost_ids = new_rows.keys() - inserted
+                    await append_prices(
+                        session,
+                        price_points([record for record in applied if record['inner_id'] not in lost_ids]),
+                        now
+                    )
+                if cursor:
+                    await self._write_cursor(session, **cursor)
                 await session.commit()
             except Exception as e:
                 await session.rollback()
+                # A partition created in this transaction is gone
+                forget_partitions()
                 self.record_error(e, "commit changes")
                 raise
+            
+            # Listings inserted concurrently by another process were not created here
+            lost = len(new_rows) - len(inserted)
+            if lost:
+                logger.warning(f"{lost} new listing(s) already existed at insert time, counted as duplicates")
+                stats['loaded'] -= lost
+                stats['duplicates'] += lost
         
         return stats
     
-    async def _update_sync_state(
+    async def _expire_changes(self) -> None:
+        """Drop raw_changes partitions older than raw_changes.retention_months."""
+        retention_months = config.get('raw_changes.retention_months')
+        if not self.store_changes or not retention_months:
+            return
+        async with self.get_db_session() as session:
+            dropped = await drop_expired_partitions(session, retention_months)
+            await session.commit()
+        if dropped:
+            logger.info(f"Dropped expired raw_changes partitions: {', '.join(dropped)}")
+    
+    async def _save_cursor(
         self,
-        process_date: date,
-        last_change_id: Optional[int]
+        last_change_id: int,
+        next_change_id: int,
+        completed_date: Optional[date] = None
     ) -> None:
         """
-        Update sync_state after successful processing.
+        Save the feed cursor to sync_state in its own transaction.
         
         Args:
-            process_date: Date that was processed
-            last_change_id: Last processed change_id
+            last_change_id: change_id of the last applied page
+            next_change_id: change_id to continue from
+            completed_date: New last_successful_date (None keeps it)
         """
         async with self.get_db_session() as session:
-            result = await session.execute(select(SyncState))
-            sync_state = result.scalar_one_or_none()
-            
-            if sync_state:
-                # Update existing record
-                sync_state.last_successful_date = process_date
-                sync_state.last_change_id = last_change_id
-                sync_state.updated_at = datetime.utcnow()
-            else:
-                # Create new record
-                sync_state = SyncState(
-                    last_successful_date=process_date,
-                    last_change_id=last_change_id,
-                    updated_at=datetime.utcnow()
-                )
-                session.add(sync_state)
-            
+            await self._write_cursor(session, last_change_id, next_change_id, completed_date)
             await session.commit()
+    
+    async def _write_cursor(
+        self,
+        session: AsyncSession,
+        last_change_id: int,
+        next_change_id: int,
+        completed_date: Optional[date] = None
+    ) -> None:
+        """
+        Update sync_state with the feed cursor (caller commits).
+        
+        Args:
+            session: Database session
+            last_change_id: change_id of the last applied page
+            next_change_id: change_id to continue from
+            completed_date: New last_successful_date (None keeps it)
+        """
+        result = await session.execute(select(SyncState).with_for_update())
+        sync_state = result.scalar_one_or_none()
+        
+        if sync_state is None:
+            # Dates before the cursor are not known to be processed
+            sync_state = SyncState(
+                last_successful_date=completed_date or date.today() - timedelta(days=2)
+            )
+            session.add(sync_state)
+        elif completed_date:
+            sync_state.last_successful_date = completed_date
+        sync_state.last_change_id = last_change_id
+        sync_state.next_change_id = next_change_id
+        sync_state.updated_at = datetime.utcnow()
@@ -2,38 +2,116 @@
 
 import asyncio
 import sys
+import time
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Optional, Dict, Any
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from pathlib import Path
+from typing import Optional, Dict, Any, List
 
 from app.loaders.base_loader import BaseLoader
-from app.database.models import RawData
-from app.utils.che168_client import CHE168Client
+from app.loaders.copy_ingest import CopyIngestor
+from app.loaders.load_checkpoints import (
+    StreamProgress, load_checkpoints, prune_shard_checkpoints, register_streams, save_checkpoint
+)
+from app.loaders.page_fetcher import PageFetcher
+from app.loaders.pipeline import Pipeline
+from app.loaders.raw_data_writer import build_row, insert_missing
+from app.loaders.shard_planner import Shard, ShardPlanner, load_plan, save_plan
+from app.loaders.stage_stats import StageStats
+from app.utils.che168_async_client import AsyncCHE168Client
+from app.utils.config import config
 from app.utils.logger import logger
+from app.utils.rate_controller import RateController
+from app.utils.rate_limiter import UNTHROTTLED_RATE, TokenBucket
 
 
 class InitialLoader(BaseLoader):
     """Loader for initial bulk data import."""
     
-    def __init__(self, max_pages: Optional[int] = None):
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        sharded: bool = False,
+        shard_keys: Optional[List[str]] = None,
+        worker_index: int = 0,
+        worker_count: int = 1,
+        plan_file: Optional[Path] = None,
+        resume: bool = False,
+        ingest_mode: str = "insert",
+        client: Optional[Any] = None
+    ):
         """
         Initialize initial loader.
         
         Args:
-            max_pages: Maximum number of pages to load (None for unlimited, useful for testing)
+            max_pages: Maximum number of pages to load (None for unlimited, useful for testing).
+                In sharded mode the limit applies to each shard.
+            concurrency: Number of page requests in flight (default from config)
+            sharded: Split the catalogue into filter shards and load them as independent streams
+            shard_keys: Load only shards with these keys (e.g. to retry failed shards)
+            worker_index: Index of this worker when shards are spread across machines
+            worker_count: Total number of workers sharing the shard plan
+            plan_file: JSON file to read the shard plan from (written there if missing)
+            resume: Continue from stored checkpoints instead of starting from page 1
+            ingest_mode: "insert" (INSERT per page) or "copy" (COPY into unlogged staging,
+                merged into raw_data at checkpoint boundaries)
+            client: API client (default AsyncCHE168Client; e.g. ReplayCHE168Client to load from archive)
         """
+        if ingest_mode not in ("insert", "copy"):
+            raise ValueError(f"Unknown ingest mode: {ingest_mode}")
+
         super().__init__("data_fetch")
-        self.client = CHE168Client()
+        self.client = client or AsyncCHE168Client()
         self.max_pages = max_pages
         self.source = "initial_load"
+        self.sharded = sharded
+        self.shard_keys = set(shard_keys) if shard_keys else None
+        self.worker_index = worker_index
+        self.worker_count = max(1, worker_count)
+        self.plan_file = plan_file
+        self.resume = resume
+        
+        load_config = config.get_initial_load_config()
+        self.pipeline_config = config.get_pipeline_config()
+        self.shard_config = load_config.get('shards', {})
+        self.concurrency = concurrency or load_config.get('concurrency', 4)
+        # One adaptive rate budget shared by all concurrent page requests;
+        # the client reports every response back to it
+        self.rate_controller: Optional[RateController] = None
+        if self.client.rate_limited:
+            self.rate_controller = RateController.from_config(
+                rate=load_config.get('requests_per_second', 1.4),
+                burst=load_config.get('burst', 2),
+                name="initial load"
+            )
+            self.client.rate_controller = self.rate_controller
+            self.rate_limiter = self.rate_controller
+        else:
+            # Replayed responses are read from disk at full speed
+            self.rate_limiter = TokenBucket(rate=UNTHROTTLED_RATE, capacity=UNTHROTTLED_RATE)
+        self.streams: List[StreamProgress] = []
+        
+        self.ingest_mode = ingest_mode
+        self.stage_stats = StageStats()
+        self.ingestor: Optional[CopyIngestor] = None
+        if ingest_mode == "copy":
+            copy_config = load_config.get('copy', {})
+            self.ingestor = CopyIngestor(
+                batch=f"worker-{worker_index}",
+                merge_every_pages=copy_config.get('merge_every_pages', 50),
+                stats=self.stage_stats
+            )
     
     async def load(self) -> Dict[str, Any]:
         """
         Load all offers from API.
         
         Returns:
-            Dictionary with statistics: total_loaded, total_errors, total_pages
+            Dictionary with statistics: total_loaded, total_errors, total_pages,
+            total_skipped, failed_shards (keys of shards that did not complete)
+            stages (rows, seconds and rows_per_sec per ingest stage) and
+            request_rate (adaptive rate controller metrics, empty for replay)
         """
         await self.start_operation()
         
@@ -41,82 +119,54 @@ class InitialLoader(BaseLoader):
             'total_loaded': 0,
             'total_errors': 0,
             'total_pages': 0,
-            'total_skipped': 0
+            'total_skipped': 0,
+            'failed_shards': [],
+            'stages': {},
+            'request_rate': {}
         }
         
         try:
-            page = 1
-            has_more = True
-            
-            # Get first page to determine total (if possible)
-            logger.info(f"Starting initial load (max_pages={self.max_pages or 'unlimited'})")
-            
-            while has_more:
-                # Check max_pages limit for testing
-                if self.max_pages and page > self.max_pages:
-                    logger.info(f"Reached max_pages limit ({self.max_pages}), stopping")
-                    break
-                
-                try:
-                    # Rate limiting: wait 0.7 seconds between requests
-                    if page > 1:
-                        await asyncio.sleep(0.7)
-                    
-                    # Fetch page from API
-                    # Use asyncio.to_thread to avoid blocking event loop with sync API calls
-                    response = await asyncio.to_thread(self.client.get_offers, page=page)
-                    
-                    result = response.get('result', [])
-                    meta = response.get('meta', {})
-                    next_page = meta.get('next_page')
-                    
-                    if not result:
-                        logger.warning(f"No data in page {page}")
-                        has_more = False
-                        break
-                    
-                    # Process and save records
-                    loaded, skipped = await self._save_page(result, page)
-                    stats['total_loaded'] += loaded
-                    stats['total_skipped'] += skipped
-                    stats['total_pages'] += 1
-                    
-                    # Progress output
-                    progress_msg = (
-                        f'\r[INFO] Initial load: Page {page} | '
-                        f'Records loaded: {stats["total_loaded"]:,} | '
-                        f'Skipped: {stats["total_skipped"]:,} | '
-                        f'Errors: {stats["total_errors"]}'
-                    )
-                    sys.stdout.write(progress_msg)
-                    sys.stdout.flush()
-                    
-                    # Check if there's a next page
-                    if next_page is None:
-                        has_more = False
-                    else:
-                        page = next_page
-                    
-                except Exception as e:
-                    sys.stdout.write('\n')
-                    sys.stdout.flush()
-                    self.record_error(e, f"page {page}")
-                    stats['total_errors'] += 1
-                    
-                    # Wait 0.7 seconds before retrying next page
-                    await asyncio.sleep(0.7)
-                    
-                    # Continue to next page even on error
-                    page += 1
-                    # Safety check: if we've had too many errors, stop
-                    if stats['total_errors'] > 10:
-                        logger.error("Too many errors, stopping load")
-                        break
+            logger.info(
+                f"Starting initial load (max_pages={self.max_pages or 'unlimited'}, "
+                f"concurrency={self.concurrency}, rate={self.rate_limiter.rate:.2f} req/s, "
+                f"sharded={self.sharded}, resume={self.resume}, ingest_mode={self.ingest_mode})"
+            )
+            
+            if self.ingestor:
+                # Staged rows of an interrupted run were never checkpointed
+                await self.ingestor.clear()
+            
+            async with self.get_db_session() as session:
+                stored = await load_checkpoints(session)
+            if self.resume and not stored:
+                logger.warning("No checkpoints found, starting from the beginning")
+            
+            if self.sharded:
+                await self._load_sharded(stats, stored)
+            else:
+                stream = self._resume_or_new("all", None, stored)
+                self.streams = [stream]
+                await self._start_streams(self.streams)
+                await self._load_stream(stream, stats, self.concurrency)
             
             # Finish progress line
             sys.stdout.write('\n')
             sys.stdout.flush()
             
+            stats['failed_shards'] = [
+                stream.key for stream in self.streams
+                if stream.shard is not None and stream.status != "completed"
+            ]
+            if stats['failed_shards']:
+                logger.warning(
+                    f"{len(stats['failed_shards'])} shard(s) did not complete, "
+                    f"continue with --resume or retry with --shard: {', '.join(stats['failed_shards'])}"
+                )
+            
+            stats['stages'] = self.stage_stats.summary()
+            if self.rate_controller:
+                stats['request_rate'] = self.rate_controller.metrics()
+            
             await self.finish_operation(
                 "ERROR" if stats['total_errors'] > 0 else "OK"
             )
@@ -135,86 +185,381 @@ class InitialLoader(BaseLoader):
             self.record_error(e, "initial load")
             await self.finish_operation("ERROR")
             raise
+        finally:
+            await self.client.close()
     
-    async def _save_page(
+    def _resume_or_new(
         self,
-        records: list,
-        page: int
-    ) -> tuple[int, int]:
+        key: str,
+        shard: Optional[Shard],
+        stored: Dict[str, StreamProgress]
+    ) -> StreamProgress:
         """
-        Save page of records to database.
+        Get stream progress from checkpoint (in resume mode) or start a new stream.
         
         Args:
-            records: List of records from API
-            page: Page number (for logging)
+            key: Stream key
+            shard: Shard filters (None for the unfiltered catalogue)
+            stored: Stored checkpoints by stream key
             
         Returns:
-            Tuple of (loaded_count, skipped_count)
+            Stream progress to load
         """
-        loaded = 0
-        skipped = 0
-        now = datetime.utcnow()
+        if self.resume and key in stored:
+            stream = stored[key]
+            logger.info(
+                f"Resuming {key}: status={stream.status}, committed through page {stream.last_page} "
+                f"(+{len(stream.committed_pages)} later pages), loaded so far {stream.loaded:,}"
+            )
+            return stream
+        return StreamProgress(key, shard)
+    
+    async def _start_streams(self, streams: List[StreamProgress]) -> None:
+        """Write initial checkpoints of the streams this run is going to load."""
+        async with self.get_db_session() as session:
+            for stream in streams:
+                await save_checkpoint(session, stream)
+            await session.commit()
+    
+    async def _load_sharded(self, stats: Dict[str, Any], stored: Dict[str, StreamProgress]) -> None:
+        """
+        Load the catalogue as independent filter-shard streams.
         
+        Args:
+            stats: Global statistics dictionary (updated in place)
+            stored: Stored checkpoints by stream key
+        """
+        shards = await self._get_shard_plan(stored)
+        
+        # Deterministic split of the plan between workers/machines
+        selected = [
+            shard for index, shard in enumerate(shards)
+            if index % self.worker_count == self.worker_index
+        ]
+        if self.shard_keys is not None:
+            selected = [shard for shard in selected if shard.key in self.shard_keys]
+            unknown = self.shard_keys - {shard.key for shard in shards}
+            if unknown:
+                logger.warning(f"Unknown shard keys ignored: {', '.join(sorted(unknown))}")
+        
+        # Keep the whole plan in the database so --resume does not depend on re-planning
         async with self.get_db_session() as session:
-            for record in records:
+            if not self.resume:
+                await prune_shard_checkpoints(session, [shard.key for shard in shards])
+            await register_streams(session, [StreamProgress(shard.key, shard) for shard in shards])
+            await session.commit()
+        
+        self.streams = [
+            self._resume_or_new(shard.key, shard, stored) for shard in selected
+        ]
+        await self._start_streams(self.streams)
+        logger.info(
+            f"Loading {len(self.streams)} of {len(shards)} shards "
+            f"(worker {self.worker_index + 1}/{self.worker_count})"
+        )
+        
+        semaphore = asyncio.Semaphore(self.shard_config.get('parallel_shards', 4))
+        per_shard_concurrency = self.shard_config.get('concurrency_per_shard', 1)
+        
+        async def run(stream: StreamProgress) -> None:
+            async with semaphore:
                 try:
-                    inner_id = record.get('inner_id')
-                    if not inner_id:
-                        logger.warning(f"Record without inner_id skipped: {record.get('id')}")
-                        skipped += 1
-                        continue
-                    
-                    # Check if record already exists
-                    existing = await session.execute(
-                        select(RawData).where(RawData.inner_id == inner_id)
-                    )
-                    if existing.scalar_one_or_none():
-                        # Duplicate, skip
-                        skipped += 1
-                        continue
-                    
-                    # Parse created_at
-                    created_at_str = record.get('created_at')
-                    if created_at_str:
-                        try:
-                            # Try parsing ISO format
-                            created_at = datetime.fromisoformat(
-                                created_at_str.replace('Z', '+00:00')
-                            )
-                            # Convert to UTC naive datetime
-                            if created_at.tzinfo:
-                                created_at = created_at.astimezone().replace(tzinfo=None)
-                        except Exception:
-                            created_at = now
-                    else:
-                        created_at = now
-                    
-                    # Create new record
-                    raw_data = RawData(
-                        inner_id=inner_id,
-                        change_type=record.get('change_type', 'added'),
-                        created_at=created_at,
-                        data=record.get('data', {}),
-                        first_loaded_at=now,
-                        last_updated_at=now,
-                        source=self.source,
-                        active_status=0,  # Active by default
-                        is_processed=False
-                    )
-                    
-                    session.add(raw_data)
-                    loaded += 1
-                    
+                    await self._load_stream(stream, stats, per_shard_concurrency)
                 except Exception as e:
-                    self.record_error(e, f"record {record.get('inner_id', 'unknown')}")
+                    stream.status = "failed"
+                    self.record_error(e, f"shard {stream.key}")
+                    stats['total_errors'] += 1
+        
+        if any(stream.shard.is_catch_all for stream in self.streams):
+            logger.warning(
+                "Plan contains the unfiltered catch-all shard: it re-reads the whole catalogue "
+                "after the filtered shards of this worker (initial_load.shards.catch_all)"
+            )
+        
+        # The catch-all stream goes last: most of its rows are already loaded by then
+        await asyncio.gather(*[run(stream) for stream in self.streams if not stream.shard.is_catch_all])
+        await asyncio.gather(*[run(stream) for stream in self.streams if stream.shard.is_catch_all])
+    
+    async def _get_shard_plan(self, stored: Dict[str, StreamProgress]) -> List[Shard]:
+        """
+        Get shard plan from checkpoints (resume), plan_file or build it from /filters.
+        
+        Args:
+            stored: Stored checkpoints by stream key
+            
+        Returns:
+            List of shards in stable order
+        """
+        stored_shards = [stream.shard for stream in stored.values() if stream.shard is not None]
+        if self.resume and stored_shards:
+            logger.info(f"Using shard plan with {len(stored_shards)} shards from checkpoints")
+            return sorted(stored_shards, key=lambda shard: shard.key)
+        
+        if self.plan_file and self.plan_file.exists():
+            shards = load_plan(self.plan_file)
+            logger.info(f"Loaded shard plan with {len(shards)} shards from {self.plan_file}")
+            return shards
+        
+        planner = ShardPlanner(
+            fetch_offers=self._fetch_page,
+            fetch_filters=self.client.get_filters,
+            rate_limiter=self.rate_limiter,
+            shard_config=self.shard_config
+        )
+        shards = await planner.plan()
+        
+        if self.plan_file:
+            save_plan(shards, self.plan_file)
+            logger.info(f"Shard plan saved to {self.plan_file}")
+        return shards
+    
+    async def _load_stream(
+        self,
+        stream: StreamProgress,
+        stats: Dict[str, Any],
+        concurrency: int
+    ) -> None:
+        """
+        Load one page stream and commit its pages as they arrive.
+        
+        Pages flow through a pipeline: concurrent fetchers -> decode (build
+        rows) -> write, so the network, CPU and database work overlap. Every
+        page commit also stores the stream checkpoint in the same transaction,
+        so a restarted load skips exactly the committed pages.
+        
+        Args:
+            stream: Stream progress (updated in place)
+            stats: Global statistics dictionary (updated in place)
+            concurrency: Number of page requests in flight for this stream
+        """
+        if stream.status == "completed":
+            logger.info(f"Stream {stream.key} already completed, skipping")
+            return
+        
+        filters = stream.shard.filters() if stream.shard else {}
+        
+        fetcher = PageFetcher(
+            fetch_page=lambda page: self._fetch_page(page=page, **filters),
+            rate_limiter=self.rate_limiter,
+            concurrency=concurrency,
+            start_page=stream.last_page + 1,
+            max_pages=self.max_pages,
+            skip_pages=stream.committed_pages,
+            end_page=stream.end_page
+        )
+        pipeline = Pipeline(
+            f"initial load {stream.key}",
+            queue_size=self.pipeline_config.get('queue_size', 4),
+            log_interval=self.pipeline_config.get('log_interval_seconds', 30)
+        )
+        stream.status = "running"
+        run_errors = 0
+        
+        def fail(page: int, error: Exception) -> None:
+            nonlocal run_errors
+            sys.stdout.write('\n')
+            sys.stdout.flush()
+            self.record_error(error, f"page {page} of {stream.key}")
+            stream.errors += 1
+            run_errors += 1
+            stats['total_errors'] += 1
+            
+            # Safety check: if we've had too many errors, stop this stream
+            if run_errors > 10 and not pipeline.stopped:
+                logger.error(f"Too many errors, stopping {stream.key}")
+                pipeline.stop()
+        
+        async def decode(item):
+            page, response, error = item
+            if error is not None:
+                # Continue with other pages even on error
+                fail(page, error)
+                return None
+            
+            result = response.get('result', [])
+            if not result:
+                # Pages past the end come back empty
+                stream.mark_end(page - 1)
+                logger.debug(f"No data in page {page} of {stream.key}")
+                return None
+            if (response.get('meta') or {}).get('next_page') is None:
+                stream.mark_end(page)
+            
+            rows, skipped = self._build_rows(result)
+            return page, rows, skipped
+        
+        async def write(item):
+            page, rows, skipped = item
+            try:
+                if self.ingestor:
+                    # Checkpoints advance when staged pages are merged
+                    await self.ingestor.stage(stream, page, rows, skipped)
+                    loaded = skipped = 0
+                    if self.ingestor.merge_due:
+                        await self._merge_staged(stats)
+                else:
+                    # Save records together with the checkpoint
+                    loaded, skipped = await self._save_page(rows, skipped, page, stream)
+            except Exception as e:
+                fail(page, e)
+                return
+            
+            stats['total_loaded'] += loaded
+            stats['total_skipped'] += skipped
+            stats['total_pages'] += 1
+            
+            self._write_progress(stats, stream, page)
+        
+        # Pages arrive out of order; each one is committed as soon as it is written
+        pipeline.add_stage('decode', decode)
+        pipeline.add_stage('write', write, workers=self.pipeline_config.get('writers', 1))
+        await pipeline.run(fetcher.pages())
+        
+        if self.ingestor:
+            try:
+                await self._merge_staged(stats)
+            except Exception as e:
+                self.record_error(e, f"merge staged pages of {stream.key}")
+                run_errors += 1
+                stats['total_errors'] += 1
+        
+        # Failed pages stay uncommitted and are fetched again on --resume
+        if stream.is_done:
+            stream.status = "completed"
+        elif run_errors:
+            stream.status = "failed"
+        else:
+            stream.status = "stopped"
+        
+        async with self.get_db_session() as session:
+            await save_checkpoint(session, stream)
+            await session.commit()
+    
+    def _write_progress(self, stats: Dict[str, Any], stream: StreamProgress, page: int) -> None:
+        """Write one-line progress to console."""
+        if self.sharded:
+            done = sum(1 for s in self.streams if s.status == "completed")
+            position = f'Shards: {done}/{len(self.streams)} | Pages done: {stats["total_pages"]:,}'
+        else:
+            position = f'Page {page} | Pages done: {stats["total_pages"]:,}'
+        
+        progress_msg = (
+            f'\r[INFO] Initial load: {position} | '
+            f'Records loaded: {stats["total_loaded"]:,} | '
+            f'Skipped: {stats["total_skipped"]:,} | '
+            f'Errors: {stats["total_errors"]}'
+        )
+        if self.rate_controller:
+            progress_msg += f' | Rate: {self.rate_controller.rate:.2f} req/s'
+        sys.stdout.write(progress_msg)
+        sys.stdout.flush()
+    
+    async def _fetch_page(self, page: int, **filters: Any) -> Dict[str, Any]:
+        """
+        Fetch one page of offers from API.
+        
+        Args:
+            page: Page number
+            **filters: Optional get_offers filters (mark, year_from, price_to, ...)
+            
+        Returns:
+            API response with 'result' and 'meta'
+        """
+        started = time.perf_counter()
+        response = await self.client.get_offers(page=page, **filters)
+        self.stage_stats.record('fetch', len(response.get('result') or []), time.perf_counter() - started)
+        return response
+    
+    def _build_rows(self, records: list) -> tuple[List[Dict[str, Any]], int]:
+        """
+        Build raw_data rows for a page of records.
+        
+        Args:
+            records: List of records from API
+            
+        Returns:
+            Tuple of (rows, skipped_count) where skipped are records that cannot be stored
+        """
+        started = time.perf_counter()
+        skipped = 0
+        now = datetime.utcnow()
+        
+        rows = []
+        for record in records:
+            try:
+                if not record.get('inner_id'):
+                    logger.warning(f"Record without inner_id skipped: {record.get('id')}")
                     skipped += 1
+                    continue
+                rows.append(build_row(record, self.source, now))
+            except Exception as e:
+                self.record_error(e, f"record {record.get('inner_id', 'unknown')}")
+                skipped += 1
+        
+        self.stage_stats.record('build', len(rows), time.perf_counter() - started)
+        return rows, skipped
+    
+    async def _merge_staged(self, stats: Dict[str, Any]) -> None:
+        """
+        Merge staged pages into raw_data and add their counts to statistics.
+        
+        Args:
+            stats: Global statistics dictionary (updated in place)
+        """
+        totals = await self.ingestor.merge()
+        for loaded, skipped in totals.values():
+            stats['total_loaded'] += loaded
+            stats['total_skipped'] += skipped
+    
+    async def _save_page(
+        self,
+        rows: List[Dict[str, Any]],
+        skipped: int,
+        page: int,
+        stream: Optional[StreamProgress] = None
+    ) -> tuple[int, int]:
+        """
+        Save page of records to database.
+        
+        Args:
+            rows: Column values built by _build_rows
+            skipped: Records of the page already skipped while building rows
+            page: Page number
+            stream: Stream the page belongs to; its checkpoint is committed with the page
             
-            # Commit all records from this page
+        Returns:
+            Tuple of (loaded_count, skipped_count)
+        """
+        started = time.perf_counter()
+        async with self.get_db_session() as session:
             try:
-                await session.commit()
+                # One INSERT ... ON CONFLICT DO NOTHING for the whole page
+                inserted = await insert_missing(session, rows)
             except Exception as e:
                 await session.rollback()
-                self.record_error(e, f"commit page {page}")
+                self.record_error(e, f"insert page {page}")
                 raise
+            
+            loaded = len(inserted)
+            # Existing listings (and repeats within the page) are duplicates
+            skipped += len(rows) - loaded
+            
+            # Commit all records from this page together with the checkpoint.
+            # With several writers per stream the checkpoint update is serialized,
+            # so a failed commit restores a snapshot no other page has advanced past
+            async with stream.lock if stream else nullcontext():
+                snapshot = stream.snapshot() if stream else None
+                try:
+                    if stream:
+                        stream.advance(page, loaded, skipped)
+                        await save_checkpoint(session, stream)
+                    await session.commit()
+                except Exception as e:
+                    await session.rollback()
+                    if stream:
+                        stream.restore(snapshot)
+                    self.record_error(e, f"commit page {page}")
+                    raise
         
+        self.stage_stats.record('write', len(rows), time.perf_counter() - started)
         return loaded, skipped
@@ -0,0 +1,178 @@
+"""Durable checkpoints for initial load page streams."""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import LoadCheckpoint
+from app.loaders.shard_planner import Shard
+
+
+class StreamProgress:
+    """
+    Progress and completion state of one page stream (whole catalogue or a shard).
+
+    Pages are committed out of order, so the committed position is kept as a
+    watermark (every page up to last_page is committed) plus the set of pages
+    committed above it.
+    """
+
+    def __init__(self, key: str, shard: Optional[Shard] = None):
+        """
+        Initialize stream progress.
+
+        Args:
+            key: Stream identifier ("all" or shard key)
+            shard: Shard filters (None for the unfiltered catalogue)
+        """
+        self.key = key
+        self.shard = shard
+        self.status = "pending"  # "pending", "running", "completed", "stopped", "failed"
+        self.last_page = 0
+        self.committed_pages: Set[int] = set()
+        self.end_page: Optional[int] = None
+        self.pages = 0
+        self.loaded = 0
+        self.skipped = 0
+        self.errors = 0
+        self.started_at = datetime.utcnow()
+        # Serializes advance, checkpoint save and commit of concurrent page writers
+        self.lock = asyncio.Lock()
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: LoadCheckpoint) -> 'StreamProgress':
+        """Restore stream progress from a stored checkpoint."""
+        shard = Shard.from_dict(checkpoint.shard) if checkpoint.shard else None
+        stream = cls(checkpoint.stream_key, shard)
+        stream.status = checkpoint.status
+        stream.last_page = checkpoint.last_page
+        stream.committed_pages = set(checkpoint.committed_pages or [])
+        stream.end_page = checkpoint.end_page
+        stream.pages = checkpoint.pages
+        stream.loaded = checkpoint.loaded
+        stream.skipped = checkpoint.skipped
+        stream.errors = checkpoint.errors
+        stream.started_at = checkpoint.started_at
+        return stream
+
+    def advance(self, page: int, loaded: int, skipped: int) -> None:
+        """
+        Record a committed page.
+
+        Args:
+            page: Page number
+            loaded: Records inserted from the page
+            skipped: Records skipped on the page
+        """
+        self.committed_pages.add(page)
+        while self.last_page + 1 in self.committed_pages:
+            self.last_page += 1
+            self.committed_pages.discard(self.last_page)
+        self.pages += 1
+        self.loaded += loaded
+        self.skipped += skipped
+
+    def snapshot(self) -> Tuple:
+        """Capture position and counters (to undo advance if the commit fails)."""
+        return (self.last_page, set(self.committed_pages), self.pages, self.loaded, self.skipped)
+
+    def restore(self, snapshot: Tuple) -> None:
+        """Restore position and counters captured by snapshot."""
+        self.last_page, self.committed_pages, self.pages, self.loaded, self.skipped = snapshot
+
+    def mark_end(self, page: int) -> None:
+        """Remember page as the last one with data."""
+        if self.end_page is None or page < self.end_page:
+            self.end_page = page
+
+    @property
+    def is_done(self) -> bool:
+        """Check if every page up to the known end page is committed."""
+        return self.end_page is not None and self.last_page >= self.end_page
+
+
+def _checkpoint_values(stream: StreamProgress) -> Dict:
+    """Build load_checkpoints column values for a stream."""
+    return {
+        'stream_key': stream.key,
+        'shard': stream.shard.to_dict() if stream.shard else None,
+        'status': stream.status,
+        'last_page': stream.last_page,
+        'committed_pages': sorted(stream.committed_pages),
+        'end_page': stream.end_page,
+        'pages': stream.pages,
+        'loaded': stream.loaded,
+        'skipped': stream.skipped,
+        'errors': stream.errors,
+        'started_at': stream.started_at,
+        'updated_at': datetime.utcnow(),
+    }
+
+
+async def save_checkpoint(session: AsyncSession, stream: StreamProgress) -> None:
+    """
+    Upsert stream checkpoint in the session's transaction.
+
+    The caller commits, so a page and its checkpoint become durable together.
+
+    Args:
+        session: Database session
+        stream: Stream progress to store
+    """
+    values = _checkpoint_values(stream)
+    stmt = insert(LoadCheckpoint).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LoadCheckpoint.stream_key],
+        set_={key: stmt.excluded[key] for key in values if key != 'stream_key'}
+    )
+    await session.execute(stmt)
+
+
+async def register_streams(session: AsyncSession, streams: List[StreamProgress]) -> None:
+    """
+    Store checkpoints for planned streams that have none yet.
+
+    Args:
+        session: Database session
+        streams: Streams to register
+    """
+    for stream in streams:
+        stmt = insert(LoadCheckpoint).values(**_checkpoint_values(stream))
+        stmt = stmt.on_conflict_do_nothing(index_elements=[LoadCheckpoint.stream_key])
+        await session.execute(stmt)
+
+
+async def prune_shard_checkpoints(session: AsyncSession, keep_keys: List[str]) -> None:
+    """
+    Delete shard checkpoints that are not part of the current plan.
+
+    Args:
+        session: Database session
+        keep_keys: Shard keys of the current plan
+    """
+    await session.execute(
+        delete(LoadCheckpoint).where(
+            LoadCheckpoint.shard.isnot(None),
+            LoadCheckpoint.stream_key.notin_(keep_keys)
+        )
+    )
+
+
+async def load_checkpoints(session: AsyncSession) -> Dict[str, StreamProgress]:
+    """
+    Load all stored stream checkpoints.
+
+    Args:
+        session: Database session
+
+    Returns:
+        Dictionary of stream key -> restored stream progress
+    """
+    result = await session.execute(select(LoadCheckpoint).order_by(LoadCheckpoint.stream_key))
+    return {
+        checkpoint.stream_key: StreamProgress.from_checkpoint(checkpoint)
+        for checkpoint in result.scalars().all()
+    }
@@ -0,0 +1,129 @@
+"""Concurrent page fetching for paginated API endpoints."""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from app.utils.rate_limiter import TokenBucket
+
+
+PageResult = Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]
+
+
+class PageFetcher:
+    """
+    Fetch a numbered page sequence with bounded concurrency.
+
+    Several workers claim consecutive page numbers and fetch them in parallel,
+    each request taking a token from a shared rate budget. Pages are yielded
+    in the order they arrive, not in page order. The end of the sequence is
+    the first page with an empty result or without meta.next_page; no page
+    after it is requested once it is known.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int], Awaitable[Dict[str, Any]]],
+        rate_limiter: TokenBucket,
+        concurrency: int = 4,
+        start_page: int = 1,
+        max_pages: Optional[int] = None,
+        skip_pages: Optional[Iterable[int]] = None,
+        end_page: Optional[int] = None
+    ):
+        """
+        Initialize page fetcher.
+
+        Args:
+            fetch_page: Coroutine function returning the API response for a page number
+            rate_limiter: Token bucket shared by all requests
+            concurrency: Number of page requests kept in flight
+            start_page: First page number to fetch
+            max_pages: Maximum number of pages to fetch (None for unlimited)
+            skip_pages: Page numbers that must not be fetched (already committed)
+            end_page: Last page of the sequence, if already known
+        """
+        self.fetch_page = fetch_page
+        self.rate_limiter = rate_limiter
+        self.concurrency = max(1, concurrency)
+        self.start_page = start_page
+        self.max_pages = max_pages
+        self.skip_pages = set(skip_pages or ())
+        self.last_page: Optional[int] = end_page
+        self._next_page = start_page
+
+    def _past_end(self, page: int) -> bool:
+        """Check if page is beyond the known end of the sequence."""
+        return self.last_page is not None and page > self.last_page
+
+    def _claim_page(self) -> Optional[int]:
+        """Take the next page number to fetch, or None if there is nothing left."""
+        while self._next_page in self.skip_pages:
+            self._next_page += 1
+
+        page = self._next_page
+        if self.max_pages and page >= self.start_page + self.max_pages:
+            return None
+        if self._past_end(page):
+            return None
+        self._next_page += 1
+        return page
+
+    def _mark_end(self, page: int) -> None:
+        """Remember page as the last one of the sequence."""
+        if self.last_page is None or page < self.last_page:
+            self.last_page = page
+
+    async def _worker(self, results: asyncio.Queue) -> None:
+        """Fetch pages until the sequence is exhausted."""
+        while True:
+            page = self._claim_page()
+            if page is None:
+                break
+
+            await self.rate_limiter.acquire()
+            # The end may have been found while waiting for a token
+            if self._past_end(page):
+                break
+
+            try:
+                response = await self.fetch_page(page)
+            except Exception as e:
+                await results.put((page, None, e))
+                continue
+
+            meta = response.get('meta') or {}
+            if not response.get('result') or meta.get('next_page') is None:
+                self._mark_end(page)
+
+            await results.put((page, response, None))
+
+        await results.put(None)
+
+    async def pages(self) -> AsyncIterator[PageResult]:
+        """
+        Fetch pages and yield them as they arrive.
+
+        Yields:
+            Tuples of (page, response, error); exactly one of response/error is set
+        """
+        # Bounded queue: fetchers pause when the consumer falls behind
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        workers = [
+            asyncio.create_task(self._worker(results))
+            for _ in range(self.concurrency)
+        ]
+        remaining = len(workers)
+
+        try:
+            while remaining:
+                item = await results.get()
+                if item is None:
+                    remaining -= 1
+                    continue
+                if self._past_end(item[0]):
+                    continue
+                yield item
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
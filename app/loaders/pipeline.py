@@ -0,0 +1,197 @@
+"""Staged loader pipeline connected by bounded queues."""
+
+import asyncio
+import time
+from contextlib import aclosing, nullcontext
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+
+from app.utils.logger import logger
+
+
+# Marks the end of input for one stage worker
+_DONE = object()
+
+
+class PipelineStage:
+    """One processing stage: handler, its workers and counters."""
+
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[Any]], workers: int, queue_size: int):
+        """
+        Initialize pipeline stage.
+
+        Args:
+            name: Stage name for logging
+            handler: Coroutine function processing one item; its result is passed
+                to the next stage, None drops the item
+            workers: Number of concurrent workers (1 keeps item order)
+            queue_size: Capacity of the input queue of this stage
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self.items = 0
+        self.busy_seconds = 0.0  # Time spent in handler (summed over workers)
+        self.blocked_seconds = 0.0  # Time waiting for room in the next queue (backpressure)
+        self.finished_workers = 0
+
+
+class Pipeline:
+    """
+    Run items from an async source through stages connected by bounded queues.
+
+    The source (typically page fetchers) and every stage run concurrently.
+    A full queue blocks the stage in front of it, so a slow stage holds back
+    the rest instead of letting items pile up in memory, and steady-state
+    throughput is limited by the slowest stage. Queue depths are logged every
+    log_interval seconds and per-stage timings when the run ends.
+
+    Handlers are expected to deal with their own per-item errors; an exception
+    escaping a handler stops the whole pipeline and is raised from run().
+    """
+
+    def __init__(self, name: str, queue_size: int = 4, log_interval: float = 30.0):
+        """
+        Initialize pipeline.
+
+        Args:
+            name: Pipeline name for logging
+            queue_size: Capacity of each queue between stages
+            log_interval: Seconds between queue depth log lines (0 disables them)
+        """
+        self.name = name
+        self.queue_size = queue_size
+        self.log_interval = log_interval
+        self.stages: List[PipelineStage] = []
+        self.source_items = 0
+        self.source_seconds = 0.0  # Time waiting for the source to produce an item
+        self.source_blocked_seconds = 0.0
+        self.stopped = False
+
+    def add_stage(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int = 1
+    ) -> 'Pipeline':
+        """
+        Append a stage.
+
+        Args:
+            name: Stage name for logging
+            handler: Coroutine function processing one item
+            workers: Number of concurrent workers
+
+        Returns:
+            The pipeline (for chaining)
+        """
+        self.stages.append(PipelineStage(name, handler, workers, self.queue_size))
+        return self
+
+    def stop(self) -> None:
+        """Stop taking items from the source; items already in the pipeline are still processed."""
+        self.stopped = True
+
+    async def run(self, source: AsyncIterator[Any]) -> None:
+        """
+        Feed all source items through the stages and wait until they are processed.
+
+        Args:
+            source: Async iterator producing items for the first stage
+        """
+        if not self.stages:
+            raise ValueError("Pipeline has no stages")
+
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(self._feed(source))]
+        for index, stage in enumerate(self.stages):
+            tasks.extend(
+                asyncio.create_task(self._work(index, stage))
+                for _ in range(stage.workers)
+            )
+        monitor = asyncio.create_task(self._monitor()) if self.log_interval > 0 else None
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if monitor:
+                monitor.cancel()
+                await asyncio.gather(monitor, return_exceptions=True)
+            self._log_summary(time.perf_counter() - started)
+
+    async def _feed(self, source: AsyncIterator[Any]) -> None:
+        """Move source items into the first queue."""
+        first = self.stages[0]
+        async with aclosing(source) if hasattr(source, 'aclose') else nullcontext(source) as items:
+            iterator = items.__aiter__()
+            while not self.stopped:
+                waited = time.perf_counter()
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                self.source_seconds += time.perf_counter() - waited
+                if self.stopped:
+                    break
+                self.source_items += 1
+
+                waited = time.perf_counter()
+                await first.queue.put(item)
+                self.source_blocked_seconds += time.perf_counter() - waited
+
+        for _ in range(first.workers):
+            await first.queue.put(_DONE)
+
+    async def _work(self, index: int, stage: PipelineStage) -> None:
+        """Process items of one stage and pass results to the next one."""
+        next_stage: Optional[PipelineStage] = (
+            self.stages[index + 1] if index + 1 < len(self.stages) else None
+        )
+        while True:
+            item = await stage.queue.get()
+            if item is _DONE:
+                break
+
+            started = time.perf_counter()
+            result = await stage.handler(item)
+            stage.busy_seconds += time.perf_counter() - started
+            stage.items += 1
+
+            if next_stage is not None and result is not None:
+                waited = time.perf_counter()
+                await next_stage.queue.put(result)
+                stage.blocked_seconds += time.perf_counter() - waited
+
+        # The last worker of a stage closes the input of the next one
+        stage.finished_workers += 1
+        if next_stage is not None and stage.finished_workers == stage.workers:
+            for _ in range(next_stage.workers):
+                await next_stage.queue.put(_DONE)
+
+    async def _monitor(self) -> None:
+        """Log queue depths periodically."""
+        while True:
+            await asyncio.sleep(self.log_interval)
+            depths = ' '.join(
+                f"{stage.name}={stage.queue.qsize()}/{stage.queue.maxsize}" for stage in self.stages
+            )
+            done = ' '.join(f"{stage.name}={stage.items}" for stage in self.stages)
+            logger.info(f"Pipeline {self.name}: queues {depths} | done source={self.source_items} {done}")
+
+    def _log_summary(self, elapsed: float) -> None:
+        """Log per-stage timings of the finished run."""
+        logger.info(
+            f"Pipeline {self.name} finished in {elapsed:.1f}s: "
+            f"source {self.source_items} items, waited {self.source_seconds:.1f}s, "
+            f"blocked {self.source_blocked_seconds:.1f}s"
+        )
+        for stage in self.stages:
+            average = stage.busy_seconds / stage.items * 1000 if stage.items else 0.0
+            logger.info(
+                f"  {stage.name}: {stage.items} items, busy {stage.busy_seconds:.1f}s "
+                f"({average:.1f} ms/item, {stage.workers} worker(s)), blocked {stage.blocked_seconds:.1f}s"
+            )
+
@@ -0,0 +1,193 @@
+"""Incremental maintenance of price_history from change events."""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Table, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import PriceHistory
+from app.loaders.raw_data_writer import parse_created_at
+
+
+PRICE_HISTORY_TABLE: Table = PriceHistory.__table__
+
+
+def parse_price(value: Any) -> Optional[int]:
+    """
+    Parse price from API data (same rules as the normalizer).
+
+    Args:
+        value: Price as number or string with separators
+
+    Returns:
+        Price in CNY (None if missing or invalid)
+    """
+    if not value:
+        return None
+    try:
+        if isinstance(value, str):
+            digits = ''.join(c for c in value if c.isdigit())
+            return int(digits) if digits else None
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def price_points(events: List[Dict[str, Any]]) -> Dict[str, List[Tuple[datetime, int]]]:
+    """
+    Extract price points from change events.
+
+    "added" events contribute the listing's price, "changed" events their
+    new_price (or price). Events without a valid created_at are skipped:
+    a fallback timestamp would differ on every re-read of the page, so the
+    point could not be recognized as already recorded.
+
+    Args:
+        events: Applied change records with inner_id, in feed order
+
+    Returns:
+        Dictionary of inner_id -> [(time, price), ...] in feed order
+    """
+    points: Dict[str, List[Tuple[datetime, int]]] = {}
+    for record in events:
+        change_type = record.get('change_type', 'added')
+        data = record.get('data') or {}
+        if change_type == 'added':
+            price = parse_price(data.get('price'))
+        elif change_type == 'changed':
+            price = parse_price(data.get('new_price', data.get('price')))
+        else:
+            continue
+        created_at = parse_created_at(record.get('created_at'), None)
+        if price is not None and created_at is not None:
+            points.setdefault(record['inner_id'], []).append((created_at, price))
+    return points
+
+
+async def fetch_last_points(
+    session: AsyncSession,
+    inner_ids: Iterable[str]
+) -> Dict[str, Tuple[datetime, int]]:
+    """
+    Fetch the last stored point of listings that have a history, in one query.
+
+    Args:
+        session: Database session
+        inner_ids: Listing IDs to look up
+
+    Returns:
+        Dictionary of inner_id -> (last recorded_at, current_price)
+    """
+    inner_ids = list(set(inner_ids))
+    if not inner_ids:
+        return {}
+    table = PRICE_HISTORY_TABLE
+    result = await session.execute(
+        select(
+            table.c.inner_id,
+            table.c.recorded_at[func.cardinality(table.c.recorded_at)].label('last_recorded_at'),
+            table.c.current_price,
+        ).where(table.c.inner_id.in_(inner_ids))
+    )
+    return {row.inner_id: (row.last_recorded_at, row.current_price) for row in result}
+
+
+def history_row(
+    inner_id: str,
+    points: List[Tuple[datetime, int]],
+    last_point: Optional[Tuple[datetime, int]],
+    now: datetime
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the price_history increment of one listing.
+
+    Points not later than the last stored point were already applied (the
+    feed cursor re-reads its last page on the next run and after a restart)
+    and are skipped. Points repeating the previous price are dropped; drops
+    are counted against the stored current price too.
+
+    Args:
+        inner_id: Listing ID
+        points: New (time, price) points in feed order
+        last_point: Stored (last recorded_at, current_price), None if the listing has no history
+        now: Update timestamp
+
+    Returns:
+        Dictionary of price_history column values (None if no price changed)
+    """
+    recorded_at: List[datetime] = []
+    prices: List[int] = []
+    drops = 0
+    last_drop_at = None
+    last_at, previous = last_point if last_point is not None else (None, None)
+    for at, price in points:
+        if last_at is not None and at <= last_at:
+            continue
+        if price == previous:
+            continue
+        if previous is not None and price < previous:
+            drops += 1
+            last_drop_at = at
+        recorded_at.append(at)
+        prices.append(price)
+        previous = price
+    if not prices:
+        return None
+    return {
+        'inner_id': inner_id,
+        'recorded_at': recorded_at,
+        'prices': prices,
+        'first_price': prices[0],
+        'current_price': prices[-1],
+        'price_drops': drops,
+        'last_drop_at': last_drop_at,
+        'updated_at': now,
+    }
+
+
+async def append_prices(
+    session: AsyncSession,
+    points: Dict[str, List[Tuple[datetime, int]]],
+    now: datetime
+) -> int:
+    """
+    Append price points and update the summary columns, in one statement.
+
+    Args:
+        session: Database session (caller commits)
+        points: Dictionary of inner_id -> [(time, price), ...] from price_points
+        now: Update timestamp
+
+    Returns:
+        Number of listings whose price changed
+    """
+    if not points:
+        return 0
+    last_points = await fetch_last_points(session, points.keys())
+    rows = [
+        row for row in (
+            history_row(inner_id, listing_points, last_points.get(inner_id), now)
+            for inner_id, listing_points in points.items()
+        )
+        if row is not None
+    ]
+    if not rows:
+        return 0
+
+    table = PRICE_HISTORY_TABLE
+    stmt = insert(table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.inner_id],
+        set_={
+            # first_price stays as first recorded
+            'recorded_at': table.c.recorded_at.concat(stmt.excluded.recorded_at),
+            'prices': table.c.prices.concat(stmt.excluded.prices),
+            'current_price': stmt.excluded.current_price,
+            'price_drops': table.c.price_drops + stmt.excluded.price_drops,
+            'last_drop_at': func.coalesce(stmt.excluded.last_drop_at, table.c.last_drop_at),
+            'updated_at': stmt.excluded.updated_at,
+        }
+    )
+    await session.execute(stmt)
+    return len(rows)
@@ -0,0 +1,282 @@
+"""Set-based write path for raw_data."""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from sqlalchemy import String, Table, bindparam, case, cast, func, literal, null, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import RawData
+
+
+RAW_DATA_TABLE: Table = RawData.__table__
+
+# Columns rewritten for an existing listing by update_rows
+UPDATE_COLUMNS = ('change_type', 'created_at', 'data', 'active_status', 'last_updated_at', 'is_processed')
+
+# Columns rewritten by patch_rows (data is patched in the database, never read)
+STATE_COLUMNS = tuple(name for name in UPDATE_COLUMNS if name != 'data')
+
+# pending_fields entry of a listing whose active_status changed (not a data field)
+ACTIVE_STATUS_FIELD = 'active_status'
+
+
+def pending_fields_after(table: Table, fields):
+    """
+    Get the SQL value of pending_fields after a partial change of a listing.
+
+    pending_fields lists the top-level data fields changed since the last
+    normalization (NULL: the listing needs a full normalization). A processed
+    listing starts a new list, an unprocessed one extends its list, and one
+    already waiting for a full normalization stays NULL. Used in UPDATE ...
+    SET, where the columns still hold the values before the update.
+
+    Args:
+        table: Target table
+        fields: SQL expression of the changed fields (text[])
+
+    Returns:
+        SQL expression for pending_fields
+    """
+    return case(
+        (table.c.is_processed, fields),
+        (table.c.pending_fields.is_(None), null()),
+        else_=table.c.pending_fields.concat(fields)
+    )
+
+
+def parse_created_at(value: Optional[str], default: datetime) -> datetime:
+    """
+    Parse created_at from API into a naive datetime.
+
+    Args:
+        value: ISO datetime string (may end with 'Z' or have an offset)
+        default: Value used when created_at is missing or invalid
+
+    Returns:
+        Naive datetime
+    """
+    if not value:
+        return default
+    try:
+        created_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        # Convert to UTC naive datetime
+        if created_at.tzinfo:
+            created_at = created_at.astimezone().replace(tzinfo=None)
+        return created_at
+    except Exception:
+        return default
+
+
+def build_row(
+    record: Dict[str, Any],
+    source: str,
+    now: datetime,
+    change_type: Optional[str] = None,
+    data: Optional[Dict[str, Any]] = None,
+    active_status: int = 0
+) -> Dict[str, Any]:
+    """
+    Build raw_data column values for a new listing.
+
+    Args:
+        record: Record from API (offer or change event)
+        source: "initial_load" or "daily_update"
+        now: Load timestamp
+        change_type: Override for record change_type (default: record value or "added")
+        data: Override for record data
+        active_status: 0 = active, 1 = inactive
+
+    Returns:
+        Dictionary of raw_data column values
+    """
+    return {
+        'inner_id': record['inner_id'],
+        'change_type': change_type or record.get('change_type', 'added'),
+        'created_at': parse_created_at(record.get('created_at'), now),
+        'data': record.get('data', {}) if data is None else data,
+        'first_loaded_at': now,
+        'last_updated_at': now,
+        'source': source,
+        'active_status': active_status,
+        'is_processed': False,
+    }
+
+
+async def insert_missing(
+    session: AsyncSession,
+    rows: List[Dict[str, Any]],
+    table: Table = RAW_DATA_TABLE
+) -> Set[str]:
+    """
+    Insert listings that do not exist yet, in one statement.
+
+    Rows whose inner_id already exists (in the table or earlier in rows) are
+    left untouched.
+
+    Args:
+        session: Database session (caller commits)
+        rows: Column values built by build_row
+        table: Target table
+
+    Returns:
+        Set of inserted inner_ids
+    """
+    if not rows:
+        return set()
+
+    stmt = (
+        insert(table)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[table.c.inner_id])
+        .returning(table.c.inner_id)
+    )
+    result = await session.execute(stmt)
+    return set(result.scalars().all())
+
+
+async def fetch_existing(
+    session: AsyncSession,
+    inner_ids: Iterable[str],
+    table: Table = RAW_DATA_TABLE,
+    columns: Sequence[str] = UPDATE_COLUMNS
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch current state of listings in one query.
+
+    Args:
+        session: Database session
+        inner_ids: Listing IDs to look up
+        table: Source table
+        columns: Columns to read (STATE_COLUMNS skips the data document)
+
+    Returns:
+        Dictionary of inner_id -> values of columns for existing listings
+    """
+    inner_ids = list(set(inner_ids))
+    if not inner_ids:
+        return {}
+
+    result = await session.execute(
+        select(table.c.inner_id, *[table.c[name] for name in columns])
+        .where(table.c.inner_id.in_(inner_ids))
+    )
+    return {
+        row.inner_id: {name: getattr(row, name) for name in columns}
+        for row in result
+    }
+
+
+async def update_rows(
+    session: AsyncSession,
+    rows: Dict[str, Dict[str, Any]],
+    table: Table = RAW_DATA_TABLE
+) -> None:
+    """
+    Write new state of existing listings with one executemany UPDATE.
+
+    The whole document is replaced, so the listings need a full normalization.
+
+    Args:
+        session: Database session (caller commits)
+        rows: Dictionary of inner_id -> values of UPDATE_COLUMNS
+        table: Target table
+    """
+    if not rows:
+        return
+
+    stmt = (
+        update(table)
+        .where(table.c.inner_id == bindparam('b_inner_id'))
+        .values({name: bindparam(f'b_{name}') for name in UPDATE_COLUMNS}, pending_fields=None)
+    )
+    params = [
+        {'b_inner_id': inner_id, **{f'b_{name}': values[name] for name in UPDATE_COLUMNS}}
+        for inner_id, values in rows.items()
+    ]
+    await session.execute(stmt, params)
+
+
+async def patch_rows(
+    session: AsyncSession,
+    rows: Dict[str, Dict[str, Any]],
+    table: Table = RAW_DATA_TABLE
+) -> None:
+    """
+    Merge data patches into existing listings inside PostgreSQL.
+    
+    data becomes data || patch (top-level keys of the patch win, like
+    merge_json), so only the patch is sent and the stored document is never
+    read into Python. One executemany UPDATE for all rows. The changed
+    fields are added to pending_fields (see pending_fields_after).
+    
+    Args:
+        session: Database session (caller commits)
+        rows: Dictionary of inner_id -> values of STATE_COLUMNS plus 'patch'
+            (data fields with new_* already mapped, may be empty) and 'fields'
+            (changed fields, ACTIVE_STATUS_FIELD included)
+        table: Target table
+    """
+    if not rows:
+        return
+
+    empty = cast(literal('{}'), JSONB)
+    stmt = (
+        update(table)
+        .where(table.c.inner_id == bindparam('b_inner_id'))
+        .values(
+            data=func.coalesce(table.c.data, empty).op('||')(bindparam('b_patch', type_=JSONB)),
+            pending_fields=pending_fields_after(table, bindparam('b_fields', type_=ARRAY(String))),
+            **{name: bindparam(f'b_{name}') for name in STATE_COLUMNS}
+        )
+    )
+    params = [
+        {
+            'b_inner_id': inner_id,
+            'b_patch': values.get('patch') or {},
+            'b_fields': sorted(values.get('fields') or ()),
+            **{f'b_{name}': values[name] for name in STATE_COLUMNS}
+        }
+        for inner_id, values in rows.items()
+    ]
+    await session.execute(stmt, params)
+
+
+async def mark_removed(
+    session: AsyncSession,
+    inner_ids: Iterable[str],
+    now: datetime,
+    table: Table = RAW_DATA_TABLE
+) -> Set[str]:
+    """
+    Flip listings to inactive with one UPDATE, without rewriting their data.
+
+    Only active_status is queued for normalization (see pending_fields_after).
+
+    Args:
+        session: Database session (caller commits)
+        inner_ids: Listing IDs to mark as removed
+        now: Update timestamp
+        table: Target table
+
+    Returns:
+        Set of updated inner_ids
+    """
+    inner_ids = list(set(inner_ids))
+    if not inner_ids:
+        return set()
+
+    stmt = (
+        update(table)
+        .where(table.c.inner_id.in_(inner_ids))
+        .values(
+            change_type='removed',
+            active_status=1,
+            last_updated_at=now,
+            pending_fields=pending_fields_after(table, literal([ACTIVE_STATUS_FIELD], ARRAY(String))),
+            is_processed=False
+        )
+        .returning(table.c.inner_id)
+    )
+    result = await session.execute(stmt)
+    return set(result.scalars().all())
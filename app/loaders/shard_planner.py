@@ -0,0 +1,333 @@
+"""Filter-based sharding of the /offers catalogue."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.utils.logger import logger
+from app.utils.rate_limiter import TokenBucket
+
+
+class Shard:
+    """
+    Disjoint slice of the /offers catalogue defined by API filters.
+
+    Year and price bounds are inclusive; None means the side is unbounded.
+    A shard without mark and bounds is the catch-all stream (no filters).
+    """
+
+    def __init__(
+        self,
+        mark: Optional[str],
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        price_from: Optional[int] = None,
+        price_to: Optional[int] = None
+    ):
+        """
+        Initialize shard.
+
+        Args:
+            mark: Car brand (value from /filters), None for any brand
+            year_from: Minimum year
+            year_to: Maximum year
+            price_from: Minimum price (CNY)
+            price_to: Maximum price (CNY)
+        """
+        self.mark = mark
+        self.year_from = year_from
+        self.year_to = year_to
+        self.price_from = price_from
+        self.price_to = price_to
+
+    @property
+    def key(self) -> str:
+        """Stable shard identifier, e.g. 'BMW|year=2015-2019|price=0-150000'."""
+        def _range(low: Optional[int], high: Optional[int]) -> str:
+            return f"{'' if low is None else low}-{'' if high is None else high}"
+
+        return (
+            f"{'*' if self.mark is None else self.mark}"
+            f"|year={_range(self.year_from, self.year_to)}"
+            f"|price={_range(self.price_from, self.price_to)}"
+        )
+
+    @property
+    def is_catch_all(self) -> bool:
+        """True for the shard without filters (covers the whole catalogue)."""
+        return not self.filters()
+
+    def filters(self) -> Dict[str, Any]:
+        """Get keyword arguments for CHE168Client.get_offers."""
+        filters = {}
+        if self.mark is not None:
+            filters['mark'] = self.mark
+        if self.year_from is not None:
+            filters['year_from'] = self.year_from
+        if self.year_to is not None:
+            filters['year_to'] = self.year_to
+        if self.price_from is not None:
+            filters['price_from'] = self.price_from
+        if self.price_to is not None:
+            filters['price_to'] = self.price_to
+        return filters
+
+    def split_by_price(self, initial_pivot: int, min_width: int) -> Optional[Tuple['Shard', 'Shard']]:
+        """
+        Split shard into two disjoint halves of its price range.
+
+        An unbounded upper side is split at max(initial_pivot, 4 * price_from),
+        so the open-ended tail keeps shrinking on repeated splits.
+
+        Args:
+            initial_pivot: Split point for a range without upper bound
+            min_width: Ranges narrower than this are not split
+
+        Returns:
+            Tuple of (lower, upper) shards, or None if the range is too narrow
+        """
+        low = self.price_from or 0
+        if self.price_to is None:
+            pivot = max(initial_pivot, low * 4)
+        else:
+            if self.price_to - low < min_width:
+                return None
+            pivot = (low + self.price_to) // 2
+
+        lower = Shard(self.mark, self.year_from, self.year_to, self.price_from, pivot)
+        upper = Shard(self.mark, self.year_from, self.year_to, pivot + 1, self.price_to)
+        return lower, upper
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize shard to a JSON-compatible dictionary."""
+        return {
+            'mark': self.mark,
+            'year_from': self.year_from,
+            'year_to': self.year_to,
+            'price_from': self.price_from,
+            'price_to': self.price_to,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Shard':
+        """Create shard from dictionary produced by to_dict."""
+        return cls(
+            mark=data.get('mark'),
+            year_from=data.get('year_from'),
+            year_to=data.get('year_to'),
+            price_from=data.get('price_from'),
+            price_to=data.get('price_to'),
+        )
+
+    def __repr__(self) -> str:
+        return f"Shard({self.key})"
+
+
+def year_bands(boundaries: List[int]) -> List[Tuple[Optional[int], Optional[int]]]:
+    """
+    Build disjoint year ranges covering all years.
+
+    Example: [2015, 2020] -> [(None, 2014), (2015, 2019), (2020, None)]
+
+    Args:
+        boundaries: Ascending list of first years of each band
+
+    Returns:
+        List of (year_from, year_to) tuples
+    """
+    if not boundaries:
+        return [(None, None)]
+
+    boundaries = sorted(set(boundaries))
+    bands = [(None, boundaries[0] - 1)]
+    for start, next_start in zip(boundaries, boundaries[1:]):
+        bands.append((start, next_start - 1))
+    bands.append((boundaries[-1], None))
+    return bands
+
+
+class ShardPlanner:
+    """
+    Plan disjoint filter shards for a full catalogue load.
+
+    The catalogue is split into mark x year band shards using the mark list
+    from /filters. Each shard is probed at page max_shard_pages + 1; a shard
+    that still has data there is bisected by price until it fits. Probing stops
+    after max_probes requests; shards left unsplit are loaded as they are.
+
+    /filters may lag behind the catalogue, so the plan also covers marks seen
+    in probe responses (including one unfiltered page) but missing from
+    /filters; their shards are fitted the same way.
+
+    Listings without year or price match no year/price filter and cannot be
+    selected by a narrower filter. catch_all adds an unfiltered shard for
+    them; it re-reads the whole catalogue, so it is off by default.
+    """
+
+    def __init__(
+        self,
+        fetch_offers: Callable[..., Awaitable[Dict[str, Any]]],
+        fetch_filters: Callable[[], Awaitable[Dict[str, Any]]],
+        rate_limiter: TokenBucket,
+        shard_config: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize shard planner.
+
+        Args:
+            fetch_offers: Coroutine function with CHE168Client.get_offers signature
+            fetch_filters: Coroutine function returning /filters response
+            rate_limiter: Token bucket shared with the loader
+            shard_config: initial_load.shards configuration section
+        """
+        shard_config = shard_config or {}
+        self.fetch_offers = fetch_offers
+        self.fetch_filters = fetch_filters
+        self.rate_limiter = rate_limiter
+        self.year_boundaries = shard_config.get('year_bands', [])
+        self.max_shard_pages = shard_config.get('max_shard_pages', 500)
+        self.price_pivot = shard_config.get('price_pivot', 200000)
+        self.min_price_width = shard_config.get('min_price_width', 1000)
+        self.probe_concurrency = shard_config.get('probe_concurrency', 4)
+        self.max_probes = shard_config.get('max_probes', 2000)
+        self.catch_all = shard_config.get('catch_all', False)
+        self._probes = 0
+        self._oversized: List[Shard] = []
+        self._unprobed: List[Shard] = []
+        self._seen_marks: Set[str] = set()
+
+    async def plan(self) -> List[Shard]:
+        """
+        Build shard list for the whole catalogue.
+
+        Returns:
+            Shards sorted by key (stable order across machines)
+        """
+        filters = await self.fetch_filters()
+        marks = sorted((filters.get('mark') or {}).keys())
+        if not marks:
+            raise ValueError("No marks returned by /filters, cannot plan shards")
+
+        self._probes = 0
+        self._oversized = []
+        self._unprobed = []
+        self._seen_marks = set()
+        semaphore = asyncio.Semaphore(self.probe_concurrency)
+
+        # One unfiltered page shows marks the catalogue has but /filters does not list
+        self._probes += 1
+        async with semaphore:
+            await self.rate_limiter.acquire()
+            self._collect_marks(await self.fetch_offers(page=1))
+
+        shards: List[Shard] = []
+        planned_marks: Set[str] = set()
+        pending = marks
+        while pending:
+            candidates = [
+                Shard(mark, year_from, year_to)
+                for mark in pending
+                for year_from, year_to in year_bands(self.year_boundaries)
+            ]
+            logger.info(
+                f"Planning shards: {len(pending)} marks x "
+                f"{len(year_bands(self.year_boundaries))} year bands = {len(candidates)} candidates"
+            )
+            planned_marks.update(pending)
+            planned = await asyncio.gather(*[
+                self._fit(shard, semaphore) for shard in candidates
+            ])
+            shards.extend(shard for group in planned for shard in group)
+
+            pending = sorted(self._seen_marks - planned_marks)
+            if pending:
+                logger.warning(
+                    f"{len(pending)} mark(s) found in probe responses are missing from /filters: "
+                    f"{', '.join(pending[:5])}{' and more' if len(pending) > 5 else ''}"
+                )
+
+        if self.catch_all:
+            shards.append(Shard(None))
+        shards.sort(key=lambda shard: shard.key)
+
+        logger.info(f"Planned {len(shards)} shards with {self._probes} probes")
+        if self._oversized:
+            logger.warning(
+                f"{len(self._oversized)} shard(s) exceed {self.max_shard_pages} pages but cannot be split further "
+                f"(min_price_width={self.min_price_width}): {self._sample_keys(self._oversized)}"
+            )
+        if self._unprobed:
+            logger.warning(
+                f"Probe budget of {self.max_probes} requests exhausted, "
+                f"{len(self._unprobed)} shard(s) left unchecked: {self._sample_keys(self._unprobed)}"
+            )
+        return shards
+
+    @staticmethod
+    def _sample_keys(shards: List[Shard], limit: int = 5) -> str:
+        """Format the first shard keys for a summary log line."""
+        keys = ', '.join(shard.key for shard in shards[:limit])
+        return keys + (f" and {len(shards) - limit} more" if len(shards) > limit else '')
+
+    async def _fit(self, shard: Shard, semaphore: asyncio.Semaphore) -> List[Shard]:
+        """Bisect shard by price until every part fits into max_shard_pages (within the probe budget)."""
+        if self._probes >= self.max_probes:
+            self._unprobed.append(shard)
+            return [shard]
+        self._probes += 1
+        if not await self._is_oversized(shard, semaphore):
+            return [shard]
+
+        halves = shard.split_by_price(self.price_pivot, self.min_price_width)
+        if halves is None:
+            self._oversized.append(shard)
+            return [shard]
+
+        logger.debug(f"Shard {shard.key} is oversized, splitting by price")
+        lower, upper = await asyncio.gather(*[
+            self._fit(half, semaphore) for half in halves
+        ])
+        return lower + upper
+
+    async def _is_oversized(self, shard: Shard, semaphore: asyncio.Semaphore) -> bool:
+        """Check if shard has data beyond max_shard_pages."""
+        async with semaphore:
+            await self.rate_limiter.acquire()
+            response = await self.fetch_offers(page=self.max_shard_pages + 1, **shard.filters())
+        self._collect_marks(response)
+        return bool(response.get('result'))
+
+    def _collect_marks(self, response: Dict[str, Any]) -> None:
+        """Remember marks of the offers in a probe response."""
+        for item in response.get('result') or []:
+            mark = (item.get('data') or {}).get('mark')
+            if mark:
+                self._seen_marks.add(mark)
+
+
+def save_plan(shards: List[Shard], path: Path) -> None:
+    """
+    Save shard plan to a JSON file.
+
+    Args:
+        shards: Planned shards
+        path: Output file path
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([shard.to_dict() for shard in shards], f, ensure_ascii=False, indent=2)
+
+
+def load_plan(path: Path) -> List[Shard]:
+    """
+    Load shard plan from a JSON file.
+
+    Args:
+        path: File written by save_plan
+
+    Returns:
+        List of shards
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return [Shard.from_dict(item) for item in json.load(f)]
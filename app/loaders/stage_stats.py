@@ -0,0 +1,45 @@
+"""Per-stage throughput accounting for the loaders."""
+
+from typing import Dict, List
+
+
+class StageStats:
+    """
+    Row counts and busy time per ingest stage, for rows/sec reporting.
+
+    Busy time of a stage is summed over concurrent calls, so rows/sec is the
+    throughput of a single request/statement, not of the whole load.
+    """
+
+    def __init__(self):
+        """Initialize empty stage statistics."""
+        self.stages: Dict[str, List[float]] = {}
+
+    def record(self, stage: str, rows: int, seconds: float) -> None:
+        """
+        Add processed rows and time spent to a stage.
+
+        Args:
+            stage: Stage name (e.g. "fetch", "build", "write", "copy", "merge")
+            rows: Rows processed
+            seconds: Time spent
+        """
+        totals = self.stages.setdefault(stage, [0, 0.0])
+        totals[0] += rows
+        totals[1] += seconds
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-stage totals.
+
+        Returns:
+            Dictionary of stage -> {'rows', 'seconds', 'rows_per_sec'}
+        """
+        return {
+            stage: {
+                'rows': rows,
+                'seconds': round(seconds, 3),
+                'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else 0.0,
+            }
+            for stage, (rows, seconds) in self.stages.items()
+        }
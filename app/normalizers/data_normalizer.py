@@ -1,32 +1,72 @@
 """Data normalizer for processing raw_data into processed_data."""
 
+import asyncio
 import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional, List
-from sqlalchemy import select, update
+from typing import Dict, Any, Optional, List, Set, Tuple
+from sqlalchemy import func, select, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.normalizers.base_normalizer import BaseNormalizer
 from app.database.connection import AsyncSessionLocal
-from app.database.models import RawData, ProcessedData
+from app.database.models import RawData
+from app.loaders.pipeline import Pipeline
+from app.loaders.raw_data_writer import ACTIVE_STATUS_FIELD
 from app.utils.config import config
 from app.utils.logger import logger
+from app.normalizers.processed_data_writer import build_row, fetch_existing, update_rows, upsert_rows
+from app.normalizers.record_normalizer import (
+    FIELD_COLUMNS, normalize_batch, normalize_batch_in_worker, normalize_fields, normalize_record
+)
+from app.utils.translation_cache import cache as translation_cache
 from app.utils.progress import ProgressBar
-from app.utils.translator import translate_field
+
+
+# Columns of raw_data read by the normalizer (last_updated_at detects rows changed after the read)
+READ_COLUMNS = (
+    RawData.id, RawData.inner_id, RawData.data, RawData.active_status, RawData.created_at,
+    RawData.pending_fields, RawData.last_updated_at
+)
 
 
 class DataNormalizer(BaseNormalizer):
     """Normalizer for processing raw_data into processed_data."""
     
-    def __init__(self, batch_size: Optional[int] = None):
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        read_mode: Optional[str] = None,
+        keep_pool: bool = False
+    ):
         """
         Initialize data normalizer.
         
         Args:
             batch_size: Number of records per batch (default from config)
+            workers: Worker processes for the CPU-bound normalization
+                (default from config; 0 = one per CPU core, 1 = inline on the event loop)
+            read_mode: "stream" (one server-side cursor) or "paged" (keyset query
+                per batch), default from config
+            keep_pool: Keep the worker processes (and their translation caches)
+                between normalize() calls; the caller shuts them down with close()
         """
         super().__init__("normalization")
         batch_config = config.get_batch_config()
         self.batch_size = batch_size or batch_config.get('normalization_size', 200)
+        if workers is None:
+            workers = batch_config.get('normalization_workers', 1)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.keep_pool = keep_pool
+        self.stream = (read_mode or batch_config.get('normalization_read', 'stream')) == 'stream'
+        # "exact" (COUNT) or "estimate" (planner statistics, no table scan)
+        self.count_mode = batch_config.get('normalization_count', 'exact')
+        # Recompute only changed fields of listings with pending_fields
+        self.delta = batch_config.get('normalization_delta', True)
     
     async def normalize(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -39,11 +79,13 @@ class DataNormalizer(BaseNormalizer):
             Dictionary with statistics: total_processed, total_errors, total_batches
         """
         await self.start_operation()
+        translation_cache.reset_stats()
         
         stats = {
             'total_processed': 0,
             'total_created': 0,
             'total_updated': 0,
+            'total_delta': 0,
             'total_errors': 0,
             'total_batches': 0
         }
@@ -51,10 +93,7 @@ class DataNormalizer(BaseNormalizer):
         try:
             # Get total count of unprocessed records
             async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(RawData.id).where(RawData.is_processed == False)
-                )
-                total_count = len(result.scalars().all())
+                total_count = await self._count_pending(session)
             
             if total_count == 0:
                 logger.info("No unprocessed records found")
@@ -69,6 +108,16 @@ class DataNormalizer(BaseNormalizer):
             else:
                 logger.info(f"Found {total_count} unprocessed records to normalize")
             
+            if self.workers > 1 and self._pool is None:
+                # Records of a batch are split between the workers; DB reads and
+                # writes stay on the event loop. spawn: workers do not inherit
+                # the event loop and DB connections
+                logger.info(f"Normalizing with {self.workers} worker processes")
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            
             # Initialize progress bar
             progress = ProgressBar(
                 total=target_count,
@@ -76,63 +125,10 @@ class DataNormalizer(BaseNormalizer):
                 update_interval=1.0
             )
             
-            # Process records in batches using cursor-based pagination
-            # Используем курсор на основе id вместо offset, чтобы не пропускать записи
-            last_processed_id = 0
-            while True:
-                # Check if we've reached the limit
-                if limit and stats['total_processed'] >= limit:
-                    logger.info(f"Reached limit of {limit} records, stopping")
-                    break
-                
-                # Adjust batch size if we're near the limit
-                remaining = limit - stats['total_processed'] if limit else None
-                if remaining and remaining < self.batch_size:
-                    # Process smaller batch for the last iteration
-                    original_batch_size = self.batch_size
-                    self.batch_size = remaining
-                    batch_stats = await self._process_batch_cursor(last_processed_id)
-                    self.batch_size = original_batch_size
-                else:
-                    batch_stats = await self._process_batch_cursor(last_processed_id)
-                
-                # Прерываем цикл только если не было загружено записей (все обработаны)
-                # Если записи были загружены, но не обработаны (валидация/ошибки), продолжаем
-                if batch_stats.get('records_fetched', 0) == 0:
-                    logger.info("No more unprocessed records found, stopping")
-                    break
-                
-                stats['total_processed'] += batch_stats['processed']
-                stats['total_created'] += batch_stats['created']
-                stats['total_updated'] += batch_stats['updated']
-                stats['total_errors'] += batch_stats['errors']
-                stats['total_batches'] += 1
-                
-                # Update progress
-                progress.update(batch_stats['processed'])
-                
-                # Обновляем курсор на основе id последней обработанной записи
-                # Это гарантирует, что мы не пропустим записи при следующей итерации
-                if batch_stats.get('last_processed_id') and batch_stats['last_processed_id'] > last_processed_id:
-                    # Обновляем курсор только если были успешно обработаны записи
-                    last_processed_id = batch_stats['last_processed_id']
-                elif batch_stats.get('records_fetched', 0) > 0 and batch_stats.get('processed', 0) == 0:
-                    # Если записи были загружены, но ни одна не обработана (валидация/ошибки),
-                    # используем максимальный id из загруженных записей, чтобы не зациклиться
-                    # Но только если max_id больше текущего курсора
-                    max_id = batch_stats.get('max_id', last_processed_id)
-                    if max_id > last_processed_id:
-                        last_processed_id = max_id
-                        logger.debug(f"No records processed in batch, moving cursor to max_id={max_id}")
-                
-                # Log batch completion
-                logger.debug(
-                    f"Batch {stats['total_batches']}: "
-                    f"processed={batch_stats['processed']}, "
-                    f"created={batch_stats['created']}, "
-                    f"updated={batch_stats['updated']}, "
-                    f"errors={batch_stats['errors']}"
-                )
+            if self.stream:
+                await self._normalize_stream(stats, progress, limit)
+            else:
+                await self._normalize_paged(stats, progress, limit)
             
             progress.finish()
             
@@ -144,7 +140,7 @@ class DataNormalizer(BaseNormalizer):
                 f"Normalization completed: "
                 f"processed={stats['total_processed']}, "
                 f"created={stats['total_created']}, "
-                f"updated={stats['total_updated']}, "
+                f"updated={stats['total_updated']} (delta={stats['total_delta']}), "
                 f"errors={stats['total_errors']}, "
                 f"batches={stats['total_batches']}"
             )
@@ -155,6 +151,183 @@ class DataNormalizer(BaseNormalizer):
             self.record_error(e, "normalization")
             await self.finish_operation("ERROR")
             raise
+        finally:
+            if not self.keep_pool:
+                self.close()
+            stats['translation_cache'] = self._report_translation_cache()
+    
+    def close(self) -> None:
+        """Shut down the worker processes (started again by the next normalize())."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    async def _count_pending(self, session: AsyncSession) -> int:
+        """
+        Count unprocessed records (progress total).
+        
+        Args:
+            session: Database session
+            
+        Returns:
+            Exact COUNT, or the planner's row estimate if count_mode is "estimate"
+        """
+        if self.count_mode == 'estimate':
+            # EXPLAIN не читает таблицу: оценка планировщика по статистике (точна после ANALYZE)
+            result = await session.execute(
+                text("EXPLAIN (FORMAT JSON) SELECT 1 FROM raw_data WHERE is_processed = false")
+            )
+            plan = result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        
+        result = await session.execute(
+            select(func.count()).select_from(RawData).where(RawData.is_processed == False)
+        )
+        return result.scalar_one()
+    
+    def _add_batch_stats(self, stats: Dict[str, Any], batch_stats: Dict[str, int]) -> None:
+        """
+        Add batch statistics to the run totals.
+        
+        Args:
+            stats: Run statistics (updated in place)
+            batch_stats: Statistics returned by _process_records
+        """
+        stats['total_processed'] += batch_stats['processed']
+        stats['total_created'] += batch_stats['created']
+        stats['total_updated'] += batch_stats['updated']
+        stats['total_delta'] += batch_stats['delta']
+        stats['total_errors'] += batch_stats['errors']
+        stats['total_batches'] += 1
+        
+        # Log batch completion
+        logger.debug(
+            f"Batch {stats['total_batches']}: "
+            f"processed={batch_stats['processed']}, "
+            f"created={batch_stats['created']}, "
+            f"updated={batch_stats['updated']}, "
+            f"errors={batch_stats['errors']}"
+        )
+    
+    async def _normalize_stream(self, stats: Dict[str, Any], progress: ProgressBar, limit: Optional[int]) -> None:
+        """
+        Normalize unprocessed records read through one server-side cursor.
+        
+        The reader holds a single snapshot query open and yields batches of
+        projected tuples (no ORM entities, no per-batch re-query); every batch
+        is written and committed on a separate session. Rows updated after the
+        snapshot are not marked processed (see _process_records).
+        
+        Reading, normalization and writing are pipeline stages, so the next
+        batch is normalized while the previous one is written. With a worker
+        pool two batches are normalized at once, which keeps every worker busy
+        while a batch is read or written.
+        
+        Args:
+            stats: Run statistics (updated in place)
+            progress: Progress bar
+            limit: Optional limit on number of records read
+        """
+        stmt = (
+            select(*READ_COLUMNS)
+            .where(RawData.is_processed == False)
+            .order_by(RawData.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        if limit:
+            stmt = stmt.limit(limit)
+        
+        async def read():
+            async with AsyncSessionLocal() as reader:
+                result = await reader.stream(stmt)
+                async for records in result.partitions(self.batch_size):
+                    yield records
+        
+        async def normalize(records):
+            try:
+                async with AsyncSessionLocal() as session:
+                    return records, await self._normalize_records(session, records)
+            except Exception as e:
+                self.record_error(e, f"batch starting from id > {records[0].id - 1}")
+                batch_stats = self._empty_batch_stats(records[0].id - 1)
+                batch_stats['errors'] = len(records)
+                self._add_batch_stats(stats, batch_stats)
+                progress.update(len(records))
+                return None
+        
+        async def write(item):
+            records, normalized = item
+            async with AsyncSessionLocal() as session:
+                batch_stats = await self._process_records(session, records, records[0].id - 1, normalized)
+            self._add_batch_stats(stats, batch_stats)
+            # Записи с ошибками остаются необработанными и тоже продвигают прогресс
+            progress.update(len(records))
+        
+        pipeline_config = config.get_pipeline_config()
+        pipeline = Pipeline(
+            "normalization",
+            queue_size=1,
+            log_interval=pipeline_config.get('log_interval_seconds', 30)
+        )
+        pipeline.add_stage("normalize", normalize, workers=2 if self._pool is not None else 1)
+        pipeline.add_stage("write", write)
+        await pipeline.run(read())
+    
+    async def _normalize_paged(self, stats: Dict[str, Any], progress: ProgressBar, limit: Optional[int]) -> None:
+        """
+        Normalize unprocessed records with one keyset query per batch.
+        
+        Args:
+            stats: Run statistics (updated in place)
+            progress: Progress bar
+            limit: Optional limit on number of records processed
+        """
+        # Process records in batches using cursor-based pagination
+        # Используем курсор на основе id вместо offset, чтобы не пропускать записи
+        last_processed_id = 0
+        while True:
+            # Check if we've reached the limit
+            if limit and stats['total_processed'] >= limit:
+                logger.info(f"Reached limit of {limit} records, stopping")
+                break
+            
+            # Adjust batch size if we're near the limit
+            remaining = limit - stats['total_processed'] if limit else None
+            if remaining and remaining < self.batch_size:
+                # Process smaller batch for the last iteration
+                original_batch_size = self.batch_size
+                self.batch_size = remaining
+                batch_stats = await self._process_batch_cursor(last_processed_id)
+                self.batch_size = original_batch_size
+            else:
+                batch_stats = await self._process_batch_cursor(last_processed_id)
+            
+            # Прерываем цикл только если не было загружено записей (все обработаны)
+            # Если записи были загружены, но не обработаны (валидация/ошибки), продолжаем
+            if batch_stats.get('records_fetched', 0) == 0:
+                logger.info("No more unprocessed records found, stopping")
+                break
+            
+            self._add_batch_stats(stats, batch_stats)
+            
+            # Update progress
+            progress.update(batch_stats['processed'])
+            
+            # Обновляем курсор на основе id последней обработанной записи
+            # Это гарантирует, что мы не пропустим записи при следующей итерации
+            if batch_stats.get('last_processed_id') and batch_stats['last_processed_id'] > last_processed_id:
+                # Обновляем курсор только если были успешно обработаны записи
+                last_processed_id = batch_stats['last_processed_id']
+            elif batch_stats.get('records_fetched', 0) > 0 and batch_stats.get('processed', 0) == 0:
+                # Если записи были загружены, но ни одна не обработана (валидация/ошибки),
+                # используем максимальный id из загруженных записей, чтобы не зациклиться
+                # Но только если max_id больше текущего курсора
+                max_id = batch_stats.get('max_id', last_processed_id)
+                if max_id > last_processed_id:
+                    last_processed_id = max_id
+                    logger.debug(f"No records processed in batch, moving cursor to max_id={max_id}")
     
     async def _process_batch_cursor(self, last_id: int = 0) -> Dict[str, int]:
         """
@@ -166,23 +339,12 @@ class DataNormalizer(BaseNormalizer):
         Returns:
             Dictionary with batch statistics including last_processed_id and max_id
         """
-        stats = {
-            'processed': 0,
-            'created': 0,
-            'updated': 0,
-            'errors': 0,
-            'records_fetched': 0,  # Количество загруженных записей из БД
-            'last_processed_id': last_id,  # ID последней успешно обработанной записи
-            'max_id': last_id  # Максимальный ID среди загруженных записей
-        }
-        
         async with AsyncSessionLocal() as session:
-            records = []
             try:
                 # Fetch batch of unprocessed records using cursor (id > last_id)
                 # Это гарантирует, что мы не пропустим записи при пагинации
                 result = await session.execute(
-                    select(RawData)
+                    select(*READ_COLUMNS)
                     .where(
                         RawData.is_processed == False,
                         RawData.id > last_id
@@ -190,136 +352,225 @@ class DataNormalizer(BaseNormalizer):
                     .order_by(RawData.id)
                     .limit(self.batch_size)
                 )
-                records = result.scalars().all()
-                stats['records_fetched'] = len(records)
-                
-                # Запоминаем максимальный id среди загруженных записей
-                if records:
-                    stats['max_id'] = max(record.id for record in records)
-                
-                if not records:
-                    return stats
-                
-                # Отслеживаем успешно обработанные записи для обновления is_processed после коммита
-                successfully_processed_records = []
-                
-                # Process each record in transaction
-                # Обрабатываем каждую запись отдельно, чтобы ошибка в одной не влияла на остальные
-                for raw_record in records:
-                    try:
-                        # Normalize the record - получаем словарь с полями для сохранения
-                        normalized_fields = self._normalize_record(raw_record.data)
-                        
-                        # Добавляем inner_id для валидации
-                        normalized_fields['inner_id'] = raw_record.inner_id
-                        
-                        # Валидация данных перед сохранением
-                        if not self._validate_normalized_data(normalized_fields):
-                            logger.warning(f"Skipping record inner_id={raw_record.inner_id} due to validation failure")
-                            stats['errors'] += 1
-                            continue
-                        
-                        # Удаляем inner_id из normalized_fields, так как он уже есть в raw_record
-                        normalized_fields.pop('inner_id', None)
-                        
-                        # Check if processed_data already exists
-                        existing = await session.execute(
-                            select(ProcessedData)
-                            .where(ProcessedData.inner_id == raw_record.inner_id)
-                        )
-                        processed_record = existing.scalar_one_or_none()
-                        
-                        if processed_record:
-                            # Update existing record - обновляем все поля
-                            for field, value in normalized_fields.items():
-                                setattr(processed_record, field, value)
-                            processed_record.active_status = raw_record.active_status
-                            processed_record.updated_at = datetime.utcnow()
-                            stats['updated'] += 1
-                        else:
-                            # Create new record - создаем с всеми полями
-                            processed_record = ProcessedData(
-                                inner_id=raw_record.inner_id,
-                                active_status=raw_record.active_status,
-                                created_at=raw_record.created_at,
-                                **normalized_fields
-                            )
-                            session.add(processed_record)
-                            stats['created'] += 1
-                        
-                        # Запоминаем успешно обработанную запись (но НЕ помечаем как processed до коммита)
-                        successfully_processed_records.append(raw_record)
-                        stats['processed'] += 1
-                        # Обновляем курсор на основе id последней успешно обработанной записи
-                        stats['last_processed_id'] = raw_record.id
-                        
-                    except Exception as e:
-                        # Если ошибка в отдельной записи - логируем и пропускаем её
-                        # Остальные записи продолжают обрабатываться
-                        self.record_error(e, f"record inner_id={raw_record.inner_id if raw_record else 'unknown'}")
+                records = result.all()
+            except Exception as e:
+                self.record_error(e, f"batch starting from id > {last_id}")
+                return self._empty_batch_stats(last_id)
+            
+            return await self._process_records(session, records, last_id)
+    
+    async def _delta_fields(self, session: AsyncSession, records: List[Any]) -> Dict[str, Set[str]]:
+        """
+        Select records that can take the delta path.
+        
+        A record qualifies if pending_fields lists only fields with known
+        processed_data columns (or active_status) and its processed_data row
+        exists; everything else is normalized in full.
+        
+        Args:
+            session: Database session
+            records: Rows with READ_COLUMNS attributes
+            
+        Returns:
+            Dictionary of inner_id -> changed fields
+        """
+        candidates = {
+            record.inner_id: set(record.pending_fields)
+            for record in records
+            if record.pending_fields is not None
+            and all(field in FIELD_COLUMNS or field == ACTIVE_STATUS_FIELD for field in record.pending_fields)
+        }
+        if not candidates:
+            return {}
+        existing = await fetch_existing(session, candidates.keys())
+        return {inner_id: fields for inner_id, fields in candidates.items() if inner_id in existing}
+    
+    async def _normalize_records(
+        self,
+        session: AsyncSession,
+        records: List[Any]
+    ) -> Tuple[Dict[str, Set[str]], List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]]:
+        """
+        Run the CPU-bound part of a batch (in worker processes if configured).
+        
+        Args:
+            session: Database session (reads processed_data for the delta path)
+            records: Rows with READ_COLUMNS attributes
+            
+        Returns:
+            Tuple of (changed fields by inner_id for the delta path, results of
+            normalize_batch for the other records in their order)
+        """
+        # Listings that only need their changed fields recomputed
+        delta_fields = await self._delta_fields(session, records) if self.delta else {}
+        normalized = await self._normalize_many(
+            [(r.inner_id, r.data) for r in records if r.inner_id not in delta_fields]
+        )
+        return delta_fields, normalized
+    
+    def _empty_batch_stats(self, last_id: int) -> Dict[str, int]:
+        """Get statistics of a batch before processing."""
+        return {
+            'processed': 0,
+            'created': 0,
+            'updated': 0,
+            'delta': 0,  # Из них обновлено по изменённым полям (pending_fields)
+            'errors': 0,
+            'records_fetched': 0,  # Количество загруженных записей из БД
+            'last_processed_id': last_id,  # ID последней успешно обработанной записи
+            'max_id': last_id  # Максимальный ID среди загруженных записей
+        }
+    
+    async def _process_records(
+        self,
+        session: AsyncSession,
+        records: List[Any],
+        last_id: int,
+        normalized: Optional[Tuple[Dict[str, Set[str]], List[Any]]] = None
+    ) -> Dict[str, int]:
+        """
+        Normalize fetched raw_data rows and write them in one transaction.
+        
+        Args:
+            session: Database session for the writes (committed here)
+            records: Rows with READ_COLUMNS attributes, ordered by id
+            last_id: Cursor before this batch
+            normalized: Result of _normalize_records for these records
+                (computed here if not given)
+            
+        Returns:
+            Dictionary with batch statistics including last_processed_id and max_id
+        """
+        stats = self._empty_batch_stats(last_id)
+        stats['records_fetched'] = len(records)
+        
+        if not records:
+            return stats
+        
+        # Запоминаем максимальный id среди загруженных записей
+        stats['max_id'] = max(record.id for record in records)
+        
+        try:
+            # Строки processed_data по inner_id (inner_id в raw_data уникален)
+            rows: Dict[str, Dict[str, Any]] = {}
+            # Частичные обновления processed_data (только изменённые колонки)
+            delta_rows: List[Dict[str, Any]] = []
+            # (id, last_updated_at) of the rows as they were read
+            processed_ids: List[Tuple[int, datetime]] = []
+            now = datetime.utcnow()
+            
+            # Listings on the delta path and full normalization of the rest of the batch
+            delta_fields, normalized_records = normalized or await self._normalize_records(session, records)
+            normalized_batch = iter(normalized_records)
+            
+            # Обрабатываем каждую запись отдельно, чтобы ошибка в одной не влияла на остальные
+            for raw_record in records:
+                try:
+                    fields = delta_fields.get(raw_record.inner_id)
+                    if fields is not None:
+                        # Дешёвый путь: пересчитываются только колонки изменённых полей
+                        normalized_fields = normalize_fields(raw_record.data or {}, fields - {ACTIVE_STATUS_FIELD})
+                    else:
+                        _, normalized_fields, error = next(normalized_batch)
+                        if error:
+                            raise ValueError(f"normalization failed: {error}")
+                    
+                    # Добавляем inner_id для валидации
+                    normalized_fields['inner_id'] = raw_record.inner_id
+                    
+                    # Валидация данных перед сохранением
+                    if not self._validate_normalized_data(normalized_fields):
+                        logger.warning(f"Skipping record inner_id={raw_record.inner_id} due to validation failure")
                         stats['errors'] += 1
-                        # Запись остается с is_processed = False для повторной обработки
-                        logger.warning(
-                            f"Skipping record inner_id={raw_record.inner_id if raw_record else 'unknown'} "
-                            f"due to error: {str(e)}"
-                        )
                         continue
-                
-                # Commit transaction для всех успешно обработанных записей
-                try:
-                    await session.commit()
-                    # Только после успешного коммита помечаем записи как обработанные
-                    # Это гарантирует консистентность: если коммит упал, записи останутся необработанными
-                    if successfully_processed_records:
-                        processed_inner_ids = [r.inner_id for r in successfully_processed_records]
-                        try:
-                            await session.execute(
-                                update(RawData)
-                                .where(RawData.inner_id.in_(processed_inner_ids))
-                                .values(is_processed=True)
-                            )
-                            await session.commit()
-                            logger.debug(f"Marked {len(processed_inner_ids)} records as processed")
-                        except Exception as e:
-                            # Если ошибка при обновлении is_processed - логируем, но не откатываем processed_data
-                            # Записи уже сохранены в processed_data, просто не помечены как обработанные
-                            # Они будут обработаны повторно, но это лучше, чем потерять данные
-                            await session.rollback()
-                            self.record_error(e, f"updating is_processed flag for batch starting from id > {last_id}")
-                            logger.warning(
-                                f"Failed to mark records as processed, but processed_data was saved. "
-                                f"Records will be reprocessed: {len(processed_inner_ids)} records"
-                            )
-                            # Сбрасываем статистику, так как is_processed не обновлен
-                            stats['processed'] = 0
-                            stats['created'] = 0
-                            stats['updated'] = 0
-                            stats['last_processed_id'] = last_id  # Не обновляем курсор
                     
-                except Exception as e:
-                    # Если ошибка при коммите - откатываем весь батч
-                    await session.rollback()
-                    self.record_error(e, f"commit batch starting from id > {last_id}")
-                    # Помечаем все записи как необработанные
-                    stats['errors'] += len(records)
-                    stats['processed'] = 0
-                    stats['created'] = 0
-                    stats['updated'] = 0
-                    stats['last_processed_id'] = last_id  # Сбрасываем курсор, чтобы повторить попытку
+                    if fields is not None:
+                        normalized_fields.pop('inner_id')
+                        delta_rows.append({
+                            'inner_id': raw_record.inner_id,
+                            **normalized_fields,
+                            'active_status': raw_record.active_status,
+                            'updated_at': now,
+                        })
+                    else:
+                        rows[raw_record.inner_id] = build_row(
+                            raw_record.inner_id,
+                            normalized_fields,
+                            raw_record.active_status,
+                            raw_record.created_at,
+                            now
+                        )
+                    processed_ids.append((raw_record.id, raw_record.last_updated_at))
+                    # Обновляем курсор на основе id последней успешно обработанной записи
+                    stats['last_processed_id'] = raw_record.id
                     
+                except Exception as e:
+                    # Если ошибка в отдельной записи - логируем и пропускаем её
+                    # Остальные записи продолжают обрабатываться
+                    self.record_error(e, f"record inner_id={raw_record.inner_id if raw_record else 'unknown'}")
+                    stats['errors'] += 1
+                    # Запись остается с is_processed = False для повторной обработки
+                    logger.warning(
+                        f"Skipping record inner_id={raw_record.inner_id if raw_record else 'unknown'} "
+                        f"due to error: {str(e)}"
+                    )
+                    continue
+            
+            if not processed_ids:
+                return stats
+            
+            # Upsert всего батча и отметка is_processed в одной транзакции:
+            # либо сохранено и отмечено всё, либо ничего (записи будут обработаны повторно)
+            try:
+                created, updated = await upsert_rows(session, list(rows.values()))
+                await update_rows(session, delta_rows)
+                # Строки, изменённые после чтения (DailyUpdater, tail), остаются необработанными
+                # вместе с pending_fields: их новая версия будет нормализована при следующем проходе
+                result = await session.execute(
+                    update(RawData)
+                    .where(tuple_(RawData.id, RawData.last_updated_at).in_(processed_ids))
+                    .values(is_processed=True, pending_fields=None)
+                    .returning(RawData.id)
+                )
+                marked = len(result.scalars().all())
+                await session.commit()
+                if marked < len(processed_ids):
+                    logger.debug(
+                        f"{len(processed_ids) - marked} records changed after they were read, "
+                        f"left unprocessed"
+                    )
+                stats['processed'] = marked
+                stats['created'] = created
+                stats['updated'] = updated + len(delta_rows)
+                stats['delta'] = len(delta_rows)
+                logger.debug(f"Marked {marked} records as processed")
+                
             except Exception as e:
-                # Rollback entire batch on error
-                try:
-                    await session.rollback()
-                except:
-                    pass  # Игнорируем ошибки при rollback
-                self.record_error(e, f"batch starting from id > {last_id}")
-                stats['errors'] += len(records) if records else 0  # Count all records in batch as errors
+                # Если ошибка при записи - откатываем весь батч
+                await session.rollback()
+                self.record_error(e, f"commit batch starting from id > {last_id}")
+                # Помечаем все записи как необработанные
+                stats['errors'] += len(records)
                 stats['processed'] = 0
                 stats['created'] = 0
                 stats['updated'] = 0
+                stats['delta'] = 0
                 stats['last_processed_id'] = last_id  # Сбрасываем курсор, чтобы повторить попытку
-        
+                
+        except Exception as e:
+            # Rollback entire batch on error
+            try:
+                await session.rollback()
+            except:
+                pass  # Игнорируем ошибки при rollback
+            self.record_error(e, f"batch starting from id > {last_id}")
+            stats['errors'] += len(records) if records else 0  # Count all records in batch as errors
+            stats['processed'] = 0
+            stats['created'] = 0
+            stats['updated'] = 0
+            stats['delta'] = 0
+            stats['last_processed_id'] = last_id  # Сбрасываем курсор, чтобы повторить попытку
+
         return stats
     
     def _validate_normalized_data(self, normalized: Dict[str, Any]) -> bool:
@@ -372,12 +623,7 @@ class DataNormalizer(BaseNormalizer):
     
     def _normalize_record(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Normalize a single record from raw_data.
-        
-        Extracts and normalizes key fields from the raw JSON data according to requirements:
-        - Basic fields from data block
-        - Options list from extra.option
-        - Configuration parameters by specific IDs
+        Normalize a single record from raw_data (see record_normalizer.normalize_record).
         
         Args:
             raw_data: Raw data dictionary from raw_data.data field
@@ -385,248 +631,44 @@ class DataNormalizer(BaseNormalizer):
         Returns:
             Dictionary with field names matching ProcessedData model columns
         """
-        normalized = {}
-        
-        # Список ID параметров конфигурации для извлечения
-        CONFIG_PARAM_IDS = {93, 91, 90, 88, 116, 101, 108, 92, 115, 97, 95, 38, 58, 3, 13, 6, 11, 14, 17, 20, 24, 23, 41, 40, 42, 46, 43, 44, 47, 48, 49, 50, 53}
-        
-        # 1. Извлекаем базовые поля из блока data
-        # URL
-        normalized['url'] = raw_data.get('url')
-        
-        # Марка и модель
-        normalized['mark'] = translate_field(raw_data.get('mark')) if raw_data.get('mark') else None
-        normalized['model'] = translate_field(raw_data.get('model')) if raw_data.get('model') else None
+        return normalize_record(raw_data)
+    
+    async def _normalize_many(self, records: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Normalize a batch, fanned out to the worker processes if there are any.
         
-        # Год
-        year = raw_data.get('year')
-        if year:
-            try:
-                if isinstance(year, str):
-                    year = ''.join(c for c in year if c.isdigit())
-                    normalized['year'] = int(year) if year else None
-                else:
-                    normalized['year'] = int(year)
-            except (ValueError, TypeError):
-                normalized['year'] = None
-        else:
-            normalized['year'] = None
-        
-        # Цвет
-        normalized['color'] = translate_field(raw_data.get('color')) if raw_data.get('color') else None
-        
-        # Цена
-        price = raw_data.get('price')
-        if price:
-            try:
-                if isinstance(price, str):
-                    price = ''.join(c for c in price if c.isdigit())
-                    normalized['price'] = int(price) if price else None
-                else:
-                    normalized['price'] = int(price)
-            except (ValueError, TypeError):
-                normalized['price'] = None
-        else:
-            normalized['price'] = None
-        
-        # Пробег
-        km_age = raw_data.get('km_age')
-        if km_age:
-            try:
-                if isinstance(km_age, str):
-                    km_age = ''.join(c for c in km_age if c.isdigit())
-                    normalized['km_age'] = int(km_age) if km_age else None
-                else:
-                    normalized['km_age'] = int(km_age)
-            except (ValueError, TypeError):
-                normalized['km_age'] = None
-        else:
-            normalized['km_age'] = None
-        
-        # Тип двигателя, КПП, кузова
-        normalized['engine_type'] = translate_field(raw_data.get('engine_type')) if raw_data.get('engine_type') else None
-        normalized['transmission_type'] = translate_field(raw_data.get('transmission_type')) if raw_data.get('transmission_type') else None
-        normalized['body_type'] = translate_field(raw_data.get('body_type')) if raw_data.get('body_type') else None
-        
-        # Адрес
-        normalized['address'] = translate_field(raw_data.get('address')) if raw_data.get('address') else None
-        
-        # Секция (б/у или новый)
-        normalized['section'] = translate_field(raw_data.get('section')) if raw_data.get('section') else None
-        
-        # Дата создания объявления
-        offer_created = raw_data.get('offer_created')
-        if offer_created:
-            try:
-                if isinstance(offer_created, str):
-                    # Парсим формат "2025-04-13" или "2025-04"
-                    if len(offer_created) == 7 and offer_created[4] == '-':
-                        # Формат "YYYY-MM", добавляем день
-                        offer_created = f"{offer_created}-01"
-                    normalized['offer_created'] = datetime.strptime(offer_created, '%Y-%m-%d').date()
-                elif isinstance(offer_created, datetime):
-                    normalized['offer_created'] = offer_created.date()
-                else:
-                    normalized['offer_created'] = offer_created
-            except (ValueError, TypeError):
-                normalized['offer_created'] = None
-        else:
-            normalized['offer_created'] = None
-        
-        # Описание (не переводим - сохраняем оригинал)
-        normalized['description'] = raw_data.get('description')
-        
-        # Объем двигателя
-        displacement = raw_data.get('displacement')
-        if displacement:
-            try:
-                if isinstance(displacement, str):
-                    displacement = ''.join(c for c in displacement if c.isdigit() or c == '.')
-                    normalized['displacement'] = float(displacement) if displacement else None
-                else:
-                    normalized['displacement'] = float(displacement)
-            except (ValueError, TypeError):
-                normalized['displacement'] = None
-        else:
-            normalized['displacement'] = None
-        
-        # VIN
-        normalized['vin'] = raw_data.get('vin')
-        
-        # Дата первой регистрации
-        first_registration = raw_data.get('first_registration')
-        if first_registration:
-            try:
-                if isinstance(first_registration, str):
-                    # Парсим формат "2019-02" или "2019-02-15"
-                    if len(first_registration) == 7 and first_registration[4] == '-':
-                        # Формат "YYYY-MM", добавляем день
-                        first_registration = f"{first_registration}-01"
-                    normalized['first_registration'] = datetime.strptime(first_registration, '%Y-%m-%d').date()
-                elif isinstance(first_registration, datetime):
-                    normalized['first_registration'] = first_registration.date()
-                else:
-                    normalized['first_registration'] = first_registration
-            except (ValueError, TypeError):
-                normalized['first_registration'] = None
-        else:
-            normalized['first_registration'] = None
-        
-        # Мощность
-        power = raw_data.get('power')
-        if power:
-            try:
-                if isinstance(power, str):
-                    power = ''.join(c for c in power if c.isdigit())
-                    normalized['power'] = int(power) if power else None
-                else:
-                    normalized['power'] = int(power)
-            except (ValueError, TypeError):
-                normalized['power'] = None
-        else:
-            normalized['power'] = None
-        
-        # Тип привода
-        normalized['drive_type'] = translate_field(raw_data.get('drive_type')) if raw_data.get('drive_type') else None
-        
-        # Изображения
-        images = raw_data.get('images')
-        if images:
-            if isinstance(images, str):
-                try:
-                    normalized['images'] = json.loads(images)
-                except json.JSONDecodeError:
-                    normalized['images'] = []
-            elif isinstance(images, list):
-                normalized['images'] = images
-            else:
-                normalized['images'] = []
-        else:
-            normalized['images'] = []
-        
-        # 2. Извлекаем опции из extra.option
-        options_list = []
-        if 'extra' in raw_data and raw_data['extra']:
-            extra = raw_data['extra']
-            if 'option' in extra and extra['option']:
-                option_data = extra['option']
-                
-                # Из displayopts
-                if 'displayopts' in option_data and isinstance(option_data['displayopts'], list):
-                    for opt in option_data['displayopts']:
-                        if 'optionname' in opt and opt['optionname']:
-                            # Переводим название опции
-                            option_name = translate_field(opt['optionname'])
-                            if option_name and option_name not in options_list:
-                                options_list.append(option_name)
-                
-                # Из moreoptions
-                if 'moreoptions' in option_data and isinstance(option_data['moreoptions'], list):
-                    for group in option_data['moreoptions']:
-                        if 'opts' in group and isinstance(group['opts'], list):
-                            for opt in group['opts']:
-                                if 'optionname' in opt and opt['optionname']:
-                                    # Переводим название опции
-                                    option_name = translate_field(opt['optionname'])
-                                    if option_name and option_name not in options_list:
-                                        options_list.append(option_name)
-        
-        normalized['options'] = options_list
-        
-        # 3. Извлекаем параметры конфигурации по конкретным ID
-        configuration_dict = {}
-        
-        # Configuration может быть в raw_data['configuration'] или в raw_data['extra']['configuration']
-        config_data = None
-        
-        # Сначала проверяем прямое поле configuration
-        if 'configuration' in raw_data and raw_data['configuration']:
-            config_data = raw_data['configuration']
-        # Если нет, проверяем в extra.configuration
-        elif 'extra' in raw_data and isinstance(raw_data['extra'], dict):
-            if 'configuration' in raw_data['extra'] and raw_data['extra']['configuration']:
-                config_data = raw_data['extra']['configuration']
-        
-        if config_data:
-            # Переводим конфигурацию
-            config_data_translated = translate_field(config_data)
+        Args:
+            records: List of (inner_id, raw_data)
             
-            # Проверяем структуру после перевода
-            if isinstance(config_data_translated, dict) and 'paramtypeitems' in config_data_translated:
-                paramtypeitems = config_data_translated['paramtypeitems']
-                if isinstance(paramtypeitems, list):
-                    for param_type in paramtypeitems:
-                        if isinstance(param_type, dict) and 'paramitems' in param_type:
-                            paramitems = param_type['paramitems']
-                            if isinstance(paramitems, list):
-                                for param in paramitems:
-                                    if isinstance(param, dict):
-                                        param_id = param.get('id')
-                                        
-                                        # Нормализуем ID к int для проверки
-                                        param_id_int = None
-                                        if param_id is not None:
-                                            try:
-                                                if isinstance(param_id, str):
-                                                    # Пытаемся преобразовать строку в int
-                                                    param_id_int = int(param_id)
-                                                elif isinstance(param_id, int):
-                                                    param_id_int = param_id
-                                            except (ValueError, TypeError):
-                                                # Если не удалось преобразовать, пропускаем параметр
-                                                continue
-                                        
-                                        # Проверяем, есть ли ID в списке нужных параметров
-                                        if param_id_int is not None and param_id_int in CONFIG_PARAM_IDS:
-                                            param_name = param.get('name', '')
-                                            param_value = param.get('value', '')
-                                            # Сохраняем ID как строку для ключа словаря
-                                            configuration_dict[str(param_id_int)] = {
-                                                'name': param_name,
-                                                'value': param_value
-                                            }
-        
-        normalized['configuration'] = configuration_dict if configuration_dict else None
-        
-        return normalized
+        Returns:
+            List of (inner_id, normalized fields or None, error message or None) in input order
+        """
+        if self._pool is None or len(records) < 2:
+            return normalize_batch(records)
+        
+        # One chunk per worker; results come back in input order
+        size = -(-len(records) // self.workers)
+        chunks = [records[i:i + size] for i in range(0, len(records), size)]
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self._pool, normalize_batch_in_worker, chunk) for chunk in chunks)
+        )
+        for _, cache_stats in results:
+            translation_cache.add_stats(cache_stats)
+        return [item for chunk_results, _ in results for item in chunk_results]
     
+    def _report_translation_cache(self) -> Dict[str, float]:
+        """
+        Log translation cache counters of this run (worker processes included).
+        
+        Returns:
+            Dictionary from TranslationCache.summary
+        """
+        summary = translation_cache.summary()
+        logger.info(
+            f"Translation cache: hits={summary['hits']}, misses={summary['misses']}, "
+            f"hit rate={summary['hit_rate']:.1%}, evictions={summary['evictions']}, "
+            f"entries={summary['entries']}, lookup time={summary['miss_seconds']:.2f}s, "
+            f"saved~{summary['saved_seconds']:.2f}s"
+        )
+        return summary
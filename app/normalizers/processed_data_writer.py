@@ -0,0 +1,131 @@
+"""Set-based writes to processed_data (bulk upsert keyed on inner_id, delta updates)."""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Set, Tuple
+from sqlalchemy import Boolean, Table, bindparam, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import ProcessedData
+
+
+PROCESSED_DATA_TABLE: Table = ProcessedData.__table__
+
+# Columns rewritten when a listing is normalized again (created_at is kept as first inserted)
+UPSERT_COLUMNS = tuple(
+    column.name for column in PROCESSED_DATA_TABLE.columns
+    if column.name not in ('id', 'inner_id', 'created_at')
+)
+
+# asyncpg accepts at most 32767 bind parameters per statement
+MAX_PARAMS = 32767
+
+
+def build_row(
+    inner_id: str,
+    normalized: Dict[str, Any],
+    active_status: int,
+    created_at: datetime,
+    now: datetime
+) -> Dict[str, Any]:
+    """
+    Build processed_data column values for a normalized listing.
+
+    Args:
+        inner_id: Listing ID
+        normalized: Fields from record_normalizer.normalize_record
+        active_status: active_status of the raw_data row
+        created_at: created_at of the raw_data row
+        now: Update timestamp
+
+    Returns:
+        Dictionary with a value for every processed_data column except id
+    """
+    row = {name: normalized.get(name) for name in UPSERT_COLUMNS}
+    row['inner_id'] = inner_id
+    row['active_status'] = active_status
+    row['created_at'] = created_at
+    row['updated_at'] = now
+    return row
+
+
+async def upsert_rows(session: AsyncSession, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Insert or overwrite listings in processed_data, one statement per chunk.
+
+    Rows must have distinct inner_ids (ON CONFLICT cannot touch a row twice).
+
+    Args:
+        session: Database session (caller commits)
+        rows: Column values built by build_row
+
+    Returns:
+        Tuple of (created, updated) counts
+    """
+    if not rows:
+        return 0, 0
+
+    table = PROCESSED_DATA_TABLE
+    chunk_size = max(1, MAX_PARAMS // len(rows[0]))
+    created = 0
+    for start in range(0, len(rows), chunk_size):
+        stmt = insert(table).values(rows[start:start + chunk_size])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.inner_id],
+            set_={name: stmt.excluded[name] for name in UPSERT_COLUMNS}
+        ).returning(
+            # xmax is 0 only for rows inserted by this statement
+            literal_column('xmax = 0', Boolean).label('inserted')
+        )
+        result = await session.execute(stmt)
+        created += sum(1 for inserted in result.scalars() if inserted)
+    return created, len(rows) - created
+
+
+async def fetch_existing(session: AsyncSession, inner_ids: Iterable[str]) -> Set[str]:
+    """
+    Find which listings already have a processed_data row, in one query.
+
+    Args:
+        session: Database session
+        inner_ids: Listing IDs to look up
+
+    Returns:
+        Set of inner_ids present in processed_data
+    """
+    inner_ids = list(set(inner_ids))
+    if not inner_ids:
+        return set()
+    table = PROCESSED_DATA_TABLE
+    result = await session.execute(select(table.c.inner_id).where(table.c.inner_id.in_(inner_ids)))
+    return set(result.scalars().all())
+
+
+async def update_rows(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """
+    Overwrite some columns of existing listings (delta normalization).
+
+    Rows may carry different column sets; one executemany UPDATE is issued
+    per distinct set (typically active_status alone, or with price).
+
+    Args:
+        session: Database session (caller commits)
+        rows: Dictionaries with inner_id and the columns to overwrite
+    """
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in rows:
+        columns = tuple(sorted(name for name in row if name != 'inner_id'))
+        groups.setdefault(columns, []).append(row)
+
+    table = PROCESSED_DATA_TABLE
+    for columns, group in groups.items():
+        stmt = (
+            update(table)
+            .where(table.c.inner_id == bindparam('b_inner_id'))
+            .values({name: bindparam(f'b_{name}') for name in columns})
+        )
+        params = [
+            {'b_inner_id': row['inner_id'], **{f'b_{name}': row[name] for name in columns}}
+            for row in group
+        ]
+        await session.execute(stmt, params)
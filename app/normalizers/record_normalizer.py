@@ -0,0 +1,345 @@
+"""Pure normalization of one raw_data document (safe to run in worker processes)."""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.utils.translation_cache import cache, translate_field
+
+
+# Список ID параметров конфигурации для извлечения
+CONFIG_PARAM_IDS = {93, 91, 90, 88, 116, 101, 108, 92, 115, 97, 95, 38, 58, 3, 13, 6, 11, 14, 17, 20, 24, 23, 41, 40, 42, 46, 43, 44, 47, 48, 49, 50, 53}
+
+
+# Top-level data fields -> processed_data columns computed from them
+FIELD_COLUMNS = {
+    **{name: (name,) for name in (
+        'url', 'mark', 'model', 'year', 'color', 'price', 'km_age', 'engine_type',
+        'transmission_type', 'body_type', 'address', 'section', 'offer_created',
+        'description', 'displacement', 'vin', 'first_registration', 'power',
+        'drive_type', 'images',
+    )},
+    'extra': ('options', 'configuration'),
+    'configuration': ('configuration',),
+}
+
+# configuration falls back to extra.configuration, so both are read together
+FIELD_INPUTS = {
+    'extra': ('extra', 'configuration'),
+    'configuration': ('configuration', 'extra'),
+}
+
+
+def normalize_record(raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a single record from raw_data.
+    
+    Extracts and normalizes key fields from the raw JSON data according to requirements:
+    - Basic fields from data block
+    - Options list from extra.option
+    - Configuration parameters by specific IDs
+    
+    Args:
+        raw_data: Raw data dictionary from raw_data.data field
+        
+    Returns:
+        Dictionary with field names matching ProcessedData model columns
+    """
+    normalized = {}
+    
+    # 1. Извлекаем базовые поля из блока data
+    # URL
+    normalized['url'] = raw_data.get('url')
+    
+    # Марка и модель
+    normalized['mark'] = translate_field(raw_data.get('mark')) if raw_data.get('mark') else None
+    normalized['model'] = translate_field(raw_data.get('model')) if raw_data.get('model') else None
+    
+    # Год
+    year = raw_data.get('year')
+    if year:
+        try:
+            if isinstance(year, str):
+                year = ''.join(c for c in year if c.isdigit())
+                normalized['year'] = int(year) if year else None
+            else:
+                normalized['year'] = int(year)
+        except (ValueError, TypeError):
+            normalized['year'] = None
+    else:
+        normalized['year'] = None
+    
+    # Цвет
+    normalized['color'] = translate_field(raw_data.get('color')) if raw_data.get('color') else None
+    
+    # Цена
+    price = raw_data.get('price')
+    if price:
+        try:
+            if isinstance(price, str):
+                price = ''.join(c for c in price if c.isdigit())
+                normalized['price'] = int(price) if price else None
+            else:
+                normalized['price'] = int(price)
+        except (ValueError, TypeError):
+            normalized['price'] = None
+    else:
+        normalized['price'] = None
+    
+    # Пробег
+    km_age = raw_data.get('km_age')
+    if km_age:
+        try:
+            if isinstance(km_age, str):
+                km_age = ''.join(c for c in km_age if c.isdigit())
+                normalized['km_age'] = int(km_age) if km_age else None
+            else:
+                normalized['km_age'] = int(km_age)
+        except (ValueError, TypeError):
+            normalized['km_age'] = None
+    else:
+        normalized['km_age'] = None
+    
+    # Тип двигателя, КПП, кузова
+    normalized['engine_type'] = translate_field(raw_data.get('engine_type')) if raw_data.get('engine_type') else None
+    normalized['transmission_type'] = translate_field(raw_data.get('transmission_type')) if raw_data.get('transmission_type') else None
+    normalized['body_type'] = translate_field(raw_data.get('body_type')) if raw_data.get('body_type') else None
+    
+    # Адрес
+    normalized['address'] = translate_field(raw_data.get('address')) if raw_data.get('address') else None
+    
+    # Секция (б/у или новый)
+    normalized['section'] = translate_field(raw_data.get('section')) if raw_data.get('section') else None
+    
+    # Дата создания объявления
+    offer_created = raw_data.get('offer_created')
+    if offer_created:
+        try:
+            if isinstance(offer_created, str):
+                # Парсим формат "2025-04-13" или "2025-04"
+                if len(offer_created) == 7 and offer_created[4] == '-':
+                    # Формат "YYYY-MM", добавляем день
+                    offer_created = f"{offer_created}-01"
+                normalized['offer_created'] = datetime.strptime(offer_created, '%Y-%m-%d').date()
+            elif isinstance(offer_created, datetime):
+                normalized['offer_created'] = offer_created.date()
+            else:
+                normalized['offer_created'] = offer_created
+        except (ValueError, TypeError):
+            normalized['offer_created'] = None
+    else:
+        normalized['offer_created'] = None
+    
+    # Описание (не переводим - сохраняем оригинал)
+    normalized['description'] = raw_data.get('description')
+    
+    # Объем двигателя
+    displacement = raw_data.get('displacement')
+    if displacement:
+        try:
+            if isinstance(displacement, str):
+                displacement = ''.join(c for c in displacement if c.isdigit() or c == '.')
+                normalized['displacement'] = float(displacement) if displacement else None
+            else:
+                normalized['displacement'] = float(displacement)
+        except (ValueError, TypeError):
+            normalized['displacement'] = None
+    else:
+        normalized['displacement'] = None
+    
+    # VIN
+    normalized['vin'] = raw_data.get('vin')
+    
+    # Дата первой регистрации
+    first_registration = raw_data.get('first_registration')
+    if first_registration:
+        try:
+            if isinstance(first_registration, str):
+                # Парсим формат "2019-02" или "2019-02-15"
+                if len(first_registration) == 7 and first_registration[4] == '-':
+                    # Формат "YYYY-MM", добавляем день
+                    first_registration = f"{first_registration}-01"
+                normalized['first_registration'] = datetime.strptime(first_registration, '%Y-%m-%d').date()
+            elif isinstance(first_registration, datetime):
+                normalized['first_registration'] = first_registration.date()
+            else:
+                normalized['first_registration'] = first_registration
+        except (ValueError, TypeError):
+            normalized['first_registration'] = None
+    else:
+        normalized['first_registration'] = None
+    
+    # Мощность
+    power = raw_data.get('power')
+    if power:
+        try:
+            if isinstance(power, str):
+                power = ''.join(c for c in power if c.isdigit())
+                normalized['power'] = int(power) if power else None
+            else:
+                normalized['power'] = int(power)
+        except (ValueError, TypeError):
+            normalized['power'] = None
+    else:
+        normalized['power'] = None
+    
+    # Тип привода
+    normalized['drive_type'] = translate_field(raw_data.get('drive_type')) if raw_data.get('drive_type') else None
+    
+    # Изображения
+    images = raw_data.get('images')
+    if images:
+        if isinstance(images, str):
+            try:
+                normalized['images'] = json.loads(images)
+            except json.JSONDecodeError:
+                normalized['images'] = []
+        elif isinstance(images, list):
+            normalized['images'] = images
+        else:
+            normalized['images'] = []
+    else:
+        normalized['images'] = []
+    
+    # 2. Извлекаем опции из extra.option
+    options_list = []
+    if 'extra' in raw_data and raw_data['extra']:
+        extra = raw_data['extra']
+        if 'option' in extra and extra['option']:
+            option_data = extra['option']
+            
+            # Из displayopts
+            if 'displayopts' in option_data and isinstance(option_data['displayopts'], list):
+                for opt in option_data['displayopts']:
+                    if 'optionname' in opt and opt['optionname']:
+                        # Переводим название опции
+                        option_name = translate_field(opt['optionname'])
+                        if option_name and option_name not in options_list:
+                            options_list.append(option_name)
+            
+            # Из moreoptions
+            if 'moreoptions' in option_data and isinstance(option_data['moreoptions'], list):
+                for group in option_data['moreoptions']:
+                    if 'opts' in group and isinstance(group['opts'], list):
+                        for opt in group['opts']:
+                            if 'optionname' in opt and opt['optionname']:
+                                # Переводим название опции
+                                option_name = translate_field(opt['optionname'])
+                                if option_name and option_name not in options_list:
+                                    options_list.append(option_name)
+    
+    normalized['options'] = options_list
+    
+    # 3. Извлекаем параметры конфигурации по конкретным ID
+    configuration_dict = {}
+    
+    # Configuration может быть в raw_data['configuration'] или в raw_data['extra']['configuration']
+    config_data = None
+    
+    # Сначала проверяем прямое поле configuration
+    if 'configuration' in raw_data and raw_data['configuration']:
+        config_data = raw_data['configuration']
+    # Если нет, проверяем в extra.configuration
+    elif 'extra' in raw_data and isinstance(raw_data['extra'], dict):
+        if 'configuration' in raw_data['extra'] and raw_data['extra']['configuration']:
+            config_data = raw_data['extra']['configuration']
+    
+    if config_data:
+        # Переводим конфигурацию
+        config_data_translated = translate_field(config_data)
+        
+        # Проверяем структуру после перевода
+        if isinstance(config_data_translated, dict) and 'paramtypeitems' in config_data_translated:
+            paramtypeitems = config_data_translated['paramtypeitems']
+            if isinstance(paramtypeitems, list):
+                for param_type in paramtypeitems:
+                    if isinstance(param_type, dict) and 'paramitems' in param_type:
+                        paramitems = param_type['paramitems']
+                        if isinstance(paramitems, list):
+                            for param in paramitems:
+                                if isinstance(param, dict):
+                                    param_id = param.get('id')
+                                    
+                                    # Нормализуем ID к int для проверки
+                                    param_id_int = None
+                                    if param_id is not None:
+                                        try:
+                                            if isinstance(param_id, str):
+                                                # Пытаемся преобразовать строку в int
+                                                param_id_int = int(param_id)
+                                            elif isinstance(param_id, int):
+                                                param_id_int = param_id
+                                        except (ValueError, TypeError):
+                                            # Если не удалось преобразовать, пропускаем параметр
+                                            continue
+                                    
+                                    # Проверяем, есть ли ID в списке нужных параметров
+                                    if param_id_int is not None and param_id_int in CONFIG_PARAM_IDS:
+                                        param_name = param.get('name', '')
+                                        param_value = param.get('value', '')
+                                        # Сохраняем ID как строку для ключа словаря
+                                        configuration_dict[str(param_id_int)] = {
+                                            'name': param_name,
+                                            'value': param_value
+                                        }
+    
+    normalized['configuration'] = configuration_dict if configuration_dict else None
+    
+    return normalized
+
+
+def normalize_fields(raw_data: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Recompute only the processed_data columns that depend on some data fields.
+    
+    Only the given fields are translated and parsed, so e.g. a price change
+    does not translate the configuration tree again.
+    
+    Args:
+        raw_data: Raw data dictionary from raw_data.data field
+        fields: Changed top-level data fields (all must be in FIELD_COLUMNS)
+        
+    Returns:
+        Dictionary with the affected ProcessedData columns only
+    """
+    columns = set()
+    inputs = set()
+    for field in fields:
+        columns.update(FIELD_COLUMNS[field])
+        inputs.update(FIELD_INPUTS.get(field, (field,)))
+    normalized = normalize_record({key: raw_data[key] for key in inputs if key in raw_data})
+    return {column: normalized[column] for column in columns}
+
+
+def normalize_batch(records: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Normalize several records (unit of work sent to a worker process).
+    
+    Args:
+        records: List of (inner_id, raw_data)
+        
+    Returns:
+        List of (inner_id, normalized fields or None, error message or None) in input order
+    """
+    results = []
+    for inner_id, raw_data in records:
+        try:
+            results.append((inner_id, normalize_record(raw_data), None))
+        except Exception as e:
+            results.append((inner_id, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def normalize_batch_in_worker(
+    records: List[Tuple[str, Dict[str, Any]]]
+) -> Tuple[List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]], Dict[str, float]]:
+    """
+    Normalize several records in a worker process.
+    
+    Args:
+        records: List of (inner_id, raw_data)
+        
+    Returns:
+        Tuple of (normalize_batch results, translation cache counters since the previous call)
+    """
+    return normalize_batch(records), cache.take_stats()
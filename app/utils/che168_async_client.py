@@ -0,0 +1,350 @@
+"""Async CHE168 API client with a pooled keep-alive session."""
+
+from typing import Dict, Any, Optional
+from datetime import date
+
+import asyncio
+import errno
+import time
+
+import aiohttp
+
+from app.utils import json_codec
+from app.utils.che168_client import CHE168ClientBase, REQUEST_HEADERS
+from app.utils.config import config
+from app.utils.logger import logger
+from app.utils.metrics import LatencyRecorder
+from app.utils.rate_controller import RateController, parse_retry_after
+from app.utils.response_archive import ResponseArchive
+from app.utils.retry import CircuitBreaker, load_retry_policies, retry_with_policy
+
+
+# OS errors of a pooled idle connection the server has already closed
+STALE_CONNECTION_ERRNOS = {errno.ECONNRESET, errno.EPIPE, errno.ECONNABORTED}
+
+# Failures that tell the rate controller to slow down (besides 429 and 5xx responses)
+OVERLOAD_ERRORS = (
+    asyncio.TimeoutError,
+    aiohttp.ServerTimeoutError,
+    aiohttp.ServerDisconnectedError,
+)
+
+
+def is_stale_connection(error: Exception) -> bool:
+    """
+    Check if a request failed because the server closed a pooled idle connection.
+
+    A GET on a fresh connection is safe to repeat right away. Failures to
+    connect (ClientConnectorError: refused, DNS) are not stale connections
+    even though they subclass ClientOSError; they go through the retry policy.
+
+    Args:
+        error: Exception raised by the request
+
+    Returns:
+        True for server disconnects and connection resets
+    """
+    if isinstance(error, aiohttp.ServerDisconnectedError):
+        return True
+    if isinstance(error, aiohttp.ClientConnectorError):
+        return False
+    return isinstance(error, aiohttp.ClientOSError) and error.errno in STALE_CONNECTION_ERRNOS
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Get retry error class of a failed request.
+
+    Args:
+        error: Exception raised by the request
+
+    Returns:
+        "throttled" (429), "server" (5xx or undecodable body), "client" (other 4xx),
+        "timeout", "connection" or "other"
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        if error.status == 429:
+            return "throttled"
+        if error.status >= 500:
+            return "server"
+        return "client"
+    if isinstance(error, (asyncio.TimeoutError, aiohttp.ServerTimeoutError)):
+        return "timeout"
+    if isinstance(error, aiohttp.ClientConnectionError):
+        return "connection"
+    if isinstance(error, (ValueError, aiohttp.ContentTypeError)):
+        # Truncated or non-JSON body from an overloaded server
+        return "server"
+    return "other"
+
+
+def retry_after_of(error: Exception) -> Optional[float]:
+    """Get Retry-After delay of a 429 response."""
+    if isinstance(error, aiohttp.ClientResponseError) and error.status == 429:
+        return parse_retry_after((error.headers or {}).get('Retry-After'))
+    return None
+
+
+class AsyncCHE168Client(CHE168ClientBase):
+    """
+    Async client for CHE168.COM API.
+
+    Same method surface as CHE168Client, but requests go through one
+    aiohttp session whose connections are kept alive and reused, so
+    concurrent requests neither pay a TCP+TLS handshake each nor occupy
+    executor threads. Use as an async context manager or call close().
+    """
+
+    def __init__(
+        self,
+        archive: Optional[ResponseArchive] = None,
+        latency: Optional[LatencyRecorder] = None,
+        rate_controller: Optional[RateController] = None
+    ):
+        """
+        Initialize async CHE168 API client.
+
+        Args:
+            archive: Archive to tee responses into (default from the archive section of config.yaml)
+            latency: Recorder of per-attempt request latencies (e.g. for load tests)
+            rate_controller: Adaptive rate the response outcomes are reported to
+                (loaders attach their own)
+        """
+        super().__init__(archive)
+        self.latency = latency
+        self.rate_controller = rate_controller
+        self.retry_policies, self.retry_deadline = load_retry_policies()
+        # Shared by all concurrent requests of this client
+        self.breaker = CircuitBreaker.from_config(name="CHE168 API")
+        api_config = config.get_api_config()
+        self.pool_size = api_config.get('pool_size', 10)
+        self.keepalive_seconds = api_config.get('keepalive_seconds', 15)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> 'AsyncCHE168Client':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use (inside the running event loop)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=self.keepalive_seconds,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=REQUEST_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close pooled connections and wait for archived responses to be written."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self.archive is not None:
+            await asyncio.to_thread(self.archive.flush)
+
+    async def _get_json(self, url: str, name: str = '') -> Dict[str, Any]:
+        """
+        Perform one GET and decode the JSON body, reporting the outcome.
+
+        The latency goes to the latency recorder; success, 429 (with
+        Retry-After), 5xx and timeouts go to the rate controller.
+
+        Args:
+            url: Request URL
+            name: Endpoint name for the latency recorder
+        """
+        if self.rate_controller is not None:
+            # Retried requests honour a Retry-After pause too
+            await self.rate_controller.wait_paused()
+
+        started = time.perf_counter()
+        try:
+            response = await self._get_json_once(url)
+        except Exception as e:
+            self._report(name, time.perf_counter() - started, e)
+            raise
+        self._report(name, time.perf_counter() - started)
+        return response
+
+    def _report(self, name: str, seconds: float, error: Optional[Exception] = None) -> None:
+        """Report outcome of one request to the latency recorder and the rate controller."""
+        if self.latency is not None:
+            self.latency.record(name, seconds, ok=error is None)
+
+        controller = self.rate_controller
+        if controller is None:
+            return
+        if error is None:
+            controller.on_success(seconds)
+        elif classify_error(error) == "throttled":
+            controller.on_failure(retry_after_of(error))
+        elif classify_error(error) == "server" or isinstance(error, OVERLOAD_ERRORS):
+            controller.on_failure()
+
+    async def _get_json_once(self, url: str) -> Dict[str, Any]:
+        """
+        Perform one GET and decode the JSON body.
+
+        A connection closed by the server while idle in the pool is retried
+        once immediately, without waiting for the retry interval.
+        """
+        session = self._get_session()
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                return json_codec.loads(await response.read())
+        except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError) as e:
+            if not is_stale_connection(e):
+                raise
+            logger.debug(f"Pooled connection was closed by server ({e}), retrying on a new one")
+            async with session.get(url) as response:
+                response.raise_for_status()
+                return json_codec.loads(await response.read())
+
+    async def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make HTTP request to API with retry mechanism.
+
+        Failures are retried with exponential backoff and jitter according to
+        their error class, within a total deadline; while the circuit breaker
+        is open all requests of this client wait together.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
+
+        Returns:
+            JSON response as dictionary
+
+        Raises:
+            aiohttp.ClientError: If request fails after all retries
+            CircuitOpenError: If the upstream stays down past the retry deadline
+        """
+        url = self._build_url(endpoint, params)
+
+        try:
+            response = await retry_with_policy(
+                self._get_json, url, endpoint.rstrip('/').rsplit('/', 1)[-1],
+                classify=classify_error,
+                policies=self.retry_policies,
+                deadline_seconds=self.retry_deadline,
+                breaker=self.breaker,
+                retry_after=retry_after_of
+            )
+        except Exception as e:
+            logger.error(f"API request failed for {endpoint}: {e}")
+            raise
+
+        self._archive_response(endpoint, params, response)
+        return response
+
+    async def get_filters(self) -> Dict[str, Any]:
+        """
+        Get available filter values.
+
+        Returns:
+            Dictionary with filter values (mark, model, transmission_type, etc.)
+        """
+        logger.debug("Fetching filters from CHE168 API")
+        return await self._make_request(self._endpoint('filters'))
+
+    async def get_offers(
+        self,
+        page: int,
+        mark: Optional[str] = None,
+        model: Optional[str] = None,
+        transmission_type: Optional[str] = None,
+        color: Optional[str] = None,
+        body_type: Optional[str] = None,
+        engine_type: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        km_age_from: Optional[int] = None,
+        km_age_to: Optional[int] = None,
+        price_from: Optional[float] = None,
+        price_to: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get list of offers with pagination and filters.
+
+        Args:
+            page: Page number (required)
+            mark: Car brand
+            model: Car model
+            transmission_type: Transmission type
+            color: Color
+            body_type: Body type
+            engine_type: Engine type
+            year_from: Minimum year
+            year_to: Maximum year
+            km_age_from: Minimum mileage (km)
+            km_age_to: Maximum mileage (km)
+            price_from: Minimum price (CNY)
+            price_to: Maximum price (CNY)
+
+        Returns:
+            Dictionary with 'result' (list of offers) and 'meta' (pagination info)
+        """
+        params = self._offers_params(
+            page,
+            mark=mark, model=model, transmission_type=transmission_type, color=color,
+            body_type=body_type, engine_type=engine_type, year_from=year_from, year_to=year_to,
+            km_age_from=km_age_from, km_age_to=km_age_to, price_from=price_from, price_to=price_to,
+        )
+        return await self._make_request(self._endpoint('offers'), params)
+
+    async def get_change_id(self, date_param: date) -> int:
+        """
+        Get initial change_id for a specific date.
+
+        Args:
+            date_param: Date to get change_id for (YYYY-MM-DD format)
+
+        Returns:
+            Change ID (integer)
+        """
+        params = self._change_id_params(date_param)
+
+        logger.debug(f"Fetching change_id for date {params['date']} from CHE168 API")
+        response = await self._make_request(self._endpoint('change_id'), params)
+
+        # Response format: {"change_id": 123456789}
+        return response.get('change_id')
+
+    async def get_changes(self, change_id: int) -> Dict[str, Any]:
+        """
+        Get changes starting from specified change_id.
+
+        Args:
+            change_id: Starting change ID
+
+        Returns:
+            Dictionary with 'result' (list of changes) and 'meta' (pagination info with next_change_id)
+        """
+        params = {'change_id': change_id}
+
+        logger.debug(f"Fetching changes from change_id {change_id} from CHE168 API")
+        return await self._make_request(self._endpoint('changes'), params)
+
+    async def get_offer(self, inner_id: str) -> Dict[str, Any]:
+        """
+        Get details of specific offer by inner_id.
+
+        Args:
+            inner_id: Inner ID of the offer
+
+        Returns:
+            Dictionary with offer details
+        """
+        params = {'inner_id': inner_id}
+
+        logger.debug(f"Fetching offer {inner_id} from CHE168 API")
+        return await self._make_request(self._endpoint('offer'), params)
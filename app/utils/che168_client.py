@@ -5,20 +5,46 @@ from typing import Dict, Any, Optional, List
 from datetime import date
 from urllib.parse import urlencode
 
+from app.utils import json_codec
 from app.utils.config import config, env_config
 from app.utils.logger import logger
+from app.utils.response_archive import ResponseArchive
 from app.utils.retry import retry_sync
 
 
-class CHE168Client:
-    """Client for CHE168.COM API."""
+# Optional get_offers filters, in query string order
+OFFER_FILTERS = (
+    'mark', 'model', 'transmission_type', 'color', 'body_type', 'engine_type',
+    'year_from', 'year_to', 'km_age_from', 'km_age_to', 'price_from', 'price_to',
+)
+
+REQUEST_HEADERS = {
+    'User-Agent': 'CHE168-Parser/1.0',
+    'Accept': 'application/json',
+}
+
+
+class CHE168ClientBase:
+    """Configuration, URLs and query parameters shared by the sync and async clients."""
     
-    def __init__(self):
-        """Initialize CHE168 API client."""
+    # Requests go to the rate-limited API (replay clients read from disk)
+    rate_limited = True
+    
+    def __init__(self, archive: Optional[ResponseArchive] = None):
+        """
+        Initialize CHE168 API client.
+        
+        Args:
+            archive: Archive to tee responses into (default from the archive section of config.yaml)
+        """
         self.api_key = env_config.get_che168_api_key()
         self.access_name = env_config.get_che168_access_name()
         che168_config = config.get_che168_config()
-        self.base_url = che168_config.get('base_url', '').format(access_name=self.access_name)
+        # CHE168_BASE_URL points the client at another server (scripts/mock_che168_server.py)
+        self.base_url = (
+            env_config.get_che168_base_url()
+            or che168_config.get('base_url', '').format(access_name=self.access_name)
+        )
         self.endpoints = che168_config.get('endpoints', {})
         self.timeout = config.get_api_config().get('timeout_seconds', 30)
         
@@ -26,6 +52,8 @@ class CHE168Client:
             raise ValueError("CHE168_API_KEY is not set in environment variables")
         if not self.access_name:
             raise ValueError("CHE168_ACCESS_NAME is not set in environment variables")
+        
+        self.archive = archive if archive is not None else ResponseArchive.from_config()
     
     def _build_url(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -40,15 +68,52 @@ class CHE168Client:
         """
         url = f"{self.base_url}{endpoint}"
         
-        # Add API key to params
-        if params is None:
-            params = {}
+        # Add API key to params (without modifying the caller's dictionary)
+        params = dict(params or {})
         params['api_key'] = self.api_key
         
         # Build query string
         query_string = urlencode(params, doseq=True)
         return f"{url}?{query_string}"
     
+    def _archive_response(self, endpoint: str, params: Optional[Dict[str, Any]], response: Any) -> None:
+        """Tee response into the archive (if enabled), keyed by endpoint name and params without api_key."""
+        if self.archive is not None:
+            self.archive.append(endpoint.rstrip('/').rsplit('/', 1)[-1], params, response)
+    
+    def _endpoint(self, name: str) -> str:
+        """Get endpoint path by name ("offers", "changes", ...)."""
+        return self.endpoints.get(name, f'/{name}')
+    
+    @staticmethod
+    def _offers_params(page: int, **filters: Any) -> Dict[str, Any]:
+        """
+        Build /offers query parameters.
+        
+        Args:
+            page: Page number
+            **filters: get_offers filters; empty values are omitted
+            
+        Returns:
+            Query parameters
+        """
+        params = {'page': page}
+        
+        # Add optional filters
+        for name in OFFER_FILTERS:
+            if filters.get(name):
+                params[name] = filters[name]
+        return params
+    
+    @staticmethod
+    def _change_id_params(date_param: date) -> Dict[str, Any]:
+        """Build /change_id query parameters (date in YYYY-MM-DD format)."""
+        return {'date': date_param.strftime('%Y-%m-%d')}
+
+
+class CHE168Client(CHE168ClientBase):
+    """Client for CHE168.COM API."""
+    
     def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Make HTTP request to API with retry mechanism.
@@ -72,19 +137,21 @@ class CHE168Client:
                 url,
                 timeout=self.timeout,
                 headers={
-                    'User-Agent': 'CHE168-Parser/1.0',
-                    'Accept': 'application/json',
+                    **REQUEST_HEADERS,
                     'Connection': 'close',  # Force close connection after each request
                 },
             )
             response.raise_for_status()
-            return response.json()
+            return json_codec.loads(response.content)
         
         try:
-            return retry_sync(_request)
+            response = retry_sync(_request)
         except Exception as e:
             logger.error(f"API request failed for {endpoint}: {e}")
             raise
+        
+        self._archive_response(endpoint, params, response)
+        return response
     
     def get_filters(self) -> Dict[str, Any]:
         """
@@ -94,8 +161,7 @@ class CHE168Client:
             Dictionary with filter values (mark, model, transmission_type, etc.)
         """
         logger.debug("Fetching filters from CHE168 API")
-        endpoint = self.endpoints.get('filters', '/filters')
-        return self._make_request(endpoint)
+        return self._make_request(self._endpoint('filters'))
     
     def get_offers(
         self,
@@ -134,36 +200,13 @@ class CHE168Client:
         Returns:
             Dictionary with 'result' (list of offers) and 'meta' (pagination info)
         """
-        params = {'page': page}
-        
-        # Add optional filters
-        if mark:
-            params['mark'] = mark
-        if model:
-            params['model'] = model
-        if transmission_type:
-            params['transmission_type'] = transmission_type
-        if color:
-            params['color'] = color
-        if body_type:
-            params['body_type'] = body_type
-        if engine_type:
-            params['engine_type'] = engine_type
-        if year_from:
-            params['year_from'] = year_from
-        if year_to:
-            params['year_to'] = year_to
-        if km_age_from:
-            params['km_age_from'] = km_age_from
-        if km_age_to:
-            params['km_age_to'] = km_age_to
-        if price_from:
-            params['price_from'] = price_from
-        if price_to:
-            params['price_to'] = price_to
-        
-        endpoint = self.endpoints.get('offers', '/offers')
-        return self._make_request(endpoint, params)
+        params = self._offers_params(
+            page,
+            mark=mark, model=model, transmission_type=transmission_type, color=color,
+            body_type=body_type, engine_type=engine_type, year_from=year_from, year_to=year_to,
+            km_age_from=km_age_from, km_age_to=km_age_to, price_from=price_from, price_to=price_to,
+        )
+        return self._make_request(self._endpoint('offers'), params)
     
     def get_change_id(self, date_param: date) -> int:
         """
@@ -175,12 +218,10 @@ class CHE168Client:
         Returns:
             Change ID (integer)
         """
-        date_str = date_param.strftime('%Y-%m-%d')
-        params = {'date': date_str}
+        params = self._change_id_params(date_param)
         
-        logger.debug(f"Fetching change_id for date {date_str} from CHE168 API")
-        endpoint = self.endpoints.get('change_id', '/change_id')
-        response = self._make_request(endpoint, params)
+        logger.debug(f"Fetching change_id for date {params['date']} from CHE168 API")
+        response = self._make_request(self._endpoint('change_id'), params)
         
         # Response format: {"change_id": 123456789}
         return response.get('change_id')
@@ -198,8 +239,7 @@ class CHE168Client:
         params = {'change_id': change_id}
         
         logger.debug(f"Fetching changes from change_id {change_id} from CHE168 API")
-        endpoint = self.endpoints.get('changes', '/changes')
-        return self._make_request(endpoint, params)
+        return self._make_request(self._endpoint('changes'), params)
     
     def get_offer(self, inner_id: str) -> Dict[str, Any]:
         """
@@ -214,5 +254,4 @@ class CHE168Client:
         params = {'inner_id': inner_id}
         
         logger.debug(f"Fetching offer {inner_id} from CHE168 API")
-        endpoint = self.endpoints.get('offer', '/offer')
-        return self._make_request(endpoint, params)
+        return self._make_request(self._endpoint('offer'), params)
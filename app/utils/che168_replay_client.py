@@ -0,0 +1,113 @@
+"""Replay of archived CHE168 API responses."""
+
+import asyncio
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.utils.che168_client import CHE168ClientBase
+from app.utils.logger import logger
+from app.utils.response_archive import iter_segment_offsets, iter_segments, read_record
+
+
+class ReplayMissError(LookupError):
+    """Requested response is not in the archive."""
+
+
+def _request_key(endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple:
+    """Build lookup key; values are compared as strings, like in a query string."""
+    return (endpoint, tuple(sorted((name, str(value)) for name, value in (params or {}).items())))
+
+
+class ReplayCHE168Client:
+    """
+    Async client serving responses from a ResponseArchive instead of the API.
+
+    Same method surface as AsyncCHE168Client. When a request was archived
+    more than once, the latest response wins. A request that is not in the
+    archive raises ReplayMissError.
+
+    Only an index (request -> segment and offset) is kept in memory; each
+    response is read from its segment when requested.
+    """
+
+    # Served from disk: loaders skip API throttling
+    rate_limited = False
+
+    def __init__(
+        self,
+        directory: Path,
+        endpoints: Optional[Iterable[str]] = None,
+        dates: Optional[Iterable[str]] = None
+    ):
+        """
+        Index archived responses.
+
+        Args:
+            directory: Archive root directory
+            endpoints: Endpoint names to index (None for all)
+            dates: Segment dates to index as YYYY-MM-DD (None for all)
+        """
+        self.directory = Path(directory)
+        self._segments: List[Path] = []
+        self._index: Dict[Tuple, Tuple[int, int]] = {}  # Request key -> (segment number, offset)
+
+        for path in iter_segments(self.directory, endpoints, dates):
+            self._segments.append(path)
+            segment = len(self._segments) - 1
+            for offset, record in iter_segment_offsets(path):
+                key = _request_key(record['endpoint'], record.get('params'))
+                self._index[key] = (segment, offset)
+
+        logger.info(
+            f"Indexed {len(self._index):,} archived responses in "
+            f"{len(self._segments)} segments from {self.directory}"
+        )
+
+    async def __aenter__(self) -> 'ReplayCHE168Client':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Nothing to close (same surface as AsyncCHE168Client)."""
+
+    async def _lookup(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Get archived response for a request (read from disk in a thread)."""
+        key = _request_key(endpoint, params)
+        if key not in self._index:
+            raise ReplayMissError(f"No archived {endpoint} response for {params or {}}")
+        segment, offset = self._index[key]
+        record = await asyncio.to_thread(read_record, self._segments[segment], offset)
+        return record['response']
+
+    async def get_filters(self) -> Dict[str, Any]:
+        """Get archived /filters response."""
+        return await self._lookup('filters')
+
+    async def get_offers(self, page: int, **filters: Any) -> Dict[str, Any]:
+        """
+        Get archived /offers page.
+
+        Args:
+            page: Page number
+            **filters: Same filters as CHE168Client.get_offers
+
+        Returns:
+            Dictionary with 'result' (list of offers) and 'meta' (pagination info)
+        """
+        return await self._lookup('offers', CHE168ClientBase._offers_params(page, **filters))
+
+    async def get_change_id(self, date_param: date) -> int:
+        """Get archived change_id for a date."""
+        response = await self._lookup('change_id', CHE168ClientBase._change_id_params(date_param))
+        return response.get('change_id')
+
+    async def get_changes(self, change_id: int) -> Dict[str, Any]:
+        """Get archived /changes page starting at change_id."""
+        return await self._lookup('changes', {'change_id': change_id})
+
+    async def get_offer(self, inner_id: str) -> Dict[str, Any]:
+        """Get archived /offer response."""
+        return await self._lookup('offer', {'inner_id': inner_id})
@@ -73,6 +73,14 @@ class Config:
         """Get rate limiting configuration."""
         return self.get('rate_limit', {})
     
+    def get_initial_load_config(self) -> Dict[str, Any]:
+        """Get initial load configuration."""
+        return self.get('initial_load', {})
+    
+    def get_pipeline_config(self) -> Dict[str, Any]:
+        """Get loader pipeline configuration."""
+        return self.get('pipeline', {})
+    
     def get_pagination_config(self) -> Dict[str, Any]:
         """Get pagination configuration."""
         return self.get('pagination', {})
@@ -107,6 +115,16 @@ class EnvConfig:
         """Get CHE168 access name from environment."""
         return os.getenv('CHE168_ACCESS_NAME', 'autobase')
     
+    @staticmethod
+    def get_che168_base_url() -> str:
+        """Get CHE168 API base URL override from environment (e.g. a local mock server)."""
+        return os.getenv('CHE168_BASE_URL', '')
+    
+    @staticmethod
+    def get_che168_export_auth() -> tuple:
+        """Get login and password of the daily CSV exports from environment."""
+        return os.getenv('CHE168_EXPORT_LOGIN', ''), os.getenv('CHE168_EXPORT_PASSWORD', '')
+    
     @staticmethod
     def get_secret_key() -> str:
         """Get secret key from environment."""
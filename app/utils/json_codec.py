@@ -0,0 +1,82 @@
+"""Pluggable JSON codec for API responses and JSONB columns."""
+
+import json
+from typing import Any, Callable, Dict, Union
+
+from app.utils.config import config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class JsonCodec:
+    """
+    JSON encoder/decoder pair.
+
+    dumps always returns str (SQLAlchemy and asyncpg expect text for JSONB),
+    loads accepts str or bytes.
+    """
+
+    def __init__(self, name: str, dumps: Callable[[Any], str], loads: Callable[[Union[str, bytes]], Any]):
+        """
+        Initialize codec.
+
+        Args:
+            name: Backend name ("orjson" or "json")
+            dumps: Function encoding an object to JSON text
+            loads: Function decoding JSON text or bytes
+        """
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return f"JsonCodec({self.name})"
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def _orjson_dumps(obj: Any) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+
+CODECS: Dict[str, JsonCodec] = {
+    'json': JsonCodec('json', _stdlib_dumps, json.loads),
+}
+if orjson is not None:
+    CODECS['orjson'] = JsonCodec('orjson', _orjson_dumps, orjson.loads)
+
+
+def get_codec(name: str = "auto") -> JsonCodec:
+    """
+    Get JSON codec by name.
+
+    Args:
+        name: "orjson", "json" or "auto" (orjson if installed, else json)
+
+    Returns:
+        JSON codec
+    """
+    if name == "auto":
+        return CODECS.get('orjson', CODECS['json'])
+    if name not in CODECS:
+        raise ValueError(f"JSON codec '{name}' is not available (installed: {', '.join(CODECS)})")
+    return CODECS[name]
+
+
+# Codec used across the application (json.codec in config.yaml)
+codec = get_codec(config.get('json.codec', 'auto'))
+
+
+def dumps(obj: Any) -> str:
+    """Encode object to JSON text with the configured codec."""
+    return codec.dumps(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON text or bytes with the configured codec."""
+    return codec.loads(data)
@@ -0,0 +1,72 @@
+"""Request latency recording for load tests and diagnostics."""
+
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+
+def percentile(samples: List[float], point: float) -> float:
+    """
+    Get a percentile of samples (nearest-rank method).
+
+    Args:
+        samples: Sorted samples
+        point: Percentile in range (0, 100]
+
+    Returns:
+        Sample value at the percentile (0.0 for no samples)
+    """
+    if not samples:
+        return 0.0
+    rank = max(1, math.ceil(point / 100 * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+
+class LatencyRecorder:
+    """Collect request latencies and failures per endpoint."""
+
+    def __init__(self):
+        """Initialize empty recorder."""
+        self._samples: Dict[str, List[float]] = defaultdict(list)
+        self._failures: Dict[str, int] = defaultdict(int)
+
+    def record(self, name: str, seconds: float, ok: bool = True) -> None:
+        """
+        Record one request.
+
+        Args:
+            name: Endpoint name ("offers", "changes", ...)
+            seconds: Request duration
+            ok: False if the request failed
+        """
+        self._samples[name].append(seconds)
+        if not ok:
+            self._failures[name] += 1
+
+    def count(self, name: str) -> int:
+        """Get number of recorded requests for an endpoint."""
+        return len(self._samples.get(name, ()))
+
+    def summary(self, points: Iterable[float] = (50, 95, 99)) -> Dict[str, Dict[str, float]]:
+        """
+        Get latency statistics per endpoint.
+
+        Args:
+            points: Percentiles to report
+
+        Returns:
+            Dictionary of endpoint -> {'count', 'failures', 'p50', 'p95', 'p99', 'max'}
+            (latencies in milliseconds)
+        """
+        result = {}
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            values = {
+                'count': len(ordered),
+                'failures': self._failures.get(name, 0),
+            }
+            for point in points:
+                values[f'p{point:g}'] = percentile(ordered, point) * 1000
+            values['max'] = ordered[-1] * 1000 if ordered else 0.0
+            result[name] = values
+        return result
@@ -0,0 +1,189 @@
+"""Adaptive (AIMD) request rate controller for API calls."""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from app.utils.config import config
+from app.utils.logger import logger
+from app.utils.rate_limiter import TokenBucket
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Delay in seconds or an HTTP date
+
+    Returns:
+        Seconds to wait (None if missing or invalid)
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateController:
+    """
+    Request rate that adapts to how the API responds (AIMD).
+
+    Callers take tokens with acquire(), like from a TokenBucket, and the API
+    client reports every response back. While responses are fast and
+    successful the rate grows additively (by increase_per_second for every
+    second of traffic); a 429, 5xx or timeout cuts it multiplicatively, at
+    most once per decrease_interval, so one burst of failures of concurrent
+    requests counts as one signal. Retry-After pauses all callers. The rate
+    stays within [min_rate, max_rate].
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        burst: Optional[float] = None,
+        increase_per_second: float = 0.05,
+        decrease_factor: float = 0.5,
+        slow_response_seconds: float = 5.0,
+        decrease_interval: float = 2.0,
+        name: str = "api"
+    ):
+        """
+        Initialize rate controller.
+
+        Args:
+            rate: Initial requests per second
+            min_rate: Floor of the rate
+            max_rate: Ceiling of the rate
+            burst: Token bucket capacity (default max(1, rate))
+            increase_per_second: Rate added per second of fast successful traffic
+            decrease_factor: Rate multiplier on a failure signal (0 < factor < 1)
+            slow_response_seconds: Responses slower than this do not increase the rate
+            decrease_interval: Minimum seconds between two decreases
+            name: Name for logging
+        """
+        if not 0 < min_rate <= max_rate:
+            raise ValueError(f"Invalid rate range [{min_rate}, {max_rate}]")
+        if not 0 < decrease_factor < 1:
+            raise ValueError(f"Decrease factor must be in (0, 1), got {decrease_factor}")
+
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase_per_second = increase_per_second
+        self.decrease_factor = decrease_factor
+        self.slow_response_seconds = slow_response_seconds
+        self.decrease_interval = decrease_interval
+        self.name = name
+        self.bucket = TokenBucket(rate=self._clamp(rate), capacity=burst)
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.throttled = 0
+
+    @classmethod
+    def from_config(cls, rate: float, burst: Optional[float] = None, name: str = "api") -> 'RateController':
+        """
+        Create controller with limits from the rate_control section of config.yaml.
+
+        Args:
+            rate: Initial requests per second
+            burst: Token bucket capacity
+            name: Name for logging
+        """
+        control_config = config.get('rate_control', {})
+        return cls(
+            rate=rate,
+            min_rate=control_config.get('min_rate', 0.2),
+            max_rate=control_config.get('max_rate', 5.0),
+            burst=burst,
+            increase_per_second=control_config.get('increase_per_second', 0.05),
+            decrease_factor=control_config.get('decrease_factor', 0.5),
+            slow_response_seconds=control_config.get('slow_response_seconds', 5.0),
+            decrease_interval=control_config.get('decrease_interval_seconds', 2.0),
+            name=name
+        )
+
+    @property
+    def rate(self) -> float:
+        """Current requests per second."""
+        return self.bucket.rate
+
+    def _clamp(self, rate: float) -> float:
+        return min(self.max_rate, max(self.min_rate, rate))
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait for a Retry-After pause to end and take tokens at the current rate."""
+        await self.wait_paused()
+        await self.bucket.acquire(tokens)
+
+    async def wait_paused(self) -> None:
+        """Wait until a Retry-After pause is over (also used by retries of failed requests)."""
+        while True:
+            delay = self._paused_until - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def on_success(self, seconds: float) -> None:
+        """
+        Report a successful response.
+
+        Args:
+            seconds: Response time
+        """
+        if seconds > self.slow_response_seconds or self.rate >= self.max_rate:
+            return
+        # One success is 1/rate seconds of traffic at the current rate
+        self.bucket.set_rate(self._clamp(self.rate + self.increase_per_second / self.rate))
+        self.increases += 1
+
+    def on_failure(self, retry_after: Optional[float] = None) -> None:
+        """
+        Report a 429, 5xx or timeout.
+
+        Args:
+            retry_after: Seconds from the Retry-After header (pauses all callers)
+        """
+        now = time.monotonic()
+        if retry_after:
+            self.throttled += 1
+            if now + retry_after > self._paused_until:
+                self._paused_until = now + retry_after
+                logger.warning(f"{self.name}: API asked to retry after {retry_after:.0f}s, pausing requests")
+
+        if now - self._last_decrease < self.decrease_interval:
+            return
+        self._last_decrease = now
+        old_rate = self.rate
+        self.bucket.set_rate(self._clamp(old_rate * self.decrease_factor))
+        self.decreases += 1
+        if self.rate < old_rate:
+            logger.info(f"{self.name}: request rate lowered {old_rate:.2f} -> {self.rate:.2f} req/s")
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get controller metrics.
+
+        Returns:
+            Dictionary with rate (req/s), increases, decreases and throttled (Retry-After responses)
+        """
+        return {
+            'rate': round(self.rate, 3),
+            'increases': self.increases,
+            'decreases': self.decreases,
+            'throttled': self.throttled,
+        }
@@ -0,0 +1,67 @@
+"""Token bucket rate limiter for API calls."""
+
+import asyncio
+import time
+from typing import Optional
+
+
+# Rate for sources that need no throttling (e.g. replay from disk)
+UNTHROTTLED_RATE = 1e9
+
+
+class TokenBucket:
+    """Async token bucket shared by concurrent API callers."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum number of accumulated tokens (burst size, default max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add tokens accumulated since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Change the refill rate (tokens accumulated so far are kept).
+
+        Args:
+            rate: New tokens per second
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self._refill()
+        self.rate = float(rate)
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Wait until the requested number of tokens is available and take them.
+
+        Waiters are served in FIFO order: the lock is held while sleeping,
+        so a caller that arrived later cannot overtake a waiting one.
+
+        Args:
+            tokens: Number of tokens to take
+        """
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
@@ -0,0 +1,297 @@
+"""Append-only compressed archive of raw API responses."""
+
+import atexit
+import os
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Tuple
+
+from app.utils import json_codec
+from app.utils.config import config
+from app.utils.logger import logger
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Raised when the last frame of a segment was cut off by a crash
+TRUNCATED_FRAME_ERRORS = (zstandard.ZstdError,) if zstandard else ()
+
+
+class ResponseArchive:
+    """
+    Tee of API responses into NDJSON segment files.
+
+    Every response becomes one line {"ts", "endpoint", "params", "response"}
+    (the API key is never part of params). Segments are rotated by date:
+    <directory>/<YYYY-MM-DD>/<endpoint>.<pid>.ndjson.zst. Each line is written
+    as a separate zstd frame appended to the segment, so a crash can only cut
+    off the last line and concatenated frames stay readable. Without the
+    zstandard package segments are written uncompressed (.ndjson).
+
+    Compression and file writes run in a background writer thread, so
+    archiving does not block the event loop of the async client. When the
+    queue is full, append waits for the writer (the disk is the bottleneck).
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        endpoints: Optional[Iterable[str]] = None,
+        compression_level: int = 3,
+        queue_size: int = 1000
+    ):
+        """
+        Initialize response archive.
+
+        Args:
+            directory: Root directory for segments
+            endpoints: Endpoint names to archive (None for all)
+            compression_level: zstd compression level
+            queue_size: Encoded responses waiting for the writer thread
+        """
+        self.directory = Path(directory)
+        self.endpoints = set(endpoints) if endpoints else None
+        self._compressor = zstandard.ZstdCompressor(level=compression_level) if zstandard else None
+        self._queue: "queue.Queue[Tuple[str, Path, bytes]]" = queue.Queue(maxsize=queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        if zstandard is None:
+            logger.warning("zstandard is not installed, API responses are archived uncompressed")
+
+    @classmethod
+    def from_config(cls) -> Optional['ResponseArchive']:
+        """Create archive from the archive section of config.yaml (None if disabled)."""
+        archive_config = config.get('archive', {})
+        if not archive_config.get('enabled', False):
+            return None
+        return cls(
+            directory=Path(archive_config.get('directory', 'data/archive')),
+            endpoints=archive_config.get('endpoints'),
+            compression_level=archive_config.get('compression_level', 3),
+            queue_size=archive_config.get('queue_size', 1000)
+        )
+
+    def _segment_path(self, endpoint: str, now: datetime) -> Path:
+        """Get segment file for endpoint and date."""
+        suffix = '.ndjson.zst' if self._compressor else '.ndjson'
+        return self.directory / now.strftime('%Y-%m-%d') / f"{endpoint}.{os.getpid()}{suffix}"
+
+    def append(self, endpoint: str, params: Optional[Dict[str, Any]], response: Any) -> None:
+        """
+        Queue one response for the segment of the current date.
+
+        The response is encoded here (the caller may reuse it afterwards);
+        compression and the write happen in the writer thread. Archive
+        failures are logged and never break the API call.
+
+        Args:
+            endpoint: Endpoint name ("offers", "changes", ...)
+            params: Query parameters without api_key
+            response: Decoded response
+        """
+        if self.endpoints is not None and endpoint not in self.endpoints:
+            return
+
+        now = datetime.utcnow()
+        line = json_codec.dumps({
+            'ts': now.isoformat(),
+            'endpoint': endpoint,
+            'params': params or {},
+            'response': response,
+        }).encode('utf-8') + b'\n'
+
+        self._start_writer()
+        self._queue.put((endpoint, self._segment_path(endpoint, now), line))
+
+    def flush(self) -> None:
+        """Wait until every queued response is written."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def _start_writer(self) -> None:
+        """Start the writer thread on first use."""
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="response-archive", daemon=True)
+                self._writer.start()
+                # Daemon thread: write out what is still queued when the process exits
+                atexit.register(self.flush)
+
+    def _write_loop(self) -> None:
+        """Compress queued responses and append them to their segments (writer thread)."""
+        while True:
+            endpoint, path, line = self._queue.get()
+            try:
+                if self._compressor:
+                    line = self._compressor.compress(line)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, 'ab') as f:
+                    f.write(line)
+            except Exception as e:
+                logger.warning(f"Failed to archive {endpoint} response: {e}")
+            finally:
+                self._queue.task_done()
+
+
+def _iter_frames(raw: BinaryIO, chunk_size: int = 1 << 20) -> Iterator[Tuple[int, bytes]]:
+    """
+    Decompress concatenated zstd frames one by one.
+
+    Args:
+        raw: Segment file opened in binary mode
+        chunk_size: Bytes read from disk at once
+
+    Yields:
+        Tuples of (file offset of the frame, content of the frame), complete frames only
+    """
+    decompressor = zstandard.ZstdDecompressor()
+    frame = decompressor.decompressobj()
+    content = []
+    offset = 0  # Start of the current frame
+    position = 0  # Start of the current chunk
+    for chunk in iter(lambda: raw.read(chunk_size), b''):
+        while chunk:
+            content.append(frame.decompress(chunk))
+            if not frame.eof:
+                break
+            yield offset, b''.join(content)
+            content = []
+            unused = frame.unused_data
+            position += len(chunk) - len(unused)
+            offset = position
+            chunk = unused
+            frame = decompressor.decompressobj()
+        position += len(chunk)
+    if any(content):
+        raise zstandard.ZstdError("incomplete frame at end of segment")
+
+
+def _iter_lines(raw: BinaryIO) -> Iterator[Tuple[int, bytes]]:
+    """Read lines of an uncompressed segment with their file offsets."""
+    offset = 0
+    for line in raw:
+        yield offset, line
+        offset += len(line)
+
+
+def iter_segment_offsets(path: Path) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Read archived responses from one segment file with their offsets.
+
+    Reading stops with a warning at a truncated or corrupted tail (a crash
+    during the last write); all complete records before it are returned.
+
+    Args:
+        path: Segment file (.ndjson or .ndjson.zst)
+
+    Yields:
+        Tuples of (offset for read_record, archived record) in write order
+    """
+    with open(path, 'rb') as raw:
+        if path.suffix == '.zst':
+            if zstandard is None:
+                raise RuntimeError(f"zstandard is required to read {path}")
+            lines = _iter_frames(raw)
+        else:
+            lines = _iter_lines(raw)
+
+        try:
+            for offset, line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield offset, json_codec.loads(line)
+                except ValueError:
+                    # Last line of an uncompressed segment cut off by a crash
+                    logger.warning(f"Skipping truncated record in {path}")
+        except TRUNCATED_FRAME_ERRORS as e:
+            logger.warning(f"Segment {path} ends with a truncated frame: {e}")
+
+
+def iter_segment(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Read archived responses from one segment file.
+
+    Args:
+        path: Segment file (.ndjson or .ndjson.zst)
+
+    Yields:
+        Archived records in write order (see iter_segment_offsets)
+    """
+    for _, record in iter_segment_offsets(path):
+        yield record
+
+
+def read_record(path: Path, offset: int) -> Dict[str, Any]:
+    """
+    Read one archived response at an offset from iter_segment_offsets.
+
+    Args:
+        path: Segment file (.ndjson or .ndjson.zst)
+        offset: Offset of the record's frame (or line)
+
+    Returns:
+        Archived record
+    """
+    with open(path, 'rb') as raw:
+        raw.seek(offset)
+        if path.suffix != '.zst':
+            return json_codec.loads(raw.readline())
+        for _, content in _iter_frames(raw, chunk_size=1 << 16):
+            return json_codec.loads(content)
+    raise ValueError(f"No archived record at offset {offset} of {path}")
+
+
+def iter_segments(
+    directory: Path,
+    endpoints: Optional[Iterable[str]] = None,
+    dates: Optional[Iterable[str]] = None
+) -> Iterator[Path]:
+    """
+    List segment files of an archive.
+
+    Args:
+        directory: Archive root directory
+        endpoints: Endpoint names to list (None for all)
+        dates: Segment dates to list as YYYY-MM-DD (None for all)
+
+    Yields:
+        Segment paths in date order
+    """
+    endpoints = set(endpoints) if endpoints else None
+    dates = set(dates) if dates else None
+
+    for day_dir in sorted(Path(directory).iterdir()):
+        if not day_dir.is_dir() or (dates is not None and day_dir.name not in dates):
+            continue
+        for path in sorted(day_dir.glob('*.ndjson*')):
+            if endpoints is not None and path.name.split('.')[0] not in endpoints:
+                continue
+            yield path
+
+
+def iter_archive(
+    directory: Path,
+    endpoints: Optional[Iterable[str]] = None,
+    dates: Optional[Iterable[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Read archived responses from all segments.
+
+    Args:
+        directory: Archive root directory
+        endpoints: Endpoint names to read (None for all)
+        dates: Segment dates to read as YYYY-MM-DD (None for all)
+
+    Yields:
+        Archived records, segment by segment in date order
+    """
+    for path in iter_segments(directory, endpoints, dates):
+        yield from iter_segment(path)
@@ -1,8 +1,9 @@
 """Retry mechanism for API calls."""
 
 import asyncio
+import random
 import time
-from typing import Callable, TypeVar, Optional, Any, Tuple
+from typing import Callable, TypeVar, Optional, Any, Dict, Tuple
 from functools import wraps
 from datetime import datetime, timedelta
 
@@ -219,3 +220,280 @@ def retry_sync(
     if last_exception:
         raise last_exception
     raise RuntimeError("Retry mechanism failed unexpectedly")
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for one class of errors."""
+    
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        multiplier: float = 2.0
+    ):
+        """
+        Initialize retry policy.
+        
+        Args:
+            max_attempts: Attempts including the first one (1 = no retries)
+            base_delay: Backoff cap before the first retry, seconds
+            max_delay: Upper bound of the backoff cap, seconds
+            multiplier: Growth of the backoff cap per attempt
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+    
+    def delay(self, attempt: int) -> float:
+        """
+        Get delay before the next attempt.
+        
+        Full jitter (uniform in [0, cap]) spreads retries of concurrent
+        callers instead of sending them back at the same moment.
+        
+        Args:
+            attempt: Number of the attempt that just failed (1-based)
+            
+        Returns:
+            Seconds to wait
+        """
+        cap = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, cap)
+
+
+# Error classes with default policies (overridden by retry.backoff in config.yaml)
+DEFAULT_POLICIES = {
+    'connection': {'max_attempts': 8, 'base_delay_seconds': 0.5, 'max_delay_seconds': 30},
+    'timeout': {'max_attempts': 5, 'base_delay_seconds': 2, 'max_delay_seconds': 60},
+    'server': {'max_attempts': 6, 'base_delay_seconds': 2, 'max_delay_seconds': 120},
+    'throttled': {'max_attempts': 8, 'base_delay_seconds': 5, 'max_delay_seconds': 300},
+    'client': {'max_attempts': 1},
+    'other': {'max_attempts': 3, 'base_delay_seconds': 1, 'max_delay_seconds': 10},
+}
+
+# Error classes that mean the upstream is unavailable (counted by the circuit breaker)
+UPSTREAM_FAILURES = ('connection', 'timeout', 'server')
+
+
+def load_retry_policies() -> Tuple[Dict[str, RetryPolicy], float]:
+    """
+    Build per-error-class retry policies from the retry.backoff section of config.yaml.
+    
+    Returns:
+        Tuple of (policies by error class, total deadline in seconds)
+    """
+    backoff_config = config.get('retry.backoff', {})
+    policies = {}
+    for error_class, defaults in DEFAULT_POLICIES.items():
+        values = {**defaults, **(backoff_config.get(error_class) or {})}
+        policies[error_class] = RetryPolicy(
+            max_attempts=values['max_attempts'],
+            base_delay=values.get('base_delay_seconds', 1.0),
+            max_delay=values.get('max_delay_seconds', 60.0)
+        )
+    return policies, backoff_config.get('deadline_seconds', 600)
+
+
+class CircuitOpenError(Exception):
+    """Upstream is considered down and the call cannot wait for the circuit to close."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker shared by all callers of one upstream.
+    
+    After failure_threshold consecutive upstream failures the circuit opens:
+    every caller waits in before_call() instead of sending requests, so
+    concurrent fetchers pause together rather than each burning its own
+    retry budget. After open_seconds one probe request is let through
+    (half-open); its success closes the circuit, its failure opens it again
+    for twice as long (up to max_open_seconds).
+    """
+    
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        open_seconds: float = 30.0,
+        max_open_seconds: float = 300.0,
+        name: str = "api"
+    ):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            open_seconds: First open period, seconds
+            max_open_seconds: Longest open period, seconds
+            name: Name for logging
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.name = name
+        self.state = "closed"
+        self.failures = 0
+        self.times_opened = 0
+        self._open_for = open_seconds
+        self._opened_until = 0.0
+        self._probe_running = False
+    
+    @classmethod
+    def from_config(cls, name: str = "api") -> 'CircuitBreaker':
+        """Create circuit breaker from the retry.circuit_breaker section of config.yaml."""
+        breaker_config = config.get('retry.circuit_breaker', {})
+        return cls(
+            failure_threshold=breaker_config.get('failure_threshold', 5),
+            open_seconds=breaker_config.get('open_seconds', 30),
+            max_open_seconds=breaker_config.get('max_open_seconds', 300),
+            name=name
+        )
+    
+    async def before_call(self, deadline: Optional[float] = None) -> None:
+        """
+        Wait until a call is allowed.
+        
+        Args:
+            deadline: time.monotonic() value the caller must finish by
+            
+        Raises:
+            CircuitOpenError: If the circuit stays open past the deadline
+        """
+        while True:
+            now = time.monotonic()
+            if self.state == "closed":
+                return
+            if self.state == "open" and now >= self._opened_until:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probe_running:
+                # This caller is the probe, the others keep waiting for its outcome
+                self._probe_running = True
+                return
+            
+            wait = self._opened_until - now if self.state == "open" else 0.5
+            if deadline is not None and now + wait > deadline:
+                raise CircuitOpenError(f"{self.name}: circuit is open, upstream unavailable")
+            await asyncio.sleep(max(wait, 0.05))
+    
+    def record_success(self) -> None:
+        """Report a successful call."""
+        if self.state != "closed":
+            logger.info(f"{self.name}: upstream recovered, circuit closed")
+        self.state = "closed"
+        self.failures = 0
+        self._open_for = self.open_seconds
+        self._probe_running = False
+    
+    def record_failure(self) -> None:
+        """Report an upstream failure (connection error, timeout or 5xx)."""
+        self.failures += 1
+        if self.state == "half_open":
+            # Probe failed: stay open longer
+            self._open_for = min(self.max_open_seconds, self._open_for * 2)
+            self._open()
+        elif self.state == "closed" and self.failures >= self.failure_threshold:
+            self._open()
+    
+    def release(self) -> None:
+        """Report a call that ended without an upstream verdict (e.g. a 4xx), letting another probe through."""
+        self._probe_running = False
+    
+    def _open(self) -> None:
+        self.state = "open"
+        self.times_opened += 1
+        self._probe_running = False
+        self._opened_until = time.monotonic() + self._open_for
+        logger.warning(
+            f"{self.name}: {self.failures} consecutive upstream failures, "
+            f"pausing all requests for {self._open_for:.0f}s"
+        )
+
+
+async def retry_with_policy(
+    func: Callable[..., T],
+    *args,
+    classify: Callable[[Exception], str],
+    policies: Optional[Dict[str, RetryPolicy]] = None,
+    deadline_seconds: Optional[float] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    retry_after: Optional[Callable[[Exception], Optional[float]]] = None,
+    **kwargs
+) -> T:
+    """
+    Call async function, retrying failures with per-error-class backoff.
+    
+    Waiting is done with asyncio.sleep, so other requests keep running
+    while one is backing off.
+    
+    Args:
+        func: Async function to call
+        *args: Positional arguments for function
+        classify: Maps an exception to an error class ("connection", "timeout",
+            "server", "throttled", "client" or "other")
+        policies: Retry policy per error class (default from config)
+        deadline_seconds: Total time budget including waits (default from config)
+        breaker: Circuit breaker shared with other callers of the same upstream
+        retry_after: Extracts a server-requested delay (Retry-After) from an exception
+        **kwargs: Keyword arguments for function
+        
+    Returns:
+        Result of function call
+        
+    Raises:
+        Last exception when its policy has no attempts left or the deadline is reached;
+        CircuitOpenError if the circuit stays open past the deadline
+    """
+    if policies is None or deadline_seconds is None:
+        default_policies, default_deadline = load_retry_policies()
+        policies = policies or default_policies
+        deadline_seconds = deadline_seconds or default_deadline
+    
+    deadline = time.monotonic() + deadline_seconds
+    attempts: Dict[str, int] = {}
+    
+    while True:
+        if breaker:
+            await breaker.before_call(deadline)
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            # A cancelled probe must not leave the breaker waiting for its verdict
+            if breaker:
+                breaker.release()
+            raise
+        except Exception as e:
+            error_class = classify(e)
+            if breaker:
+                if error_class in UPSTREAM_FAILURES:
+                    breaker.record_failure()
+                else:
+                    breaker.release()
+            
+            attempts[error_class] = attempts.get(error_class, 0) + 1
+            policy = policies.get(error_class) or policies['other']
+            if attempts[error_class] >= policy.max_attempts:
+                if policy.max_attempts > 1:
+                    logger.error(f"All {policy.max_attempts} attempts failed ({error_class}). Last error: {e}")
+                raise
+            
+            delay = policy.delay(attempts[error_class])
+            requested = retry_after(e) if retry_after else None
+            if requested:
+                delay = max(delay, requested)
+            if time.monotonic() + delay >= deadline:
+                logger.error(f"Retry deadline of {deadline_seconds:.0f}s reached. Last error: {e}")
+                raise
+            
+            logger.warning(
+                f"Attempt {attempts[error_class]}/{policy.max_attempts} failed ({error_class}): {e}. "
+                f"Retrying in {delay:.1f} seconds..."
+            )
+            await asyncio.sleep(delay)
+            continue
+        
+        if breaker:
+            breaker.record_success()
+        if sum(attempts.values()):
+            logger.info(f"Retry successful on attempt {sum(attempts.values()) + 1}")
+        return result
@@ -0,0 +1,184 @@
+"""Bounded memoization of translate_field lookups with hit-rate counters."""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from app.utils.config import config
+from app.utils.translator import TRANSLATIONS_CN_RU, translate_field as _translate_field
+
+
+def dictionary_version(translations: Dict[str, str]) -> str:
+    """
+    Get a short fingerprint of a translation dictionary.
+
+    Cached translations are keyed by it, so entries made with an older
+    dictionary (e.g. before add_translations.py extended it) are not reused.
+
+    Args:
+        translations: Dictionary of source -> translated strings
+
+    Returns:
+        "<entries>-<sha1 prefix>"
+    """
+    digest = hashlib.sha1(
+        json.dumps(sorted(translations.items()), ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
+    return f"{len(translations)}-{digest[:12]}"
+
+
+class TranslationCache:
+    """LRU cache of translated strings that counts hits, misses and time saved."""
+
+    def __init__(self, maxsize: int = 100_000):
+        """
+        Initialize empty cache.
+
+        Args:
+            maxsize: Maximum number of cached strings (least recently used are evicted)
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[Hashable, str], Any]" = OrderedDict()
+        # Cost of misses over the cache lifetime (estimates time saved by a run without misses)
+        self._total_misses = 0
+        self._total_miss_seconds = 0.0
+        self.reset_stats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop all entries and zero the counters."""
+        self._entries.clear()
+        self._total_misses = 0
+        self._total_miss_seconds = 0.0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Zero the counters (entries are kept)."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.miss_seconds = 0.0
+
+    def lookup(self, text: str, version: Hashable, translate: Callable[[str], Any]) -> Any:
+        """
+        Get the translation of a string, calling translate only on a miss.
+
+        Args:
+            text: Source string
+            version: Dictionary version the translation depends on
+            translate: Uncached translation function
+
+        Returns:
+            Translated value
+        """
+        key = (version, text)
+        try:
+            value = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        started = time.perf_counter()
+        value = translate(text)
+        self._count_misses(1, time.perf_counter() - started)
+
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def take_stats(self) -> Dict[str, float]:
+        """
+        Get the counters and zero them (increments shipped from worker processes).
+
+        Returns:
+            Dictionary with hits, misses, evictions, miss_seconds
+        """
+        stats = {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'miss_seconds': self.miss_seconds,
+        }
+        self.reset_stats()
+        return stats
+
+    def add_stats(self, stats: Dict[str, float]) -> None:
+        """
+        Add counters taken from another process's cache.
+
+        Args:
+            stats: Dictionary returned by take_stats
+        """
+        self.hits += stats['hits']
+        self.evictions += stats['evictions']
+        self._count_misses(stats['misses'], stats['miss_seconds'])
+
+    def _count_misses(self, misses: int, seconds: float) -> None:
+        """Add misses and the time spent translating them."""
+        self.misses += misses
+        self.miss_seconds += seconds
+        self._total_misses += misses
+        self._total_miss_seconds += seconds
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Get hit rate and estimated time saved.
+
+        Time saved is the number of hits times the mean cost of a miss (over
+        the cache lifetime, so a run without misses is estimated too).
+
+        Returns:
+            Dictionary with hits, misses, evictions, entries, hit_rate (0..1),
+            miss_seconds, saved_seconds
+        """
+        lookups = self.hits + self.misses
+        mean_miss = self._total_miss_seconds / self._total_misses if self._total_misses else 0.0
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'miss_seconds': self.miss_seconds,
+            'saved_seconds': self.hits * mean_miss,
+        }
+
+
+# Per-process cache: each worker process fills its own and ships only counters back
+cache = TranslationCache(config.get('translation.cache_size', 100_000))
+
+DICTIONARY_VERSION = dictionary_version(TRANSLATIONS_CN_RU)
+
+
+def translate_field(value: Any) -> Any:
+    """
+    Translate a field like translator.translate_field, memoizing strings.
+
+    Dicts and lists (e.g. the configuration tree) are walked here: values are
+    translated recursively, keys are kept, and every string goes through the
+    cache. Other values are passed to the translator as they are.
+
+    Args:
+        value: String, dict or list to translate
+
+    Returns:
+        Translated value
+    """
+    if isinstance(value, str):
+        return cache.lookup(value, DICTIONARY_VERSION, _translate_field)
+    if isinstance(value, dict):
+        return {key: translate_field(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [translate_field(item) for item in value]
+    return _translate_field(value)
+
+
@@ -0,0 +1,124 @@
+"""Benchmark JSON codecs on recorded API pages: CPU time per 10k records."""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import requests
+
+from app.utils.che168_client import CHE168Client, REQUEST_HEADERS
+from app.utils.json_codec import CODECS, JsonCodec
+from app.utils.logger import logger
+
+
+def record_pages(pages_dir: Path, count: int) -> None:
+    """
+    Fetch /offers pages and store the raw response bodies.
+
+    Args:
+        pages_dir: Directory for page files
+        count: Number of pages to record
+    """
+    client = CHE168Client()
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    for page in range(1, count + 1):
+        # Keep the exact bytes the API returned, not a re-encoded copy
+        url = client._build_url(client._endpoint('offers'), client._offers_params(page))
+        response = requests.get(url, timeout=client.timeout, headers=REQUEST_HEADERS)
+        response.raise_for_status()
+        (pages_dir / f"offers_{page:05d}.json").write_bytes(response.content)
+        logger.info(f"Recorded page {page}/{count}")
+        time.sleep(1)
+
+
+def cpu_time(func: Callable[[], None], repeat: int) -> float:
+    """Run func repeat times and return CPU seconds per run."""
+    started = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - started) / repeat
+
+
+def measure(codec: JsonCodec, bodies: List[bytes], records: List[dict], repeat: int) -> Dict[str, float]:
+    """
+    Measure CPU time of the three JSON hot paths with one codec.
+
+    Returns:
+        Dictionary of path -> CPU seconds per run over all records
+    """
+    encoded = [codec.dumps(record.get('data', {})) for record in records]
+    return {
+        'decode_response': cpu_time(lambda: [codec.loads(body) for body in bodies], repeat),
+        'encode_jsonb': cpu_time(lambda: [codec.dumps(record.get('data', {})) for record in records], repeat),
+        'decode_jsonb': cpu_time(lambda: [codec.loads(text) for text in encoded], repeat),
+    }
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark JSON codecs on recorded CHE168 pages')
+    parser.add_argument(
+        '--pages-dir',
+        type=Path,
+        required=True,
+        help='Directory with recorded page responses (*.json)'
+    )
+    parser.add_argument(
+        '--record',
+        type=int,
+        default=0,
+        help='Fetch and store this many /offers pages into --pages-dir first'
+    )
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (default: 5)')
+    args = parser.parse_args()
+
+    if args.record:
+        record_pages(args.pages_dir, args.record)
+
+    bodies = [path.read_bytes() for path in sorted(args.pages_dir.glob('*.json'))]
+    if not bodies:
+        logger.error(f"No recorded pages in {args.pages_dir}, use --record N")
+        return 1
+
+    baseline = CODECS['json']
+    records = [record for body in bodies for record in (baseline.loads(body).get('result') or [])]
+    if not records:
+        logger.error("Recorded pages contain no records")
+        return 1
+
+    scale = 10000 / len(records)
+    logger.info("=" * 60)
+    logger.info(
+        f"{len(bodies)} pages, {len(records)} records, "
+        f"{sum(len(body) for body in bodies) / len(bodies) / 1024:.0f} KB per page"
+    )
+    logger.info(f"CPU ms per 10k records (codecs: {', '.join(CODECS)})")
+    logger.info("=" * 60)
+
+    results = {name: measure(codec, bodies, records, args.repeat) for name, codec in CODECS.items()}
+    for path in results['json']:
+        line = ' | '.join(
+            f"{name}: {results[name][path] * scale * 1000:9.1f}" for name in results
+        )
+        logger.info(f"{path:<16} {line}")
+
+    logger.info("=" * 60)
+    base_total = sum(results['json'].values()) * scale * 1000
+    for name, values in results.items():
+        if name == 'json':
+            continue
+        total = sum(values.values()) * scale * 1000
+        logger.info(
+            f"{name}: {total:.1f} ms vs json {base_total:.1f} ms per 10k records, "
+            f"saves {base_total - total:.1f} ms CPU (x{base_total / total:.1f})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
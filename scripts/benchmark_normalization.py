@@ -0,0 +1,136 @@
+"""Benchmark normalization CPU throughput with 1..N worker processes (no database needed)."""
+
+import os
+import sys
+import argparse
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Add parent directory to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from app.normalizers.record_normalizer import normalize_batch, normalize_batch_in_worker
+from app.utils.translation_cache import cache
+from app.utils.config import config
+from app.utils import json_codec
+from app.utils.logger import logger
+
+
+def load_records(args: argparse.Namespace) -> List[Tuple[str, Dict[str, Any]]]:
+    """Get (inner_id, data) pairs from recorded pages or the mock dataset."""
+    if args.pages_dir:
+        records = []
+        for path in sorted(args.pages_dir.glob('*.json')):
+            for record in json_codec.loads(path.read_bytes()).get('result') or []:
+                records.append((record.get('inner_id'), record.get('data', {})))
+        return records[:args.records]
+
+    from mock_che168_server import MockDataset
+    dataset = MockDataset(listings=args.records, changes_per_day=0, days=1)
+    return [(listing['inner_id'], listing) for listing in map(dataset.listing, range(args.records))]
+
+
+def run(records: List[Tuple[str, Dict[str, Any]]], workers: int, chunk_size: int) -> float:
+    """
+    Normalize all records like DataNormalizer and return wall seconds.
+
+    Only the CPU part is measured: batches are split between the workers and
+    two batches are kept in flight, as in stream mode, but the database reads
+    and writes that DataNormalizer overlaps with them are not simulated, so
+    the speedup of a real run is lower.
+
+    The translation cache starts empty in every run; its counters (workers
+    included) are left in translation_cache.cache.
+
+    Args:
+        records: (inner_id, data) pairs
+        workers: Worker processes (1: inline, like DataNormalizer without a pool)
+        chunk_size: Records per DB batch (split between the workers)
+    """
+    batches = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    cache.clear()
+    if workers == 1:
+        started = time.perf_counter()
+        for batch in batches:
+            normalize_batch(batch)
+        return time.perf_counter() - started
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        # Warm up: workers import the translator before timing starts
+        list(pool.map(normalize_batch, [records[:1]] * workers))
+        started = time.perf_counter()
+        in_flight = deque()
+        for batch in batches:
+            size = -(-len(batch) // workers)
+            in_flight.append([
+                pool.submit(normalize_batch_in_worker, batch[i:i + size]) for i in range(0, len(batch), size)
+            ])
+            if len(in_flight) == 2:
+                for future in in_flight.popleft():
+                    cache.add_stats(future.result()[1])
+        for futures in in_flight:
+            for future in futures:
+                cache.add_stats(future.result()[1])
+        return time.perf_counter() - started
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark DataNormalizer CPU work with worker processes')
+    parser.add_argument('--records', type=int, default=20000, help='Records to normalize (default: 20000)')
+    parser.add_argument(
+        '--pages-dir',
+        type=Path,
+        default=None,
+        help='Recorded /offers pages (*.json, see benchmark_json_codec.py); default: mock dataset'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        nargs='+',
+        default=None,
+        help='Worker counts to measure (default: 1 2 4 ... up to the CPU count)'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=config.get_batch_config().get('normalization_size', 200),
+        help='Records per batch (default: batch.normalization_size from config)'
+    )
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = args.workers or sorted({1, cpus} | {2 ** n for n in range(1, cpus.bit_length()) if 2 ** n <= cpus})
+
+    records = load_records(args)
+    if not records:
+        logger.error("No records to normalize")
+        return 1
+
+    logger.info("=" * 60)
+    logger.info(f"{len(records):,} records, batch size {args.batch_size}, {cpus} CPU cores")
+    logger.info("=" * 60)
+
+    baseline = None
+    for workers in counts:
+        seconds = run(records, workers, args.batch_size)
+        rate = len(records) / seconds
+        baseline = baseline or rate
+        translations = cache.summary()
+        logger.info(
+            f"{workers:>3} worker(s): {seconds:7.2f}s | {rate:9,.0f} records/s | "
+            f"x{rate / baseline:.2f} (ideal x{workers / counts[0]:.0f}) | "
+            f"translation cache hit rate {translations['hit_rate']:.1%}"
+        )
+    logger.info("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
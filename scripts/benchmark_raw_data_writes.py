@@ -0,0 +1,178 @@
+"""Benchmark per-page DB time of raw_data writes: per-record ORM path vs set-based path."""
+
+import asyncio
+import random
+import statistics
+import sys
+import argparse
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, select
+
+from app.database.connection import AsyncSessionLocal, close_db
+from app.database.models import RawData
+from app.loaders.daily_updater import DailyUpdater
+from app.loaders.raw_data_writer import build_row, insert_missing
+from app.utils.json_merger import merge_json
+from app.utils.logger import logger
+
+
+def make_offer(inner_id: str) -> Dict[str, Any]:
+    """Build a synthetic offer of realistic size."""
+    return {
+        'inner_id': inner_id,
+        'change_type': 'added',
+        'created_at': '2025-04-29T08:15:22.340+03:00',
+        'data': {
+            'inner_id': inner_id,
+            'url': f'https://www.che168.com/dealer/527477/{inner_id}.html',
+            'mark': random.choice(['Kia', 'BMW', 'Audi', 'Toyota']),
+            'model': 'K2',
+            'year': random.randint(2005, 2024),
+            'price': random.randint(5000, 500000),
+            'km_age': random.randint(0, 300000),
+            'description': '杜绝重大事故泡水火烧车' * 10,
+            'images': [f'https://2sc2.autoimg.cn/{i}.jpg' for i in range(15)],
+            'configuration': {
+                'paramtypeitems': [
+                    {'paramitems': [{'id': i, 'name': f'参数{i}', 'value': f'值{i}'} for i in range(40)]}
+                    for _ in range(5)
+                ]
+            },
+        },
+    }
+
+
+def make_change(inner_id: str) -> Dict[str, Any]:
+    """Build a synthetic change event for an existing listing."""
+    if random.random() < 0.8:
+        return {
+            'inner_id': inner_id,
+            'change_type': 'changed',
+            'created_at': '2025-04-30T14:28:11.560+03:00',
+            'data': {'new_price': random.randint(5000, 500000)},
+        }
+    return {'inner_id': inner_id, 'change_type': 'removed', 'created_at': None, 'data': {}}
+
+
+async def legacy_save_page(records: List[Dict[str, Any]]) -> None:
+    """Previous InitialLoader._save_page: one SELECT per record, then ORM add."""
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as session:
+        for record in records:
+            existing = await session.execute(
+                select(RawData).where(RawData.inner_id == record['inner_id'])
+            )
+            if existing.scalar_one_or_none():
+                continue
+            session.add(RawData(**build_row(record, 'benchmark', now)))
+        await session.commit()
+
+
+async def bulk_save_page(records: List[Dict[str, Any]]) -> None:
+    """Set-based InitialLoader path: one INSERT ... ON CONFLICT DO NOTHING."""
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as session:
+        await insert_missing(session, [build_row(record, 'benchmark', now) for record in records])
+        await session.commit()
+
+
+async def legacy_save_changes(records: List[Dict[str, Any]]) -> None:
+    """Previous DailyUpdater._save_changes for changed/removed events: SELECT + ORM update per record."""
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as session:
+        for record in records:
+            existing = await session.execute(
+                select(RawData).where(RawData.inner_id == record['inner_id'])
+            )
+            existing_record = existing.scalar_one_or_none()
+            if not existing_record:
+                continue
+            if record['change_type'] == 'changed':
+                existing_record.data = merge_json(existing_record.data or {}, record['data'])
+            else:
+                existing_record.active_status = 1
+            existing_record.change_type = record['change_type']
+            existing_record.last_updated_at = now
+            existing_record.is_processed = False
+        await session.commit()
+
+
+async def measure(label: str, pages: List[List[Dict[str, Any]]], save: Callable) -> List[float]:
+    """Run save for every page and collect per-page wall time in milliseconds."""
+    timings = []
+    for page in pages:
+        started = time.perf_counter()
+        await save(page)
+        timings.append((time.perf_counter() - started) * 1000)
+    logger.info(
+        f"{label:<28} pages={len(timings)} "
+        f"mean={statistics.mean(timings):.1f}ms "
+        f"median={statistics.median(timings):.1f}ms "
+        f"p95={sorted(timings)[int(len(timings) * 0.95) - 1]:.1f}ms"
+    )
+    return timings
+
+
+async def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark raw_data write paths against the configured database')
+    parser.add_argument('--pages', type=int, default=50, help='Pages per scenario (default: 50)')
+    parser.add_argument('--page-size', type=int, default=20, help='Records per page (default: 20)')
+    args = parser.parse_args()
+
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    size = args.page_size
+
+    def pages_of(kind: str, make: Callable) -> List[List[Dict[str, Any]]]:
+        return [
+            [make(f"{prefix}-{kind}-{p * size + i}") for i in range(size)]
+            for p in range(args.pages)
+        ]
+
+    legacy_pages = pages_of('legacy', make_offer)
+    bulk_pages = pages_of('bulk', make_offer)
+    updater = DailyUpdater()
+
+    try:
+        logger.info("=" * 60)
+        logger.info(f"Benchmark: {args.pages} pages x {size} records per scenario")
+        logger.info("=" * 60)
+
+        legacy_insert = await measure("insert: per-record", legacy_pages, legacy_save_page)
+        bulk_insert = await measure("insert: set-based", bulk_pages, bulk_save_page)
+        # Re-sending the same pages measures the duplicate path
+        await measure("duplicates: per-record", legacy_pages, legacy_save_page)
+        await measure("duplicates: set-based", bulk_pages, bulk_save_page)
+
+        legacy_changes = [[make_change(r['inner_id']) for r in page] for page in legacy_pages]
+        bulk_changes = [[make_change(r['inner_id']) for r in page] for page in bulk_pages]
+        legacy_update = await measure("changes: per-record", legacy_changes, legacy_save_changes)
+        bulk_update = await measure("changes: set-based", bulk_changes, updater._save_changes)
+
+        logger.info("=" * 60)
+        logger.info(
+            f"Speedup (median per page): "
+            f"insert x{statistics.median(legacy_insert) / statistics.median(bulk_insert):.1f}, "
+            f"changes x{statistics.median(legacy_update) / statistics.median(bulk_update):.1f}"
+        )
+        logger.info("=" * 60)
+        return 0
+
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(RawData).where(RawData.inner_id.like(f"{prefix}-%")))
+            await session.commit()
+        await close_db()
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -27,6 +27,7 @@ async def main():
         if state:
             print(f"Last successful date: {state.last_successful_date}")
             print(f"Last change_id: {state.last_change_id}")
+            print(f"Next change_id (resume cursor): {state.next_change_id}")
             print(f"Updated at: {state.updated_at}")
         else:
             print("No sync state found (first run)")
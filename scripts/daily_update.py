@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.loaders.daily_updater import DailyUpdater
 from app.normalizers.data_normalizer import DataNormalizer
+from app.utils.che168_replay_client import ReplayCHE168Client
 from app.utils.logger import logger
 from app.utils.single_instance import SingleInstance
 
@@ -21,13 +22,22 @@ async def main():
         '--max-dates',
         type=int,
         default=None,
-        help='Maximum number of dates to process (for testing). Default: unlimited'
+        help='Maximum number of dates to process in this run. Default: all missed dates up to yesterday'
     )
     parser.add_argument(
         '--start-date',
         type=str,
         default=None,
-        help='Start date for processing (format: YYYY-MM-DD). Default: yesterday'
+        help='Start date for processing (format: YYYY-MM-DD). Default: day after the last processed date'
+    )
+    parser.add_argument(
+        '--replay',
+        type=Path,
+        default=None,
+        metavar='ARCHIVE_DIR',
+        help='Re-apply archived /changes responses from this directory instead of the API. '
+             'Requires --start-date: dates from it to yesterday are applied again even if '
+             'already processed (sync_state is not changed)'
     )
     parser.add_argument(
         '--skip-normalization',
@@ -42,6 +52,9 @@ async def main():
     )
     
     args = parser.parse_args()
+    if args.replay and not args.start_date:
+        # Without a start date a caught-up updater has no pending dates to replay
+        parser.error('--replay requires --start-date')
     
     # Parse start_date if provided
     start_date = None
@@ -59,12 +72,23 @@ async def main():
             logger.info("=" * 60)
             logger.info("Starting daily data update")
             if args.max_dates:
-                logger.info(f"TEST MODE: Limited to {args.max_dates} date(s)")
+                logger.info(f"Limited to {args.max_dates} date(s)")
             if start_date:
                 logger.info(f"Start date specified: {start_date}")
+            if args.replay:
+                logger.info(f"REPLAY MODE: changes from archive {args.replay}")
             logger.info("=" * 60)
             
-            updater = DailyUpdater(max_dates=args.max_dates, start_date=start_date)
+            client = None
+            if args.replay:
+                client = ReplayCHE168Client(args.replay, endpoints=['change_id', 'changes'])
+            
+            updater = DailyUpdater(
+                max_dates=args.max_dates,
+                start_date=start_date,
+                client=client,
+                reapply=args.replay is not None
+            )
             stats = await updater.update()
             
             logger.info("=" * 60)
@@ -0,0 +1,197 @@
+"""Script for importing the daily CSV exports."""
+
+import asyncio
+import os
+import sys
+import argparse
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import requests
+
+from app.loaders.csv_importer import EXPORT_KINDS, CsvImporter
+from app.utils.config import config, env_config
+from app.utils.logger import logger
+from app.utils.single_instance import SingleInstance
+
+
+def export_snapshot_time(last_modified: Optional[str], date: str) -> datetime:
+    """
+    Get the time an export was taken (naive UTC).
+
+    The download time says nothing about it, so the Last-Modified header is
+    used, or the start of the export date if the header is missing or invalid.
+
+    Args:
+        last_modified: Last-Modified response header
+        date: Export date (YYYY-MM-DD)
+
+    Returns:
+        Snapshot time
+    """
+    if last_modified:
+        try:
+            modified = parsedate_to_datetime(last_modified)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid Last-Modified header: {last_modified}")
+        else:
+            # "-0000" zone gives a naive datetime, already in UTC
+            return modified.astimezone(timezone.utc).replace(tzinfo=None) if modified.tzinfo else modified
+    return datetime.strptime(date, '%Y-%m-%d')
+
+
+def download_export(date: str, file_name: str) -> Tuple[Path, datetime]:
+    """
+    Download a daily export into csv_import.download_dir.
+
+    The file's modification time is set to the snapshot time, so a later
+    import with --file sees it too.
+
+    Args:
+        date: Export date (YYYY-MM-DD)
+        file_name: File name of the export
+
+    Returns:
+        Tuple of (path of the downloaded file, snapshot time from export_snapshot_time)
+    """
+    import_config = config.get('csv_import', {})
+    url = import_config.get('export_url', "https://{access_name}.auto-parser.ru/{date}/{file_name}").format(
+        access_name=env_config.get_che168_access_name(), date=date, file_name=file_name
+    )
+    path = Path(import_config.get('download_dir', 'data/exports')) / date / file_name
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    logger.info(f"Downloading {url} to {path}")
+    login, password = env_config.get_che168_export_auth()
+    with requests.get(url, auth=(login, password) if login else None, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        snapshot_at = export_snapshot_time(response.headers.get('Last-Modified'), date)
+        partial = path.with_name(path.name + '.part')
+        with open(partial, 'wb') as f:
+            for block in response.iter_content(chunk_size=1 << 20):
+                f.write(block)
+    timestamp = snapshot_at.replace(tzinfo=timezone.utc).timestamp()
+    os.utime(partial, (timestamp, timestamp))
+    partial.replace(path)
+    logger.info(f"Export snapshot time: {snapshot_at.isoformat()} UTC")
+    return path, snapshot_at
+
+
+async def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Import a daily CSV export into raw_data')
+    parser.add_argument(
+        '--file',
+        type=Path,
+        default=None,
+        help='Locally stored export (|-delimited CSV, may be .gz)'
+    )
+    parser.add_argument(
+        '--date',
+        default=None,
+        help='Download the export of this date (YYYY-MM-DD) first, requires --file-name'
+    )
+    parser.add_argument(
+        '--file-name',
+        default=None,
+        help='File name of the export to download'
+    )
+    parser.add_argument(
+        '--kind',
+        choices=EXPORT_KINDS,
+        default='active',
+        help='active: all active listings (default); sold: listings sold during the previous day'
+    )
+    parser.add_argument(
+        '--reconcile',
+        action='store_true',
+        help='Mark active listings missing from an active export as removed'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=None,
+        help='Records per write batch (default from config)'
+    )
+    parser.add_argument(
+        '--snapshot-time',
+        type=datetime.fromisoformat,
+        default=None,
+        help='UTC time the export was taken (default: Last-Modified of a downloaded export, '
+             'otherwise file modification time); listings updated later are not reconciled away'
+    )
+
+    args = parser.parse_args()
+
+    if bool(args.file) == bool(args.date):
+        logger.error("Use either --file or --date with --file-name")
+        return 1
+    if args.date and not args.file_name:
+        logger.error("--date requires --file-name")
+        return 1
+    if args.reconcile and args.kind != 'active':
+        logger.error("--reconcile requires --kind active")
+        return 1
+
+    # Check for single instance
+    with SingleInstance("import_csv"):
+        try:
+            snapshot_at = args.snapshot_time
+            if args.file:
+                path = args.file
+            else:
+                path, downloaded_at = download_export(args.date, args.file_name)
+                snapshot_at = snapshot_at or downloaded_at
+            if not path.exists():
+                logger.error(f"File not found: {path}")
+                return 1
+
+            logger.info("=" * 60)
+            logger.info(f"Starting CSV import: {path} ({args.kind})")
+            if args.reconcile:
+                logger.info("RECONCILE MODE: active listings missing from the export will be marked removed")
+            logger.info("=" * 60)
+
+            importer = CsvImporter(
+                path,
+                kind=args.kind,
+                reconcile=args.reconcile,
+                chunk_size=args.chunk_size,
+                snapshot_at=snapshot_at
+            )
+            stats = await importer.load()
+
+            logger.info("=" * 60)
+            logger.info("CSV import completed successfully!")
+            logger.info(f"Statistics:")
+            logger.info(f"  - Records read: {stats['total_records']}")
+            logger.info(f"  - New listings: {stats['total_loaded']}")
+            logger.info(f"  - Updated listings: {stats['total_updated']}")
+            logger.info(f"  - Unchanged listings: {stats['total_unchanged']}")
+            logger.info(f"  - Removed listings: {stats['total_removed']}")
+            if args.reconcile:
+                logger.info(f"  - Removed by reconciliation: {stats['total_reconciled']}")
+            logger.info(f"  - Records skipped: {stats['total_skipped']}")
+            logger.info(f"  - Errors: {stats['total_errors']}")
+            for stage, values in stats['stages'].items():
+                logger.info(f"  - {stage}: {values['rows_per_sec']:,.1f} rows/s ({values['rows']:,} rows)")
+            logger.info("=" * 60)
+
+            return 1 if stats['total_errors'] else 0
+
+        except KeyboardInterrupt:
+            logger.warning("Interrupted by user")
+            return 1
+        except Exception as e:
+            logger.error(f"Fatal error: {e}", exc_info=True)
+            return 1
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -9,6 +9,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.loaders.initial_loader import InitialLoader
+from app.utils.che168_replay_client import ReplayCHE168Client
 from app.utils.logger import logger
 from app.utils.single_instance import SingleInstance
 
@@ -22,19 +23,106 @@ async def main():
         default=None,
         help='Maximum number of pages to load (for testing). Default: unlimited'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=None,
+        help='Number of page requests in flight (default from config)'
+    )
+    parser.add_argument(
+        '--ingest-mode',
+        choices=['insert', 'copy'],
+        default='insert',
+        help='insert: INSERT per page (default); copy: binary COPY into an unlogged staging table, '
+             'merged into raw_data at checkpoint boundaries (full reloads, disaster recovery)'
+    )
+    parser.add_argument(
+        '--replay',
+        type=Path,
+        default=None,
+        metavar='ARCHIVE_DIR',
+        help='Load archived /offers responses from this directory instead of the API'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue from the checkpoints of the previous run (committed pages are not fetched again)'
+    )
+    parser.add_argument(
+        '--sharded',
+        action='store_true',
+        help='Split the catalogue into filter shards (mark x year band x price) and load them in parallel'
+    )
+    parser.add_argument(
+        '--plan-file',
+        type=Path,
+        default=None,
+        help='Shard plan JSON file: read if it exists, otherwise written after planning'
+    )
+    parser.add_argument(
+        '--shard',
+        action='append',
+        default=None,
+        dest='shards',
+        metavar='KEY',
+        help='Load only the shard with this key (repeatable, e.g. to retry failed shards)'
+    )
+    parser.add_argument(
+        '--worker-index',
+        type=int,
+        default=0,
+        help='Index of this worker when shards are spread across machines (0-based)'
+    )
+    parser.add_argument(
+        '--worker-count',
+        type=int,
+        default=1,
+        help='Total number of workers sharing the shard plan'
+    )
     
     args = parser.parse_args()
     
-    # Check for single instance
-    with SingleInstance("initial_load"):
+    if not 0 <= args.worker_index < args.worker_count:
+        logger.error("--worker-index must be in range [0, --worker-count)")
+        return 1
+    if (args.shards or args.plan_file or args.worker_count > 1) and not args.sharded:
+        logger.error("--shard, --plan-file and --worker-count require --sharded")
+        return 1
+    
+    # Check for single instance (workers on one machine need separate locks)
+    lock_name = "initial_load" if args.worker_count == 1 else f"initial_load_{args.worker_index}"
+    with SingleInstance(lock_name):
         try:
             logger.info("=" * 60)
             logger.info("Starting initial data load")
             if args.max_pages:
                 logger.info(f"TEST MODE: Limited to {args.max_pages} pages")
+            if args.resume:
+                logger.info("RESUME MODE: continuing from stored checkpoints")
+            if args.ingest_mode == 'copy':
+                logger.info("COPY INGEST MODE: pages are staged and merged into raw_data in batches")
+            if args.replay:
+                logger.info(f"REPLAY MODE: responses from archive {args.replay}")
+            if args.sharded:
+                logger.info(f"SHARDED MODE: worker {args.worker_index + 1}/{args.worker_count}")
             logger.info("=" * 60)
             
-            loader = InitialLoader(max_pages=args.max_pages)
+            client = None
+            if args.replay:
+                client = ReplayCHE168Client(args.replay, endpoints=['offers', 'filters'])
+            
+            loader = InitialLoader(
+                max_pages=args.max_pages,
+                concurrency=args.concurrency,
+                sharded=args.sharded,
+                shard_keys=args.shards,
+                worker_index=args.worker_index,
+                worker_count=args.worker_count,
+                plan_file=args.plan_file,
+                resume=args.resume,
+                ingest_mode=args.ingest_mode,
+                client=client
+            )
             stats = await loader.load()
             
             logger.info("=" * 60)
@@ -44,9 +132,19 @@ async def main():
             logger.info(f"  - Records loaded: {stats['total_loaded']}")
             logger.info(f"  - Records skipped (duplicates): {stats['total_skipped']}")
             logger.info(f"  - Errors: {stats['total_errors']}")
+            if stats['failed_shards']:
+                logger.info(f"  - Failed shards: {len(stats['failed_shards'])}")
+            if stats['request_rate']:
+                rate = stats['request_rate']
+                logger.info(
+                    f"  - Request rate: {rate['rate']:.2f} req/s at the end "
+                    f"({rate['decreases']} slowdowns, {rate['throttled']} Retry-After)"
+                )
+            for stage, values in stats['stages'].items():
+                logger.info(f"  - {stage}: {values['rows_per_sec']:,.1f} rows/s ({values['rows']:,} rows)")
             logger.info("=" * 60)
             
-            return 0
+            return 1 if stats['failed_shards'] else 0
             
         except KeyboardInterrupt:
             logger.warning("Interrupted by user")
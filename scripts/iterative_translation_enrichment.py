@@ -35,9 +35,9 @@ async def reset_is_processed():
         )
         processed_count = len(result.scalars().all())
         
-        # Сбрасываем флаг
+        # Сбрасываем флаг (pending_fields = NULL: полная нормализация, а не только изменённых полей)
         await session.execute(
-            update(RawData).values(is_processed=False)
+            update(RawData).values(is_processed=False, pending_fields=None)
         )
         await session.commit()
         
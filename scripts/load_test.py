@@ -0,0 +1,214 @@
+"""End-to-end load test of the loaders and the normalizer against the mock CHE168 API."""
+
+import os
+import sys
+import argparse
+import asyncio
+import socket
+import subprocess
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Add parent directory to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.utils.logger import logger
+
+
+def wait_for_port(host: str, port: int, timeout: float) -> bool:
+    """Wait until a TCP port accepts connections."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+
+def start_mock_server(args: argparse.Namespace) -> subprocess.Popen:
+    """Start scripts/mock_che168_server.py as a subprocess."""
+    command = [
+        sys.executable, str(ROOT / 'scripts' / 'mock_che168_server.py'),
+        '--port', str(args.port),
+        '--listings', str(args.listings),
+        '--changes-per-day', str(args.changes_per_day),
+        '--days', str(args.days),
+        '--latency-ms', str(args.latency_ms),
+        '--jitter-ms', str(args.jitter_ms),
+        '--error-rate', str(args.error_rate),
+        '--throttle-rate', str(args.throttle_rate),
+    ]
+    return subprocess.Popen(command, cwd=ROOT)
+
+
+def report_phase(name: str, seconds: float, pages: int, rows: int, latency) -> Dict[str, Any]:
+    """Log and return throughput and latency of one phase."""
+    result = {
+        'seconds': seconds,
+        'pages': pages,
+        'rows': rows,
+        'pages_per_sec': pages / seconds if seconds else 0.0,
+        'rows_per_sec': rows / seconds if seconds else 0.0,
+        'latency': latency.summary() if latency else {},
+    }
+    logger.info(
+        f"{name}: {seconds:.1f}s | {result['pages_per_sec']:,.1f} pages/s | "
+        f"{result['rows_per_sec']:,.1f} rows/s ({rows:,} rows)"
+    )
+    for endpoint, values in result['latency'].items():
+        logger.info(
+            f"  /{endpoint}: {values['count']:,} requests, {values['failures']} failed | "
+            f"p50 {values['p50']:.1f} ms | p95 {values['p95']:.1f} ms | p99 {values['p99']:.1f} ms | "
+            f"max {values['max']:.1f} ms"
+        )
+    return result
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the selected phases and return their results."""
+    # Imported here: the database engine is created from DB_NAME set in main()
+    from app.loaders.daily_updater import DailyUpdater
+    from app.loaders.initial_loader import InitialLoader
+    from app.utils.che168_async_client import AsyncCHE168Client
+    from app.utils.metrics import LatencyRecorder
+
+    def make_client(latency: LatencyRecorder) -> AsyncCHE168Client:
+        client = AsyncCHE168Client(latency=latency)
+        if not args.throttled:
+            # Measure the loaders, not the production request budget
+            client.rate_limited = False
+        return client
+
+    results: Dict[str, Any] = {}
+
+    if 'initial' in args.phases:
+        latency = LatencyRecorder()
+        loader = InitialLoader(
+            max_pages=args.max_pages,
+            concurrency=args.concurrency,
+            sharded=args.sharded,
+            ingest_mode=args.ingest_mode,
+            client=make_client(latency)
+        )
+        started = time.perf_counter()
+        stats = await loader.load()
+        results['initial_load'] = report_phase(
+            "Initial load", time.perf_counter() - started,
+            stats['total_pages'], stats['total_loaded'] + stats['total_skipped'], latency
+        )
+
+    if 'daily' in args.phases:
+        latency = LatencyRecorder()
+        updater = DailyUpdater(
+            start_date=date.today() - timedelta(days=args.days),
+            client=make_client(latency),
+            reapply=True
+        )
+        started = time.perf_counter()
+        stats = await updater.update()
+        rows = stats['total_loaded'] + stats['total_updated'] + stats['total_removed'] + stats['total_duplicates']
+        results['daily_update'] = report_phase(
+            "Daily update", time.perf_counter() - started,
+            latency.count('changes'), rows, latency
+        )
+
+    if 'normalize' in args.phases:
+        try:
+            from app.normalizers.data_normalizer import DataNormalizer
+        except ImportError as e:
+            logger.warning(f"Normalizer phase skipped, cannot import DataNormalizer: {e}")
+        else:
+            normalizer = DataNormalizer()
+            started = time.perf_counter()
+            stats = await normalizer.normalize(limit=args.normalize_limit)
+            results['normalize'] = report_phase(
+                "Normalization", time.perf_counter() - started,
+                stats['total_batches'], stats['total_processed'], None
+            )
+
+    return results
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Load test InitialLoader, DailyUpdater and DataNormalizer against the mock CHE168 API'
+    )
+    parser.add_argument(
+        '--db-name',
+        required=True,
+        help='Scratch database (must differ from DB_NAME in .env; tables are written to)'
+    )
+    parser.add_argument('--migrate', action='store_true', help='Run alembic upgrade head on the scratch database first')
+    parser.add_argument(
+        '--phases',
+        nargs='+',
+        choices=['initial', 'daily', 'normalize'],
+        default=['initial', 'daily', 'normalize'],
+        help='Phases to run (default: all)'
+    )
+    parser.add_argument('--base-url', default=None, help='Use an already running mock server at this URL')
+    parser.add_argument('--port', type=int, default=8765, help='Port of the started mock server (default: 8765)')
+    parser.add_argument('--listings', type=int, default=250_000, help='Mock listings (default: 250000)')
+    parser.add_argument('--changes-per-day', type=int, default=15_000, help='Mock changes per day (default: 15000)')
+    parser.add_argument('--days', type=int, default=1, help='Days of mock change feed; all are applied (default: 1)')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Mock mean response latency (default: 50)')
+    parser.add_argument('--jitter-ms', type=float, default=20.0, help='Mock latency spread (default: 20)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of mock responses with 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of mock responses with 429')
+    parser.add_argument('--max-pages', type=int, default=None, help='Limit initial load pages')
+    parser.add_argument('--concurrency', type=int, default=None, help='Initial load page requests in flight')
+    parser.add_argument('--sharded', action='store_true', help='Sharded initial load')
+    parser.add_argument('--ingest-mode', choices=['insert', 'copy'], default='insert', help='Initial load ingest mode')
+    parser.add_argument('--normalize-limit', type=int, default=None, help='Limit normalized records')
+    parser.add_argument(
+        '--throttled',
+        action='store_true',
+        help='Keep the production request budget (default: requests are not throttled)'
+    )
+    args = parser.parse_args()
+
+    if args.db_name == os.getenv('DB_NAME', 'che168_db'):
+        print(f"Refusing to load test the configured database {args.db_name}, use a scratch database", file=sys.stderr)
+        return 1
+
+    os.environ['DB_NAME'] = args.db_name
+    os.environ['CHE168_BASE_URL'] = args.base_url or f"http://127.0.0.1:{args.port}"
+    if not os.getenv('CHE168_API_KEY'):
+        os.environ['CHE168_API_KEY'] = 'load-test'
+
+    if args.migrate:
+        logger.info(f"Migrating scratch database {args.db_name}")
+        subprocess.run([sys.executable, '-m', 'alembic', 'upgrade', 'head'], cwd=ROOT, check=True)
+
+    server: Optional[subprocess.Popen] = None
+    try:
+        if args.base_url is None:
+            server = start_mock_server(args)
+            # Generating the dataset takes a few seconds per 100k listings
+            if not wait_for_port('127.0.0.1', args.port, timeout=120):
+                logger.error("Mock server did not start")
+                return 1
+
+        logger.info("=" * 60)
+        logger.info(f"Load test against {os.environ['CHE168_BASE_URL']}, database {args.db_name}")
+        logger.info("=" * 60)
+        results = asyncio.run(run(args))
+        logger.info("=" * 60)
+        return 0 if results else 1
+    except KeyboardInterrupt:
+        logger.warning("Interrupted by user")
+        return 1
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
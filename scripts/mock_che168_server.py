@@ -0,0 +1,392 @@
+"""Local stand-in for the CHE168 API (load tests without spending API quota)."""
+
+import sys
+import argparse
+import asyncio
+import random
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aiohttp import web
+
+from app.utils import json_codec
+from app.utils.logger import logger
+
+
+PAGE_SIZE = 20
+FIRST_INNER_ID = 50_000_000
+FIRST_CHANGE_ID = 1_000_000
+
+MARKS = {
+    'BMW': ['3 серии', '5 серии', 'X1', 'X3', 'X5'],
+    'Audi': ['A4', 'A6', 'Q3', 'Q5', 'Q7'],
+    'Toyota': ['Camry', 'Corolla', 'RAV4', 'Highlander'],
+    'Honda': ['Accord', 'Civic', 'CR-V', 'Fit'],
+    'Volkswagen': ['Passat', 'Golf', 'Tiguan', 'Magotan', 'Lavida'],
+    'Mercedes-Benz': ['C-Class', 'E-Class', 'GLC', 'GLE'],
+    'Nissan': ['Sylphy', 'Teana', 'X-Trail', 'Qashqai'],
+    'Buick': ['Excelle', 'LaCrosse', 'Regal', 'GL8'],
+    'BYD': ['Han', 'Tang', 'Song', 'Qin'],
+    'Kia': ['K2', 'K3', 'K5', 'Sportage'],
+    'Geely': ['Emgrand', 'Boyue', 'Coolray'],
+    'Chery': ['QQ3', 'Tiggo 7', 'Arrizo 5'],
+}
+MARK_NAMES = sorted(MARKS)
+MARK_WEIGHTS = [len(name) + 3 for name in MARK_NAMES]  # Uneven mark sizes, like the real catalogue
+TRANSMISSIONS = ['Автоматическая', 'Механическая']
+COLORS = ['Белый', 'Черный', 'Серебристо-серый', 'Темно-серый', 'Синий', 'Красный', 'Шампань']
+BODY_TYPES = ['Седан', 'Кроссовер/внедорожник', 'Хэтчбек', 'Минивэн', 'Купе/родстер']
+ENGINE_TYPES = ['Бензиновый', 'Дизельный', 'Гибридный (HEV)', 'Электрический (BEV)', 'Подключаемый гибрид (PHEV)']
+CITIES = ['Цзыбо', 'Пекин', 'Шанхай', 'Гуанчжоу', 'Шэньчжэнь', 'Чэнду', 'Ухань', 'Ханчжоу']
+DESCRIPTION = "杜绝重大事故泡水火烧车,支持第三方检测,手续齐全,可分期付款。"
+
+
+class MockDataset:
+    """
+    Deterministic synthetic catalogue and change feed.
+
+    Listing i (inner_id FIRST_INNER_ID + i) is generated from its own seeded
+    random generator, so any page can be served without keeping full
+    listings in memory (only mark/year/price are kept for filtering). The change feed covers `days` days ending
+    yesterday, changes_per_day changes each; "added" changes create listings
+    after the catalogue, "changed"/"removed" ones refer to catalogue listings.
+    """
+
+    def __init__(self, listings: int, changes_per_day: int, days: int, seed: int = 1):
+        """
+        Initialize dataset.
+
+        Args:
+            listings: Number of active listings in /offers
+            changes_per_day: Number of /changes records per day
+            days: Number of days covered by the change feed (ending yesterday)
+            seed: Random seed
+        """
+        self.listings = listings
+        self.changes_per_day = changes_per_day
+        self.seed = seed
+        self.first_date = date.today() - timedelta(days=days)
+        self.total_changes = changes_per_day * days
+        # Filterable attributes of all listings: (mark, year, price)
+        self.attributes: List[Tuple[str, int, int]] = [self._attributes(i) for i in range(listings)]
+        self._matches: Dict[Tuple, List[int]] = {}
+
+    def _random(self, kind: int, index: int) -> random.Random:
+        return random.Random((self.seed * 1_000_003 + index) * 4 + kind)
+
+    def _attributes(self, index: int) -> Tuple[str, int, int]:
+        """Get (mark, year, price) of a listing."""
+        rng = self._random(0, index)
+        year = rng.randint(2006, 2025)
+        # Older cars are cheaper; prices spread over 20k .. ~1M CNY
+        price = int(rng.lognormvariate(11.5, 0.7) * (0.6 + (year - 2006) / 25)) // 100 * 100
+        return rng.choices(MARK_NAMES, MARK_WEIGHTS)[0], year, max(price, 5000)
+
+    def listing(self, index: int) -> Dict[str, Any]:
+        """
+        Get full data of listing by index.
+
+        Args:
+            index: Listing index (>= listings for listings added by the change feed)
+
+        Returns:
+            Listing data as in /offers records
+        """
+        if index < self.listings:
+            mark, year, price = self.attributes[index]
+        else:
+            mark, year, price = self._attributes(index)
+        rng = self._random(1, index)
+        inner_id = str(FIRST_INNER_ID + index)
+        salon_id = str(rng.randint(100000, 999999))
+        model = rng.choice(MARKS[mark])
+        displacement = round(rng.uniform(1.0, 3.5), 1)
+        power = int(displacement * rng.randint(60, 95))
+        return {
+            'inner_id': inner_id,
+            'url': f"https://www.che168.com/dealer/{salon_id}/{inner_id}.html",
+            'mark': mark,
+            'model': model,
+            'year': year,
+            'first_registration': f"{year}-{rng.randint(1, 12):02d}",
+            'color': rng.choice(COLORS),
+            'price': price,
+            'km_age': max(0, (2026 - year) * rng.randint(5000, 20000)),
+            'engine_type': rng.choice(ENGINE_TYPES),
+            'transmission_type': rng.choice(TRANSMISSIONS),
+            'body_type': rng.choice(BODY_TYPES),
+            'address': rng.choice(CITIES),
+            'seller_type': 'dealer',
+            'is_dealer': True,
+            'section': 'б/у',
+            'salon_id': salon_id,
+            'description': DESCRIPTION * rng.randint(1, 4),
+            'displacement': displacement,
+            'power': power,
+            'offer_created': (self.first_date - timedelta(days=rng.randint(0, 365))).isoformat(),
+            'images': [
+                f"https://2sc2.autoimg.cn/escimg/auto/{inner_id}_{n}.jpg.webp"
+                for n in range(rng.randint(5, 20))
+            ],
+            'configuration': {
+                'Название модели': f"{mark} {model} {year}",
+                'Производитель': mark,
+                'Рабочий объем (л)': str(displacement),
+                'Максимальная мощность (л.с.)': str(power),
+                'Количество мест': str(rng.choice([5, 5, 5, 7])),
+                'Тип привода': rng.choice(['передний', 'задний', 'полный']),
+                'Коробка передач': rng.choice(['6-ступенчатая АКПП', 'CVT', '5-ступенчатая МКПП']),
+            },
+        }
+
+    def offer_record(self, index: int) -> Dict[str, Any]:
+        """Get /offers record of a catalogue listing."""
+        data = self.listing(index)
+        return {
+            'id': index + 1,
+            'inner_id': data['inner_id'],
+            'change_type': 'added',
+            'created_at': f"{data['offer_created']}T10:30:00Z",
+            'data': data,
+        }
+
+    def matches(self, filters: Dict[str, str]) -> List[int]:
+        """
+        Get indexes of listings matching /offers filters (cached per filter set).
+
+        Supports mark, year_from/year_to and price_from/price_to (what the
+        shard planner uses); other filters are ignored.
+        """
+        key = tuple(sorted(filters.items()))
+        if key not in self._matches:
+            mark = filters.get('mark', '').lower()
+            year_from = int(filters.get('year_from', 0))
+            year_to = int(filters.get('year_to', 9999))
+            price_from = float(filters.get('price_from', 0))
+            price_to = float(filters.get('price_to', float('inf')))
+            if len(self._matches) >= 4096:
+                self._matches.clear()
+            self._matches[key] = [
+                i for i, (listing_mark, year, price) in enumerate(self.attributes)
+                if (not mark or listing_mark.lower() == mark)
+                and year_from <= year <= year_to
+                and price_from <= price <= price_to
+            ]
+        return self._matches[key]
+
+    def change_id_for(self, day: date) -> int:
+        """Get first change_id of a date (past the end of the feed for today and later)."""
+        offset = max(0, (day - self.first_date).days) * self.changes_per_day
+        return FIRST_CHANGE_ID + min(offset, self.total_changes)
+
+    def change(self, change_id: int) -> Dict[str, Any]:
+        """Get one /changes record."""
+        number = change_id - FIRST_CHANGE_ID
+        rng = self._random(2, number)
+        created_at = datetime.combine(
+            self.first_date + timedelta(days=number // self.changes_per_day),
+            datetime.min.time()
+        ) + timedelta(seconds=(number % self.changes_per_day) * 86400 // self.changes_per_day)
+        kind = rng.random()
+
+        if kind < 0.3 or self.listings == 0:
+            data = self.listing(self.listings + number)
+            inner_id = data['inner_id']
+            change_type = 'added'
+        else:
+            target = rng.randrange(self.listings)
+            inner_id = str(FIRST_INNER_ID + target)
+            if kind < 0.85:
+                data = {'new_price': max(1000, self.attributes[target][2] - rng.randint(1, 20) * 100)}
+                change_type = 'changed'
+            else:
+                data = {}
+                change_type = 'removed'
+        return {
+            'id': change_id,
+            'inner_id': inner_id,
+            'change_type': change_type,
+            'created_at': created_at.isoformat() + '.000+03:00',
+            'data': data,
+        }
+
+
+class MockServer:
+    """aiohttp application serving a MockDataset with latency and error injection."""
+
+    def __init__(
+        self,
+        dataset: MockDataset,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1
+    ):
+        """
+        Initialize server.
+
+        Args:
+            dataset: Served data
+            latency_ms: Mean added response latency
+            jitter_ms: Latency spread (uniform, +/-)
+            error_rate: Share of requests answered with 500
+            throttle_rate: Share of requests answered with 429 and Retry-After
+            retry_after: Retry-After value of 429 responses (seconds)
+        """
+        self.dataset = dataset
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.requests: Counter = Counter()
+        self.injected: Counter = Counter()
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application(middlewares=[self._inject])
+        app.router.add_get('/filters', self.filters)
+        app.router.add_get('/offers', self.offers)
+        app.router.add_get('/offer', self.offer)
+        app.router.add_get('/change_id', self.change_id)
+        app.router.add_get('/changes', self.changes)
+        app.router.add_get('/_stats', self.stats)
+        return app
+
+    @staticmethod
+    def _json(payload: Any, status: int = 200) -> web.Response:
+        return web.Response(text=json_codec.dumps(payload), status=status, content_type='application/json')
+
+    @web.middleware
+    async def _inject(self, request: web.Request, handler):
+        """Count requests, add latency and inject errors."""
+        if request.path == '/_stats':
+            return await handler(request)
+        self.requests[request.path] += 1
+
+        if not request.query.get('api_key'):
+            return self._json({'error': 'api_key is required'}, status=401)
+
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        roll = random.random()
+        if roll < self.throttle_rate:
+            self.injected['429'] += 1
+            response = self._json({'error': 'Too Many Requests'}, status=429)
+            response.headers['Retry-After'] = str(self.retry_after)
+            return response
+        if roll < self.throttle_rate + self.error_rate:
+            self.injected['500'] += 1
+            return self._json({'error': 'Internal Server Error'}, status=500)
+        return await handler(request)
+
+    async def filters(self, request: web.Request) -> web.Response:
+        return self._json({
+            'mark': {mark: {'model': models} for mark, models in MARKS.items()},
+            'transmission_type': TRANSMISSIONS,
+            'color': COLORS,
+            'body_type': BODY_TYPES,
+            'engine_type': ENGINE_TYPES,
+        })
+
+    async def offers(self, request: web.Request) -> web.Response:
+        try:
+            page = int(request.query['page'])
+        except (KeyError, ValueError):
+            return self._json({'error': 'page is required'}, status=400)
+
+        filters = {name: value for name, value in request.query.items() if name not in ('api_key', 'page')}
+        matches = self.dataset.matches(filters) if filters else range(self.dataset.listings)
+        start = (page - 1) * PAGE_SIZE
+        indexes = matches[max(0, start):start + PAGE_SIZE] if page >= 1 else []
+        return self._json({
+            'result': [self.dataset.offer_record(i) for i in indexes],
+            'meta': {
+                'page': page,
+                'next_page': page + 1 if start + PAGE_SIZE < len(matches) else None,
+                'limit': PAGE_SIZE,
+            },
+        })
+
+    async def offer(self, request: web.Request) -> web.Response:
+        try:
+            index = int(request.query['inner_id']) - FIRST_INNER_ID
+        except (KeyError, ValueError):
+            return self._json({'error': 'inner_id is required'}, status=400)
+        if not 0 <= index < self.dataset.listings + self.dataset.total_changes:
+            return self._json({'error': 'Offer not found'}, status=404)
+        return self._json(self.dataset.listing(index))
+
+    async def change_id(self, request: web.Request) -> web.Response:
+        try:
+            day = date.fromisoformat(request.query['date'])
+        except (KeyError, ValueError):
+            return self._json({'error': 'date is required (yyyy-mm-dd)'}, status=400)
+        return self._json({'change_id': self.dataset.change_id_for(day)})
+
+    async def changes(self, request: web.Request) -> web.Response:
+        try:
+            change_id = max(int(request.query['change_id']), FIRST_CHANGE_ID)
+        except (KeyError, ValueError):
+            return self._json({'error': 'change_id is required'}, status=400)
+
+        end = FIRST_CHANGE_ID + self.dataset.total_changes
+        last = min(change_id + PAGE_SIZE, end)
+        return self._json({
+            'result': [self.dataset.change(i) for i in range(change_id, last)],
+            'meta': {
+                'cur_change_id': change_id,
+                # Caught up with the end of the feed
+                'next_change_id': last if last < end else None,
+                'limit': PAGE_SIZE,
+            },
+        })
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return self._json({'requests': dict(self.requests), 'injected': dict(self.injected)})
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Local mock of the CHE168 API')
+    parser.add_argument('--host', default='127.0.0.1', help='Listen address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Listen port (default: 8765)')
+    parser.add_argument('--listings', type=int, default=250_000, help='Listings in /offers (default: 250000)')
+    parser.add_argument('--changes-per-day', type=int, default=15_000, help='Changes per day (default: 15000)')
+    parser.add_argument('--days', type=int, default=3, help='Days of change feed ending yesterday (default: 3)')
+    parser.add_argument('--seed', type=int, default=1, help='Dataset random seed')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Added mean response latency')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Latency spread (+/-)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of requests answered with 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After of 429 responses (seconds)')
+    args = parser.parse_args()
+
+    logger.info(
+        f"Generating mock dataset: {args.listings:,} listings, "
+        f"{args.changes_per_day:,} changes/day for {args.days} day(s)"
+    )
+    dataset = MockDataset(args.listings, args.changes_per_day, args.days, seed=args.seed)
+    server = MockServer(
+        dataset,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after
+    )
+    logger.info(f"Mock CHE168 API on http://{args.host}:{args.port} (set CHE168_BASE_URL to use it)")
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,6 +27,18 @@ async def main():
         default=None,
         help='Limit number of records to process (for testing)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for normalization (0 = all CPU cores, default from config)'
+    )
+    parser.add_argument(
+        '--read',
+        choices=['stream', 'paged'],
+        default=None,
+        help='Read raw_data through one server-side cursor or one query per batch (default from config)'
+    )
     
     args = parser.parse_args()
     
@@ -37,9 +49,11 @@ async def main():
             logger.info(f"Batch size: {args.batch_size}")
         if args.limit:
             logger.info(f"Limit: {args.limit} records")
+        if args.workers is not None:
+            logger.info(f"Workers: {args.workers}")
         logger.info("=" * 60)
         
-        normalizer = DataNormalizer(batch_size=args.batch_size)
+        normalizer = DataNormalizer(batch_size=args.batch_size, workers=args.workers, read_mode=args.read)
         stats = await normalizer.normalize(limit=args.limit)
         
         logger.info("=" * 60)
@@ -47,7 +61,7 @@ async def main():
         logger.info(f"Statistics:")
         logger.info(f"  - Records processed: {stats['total_processed']}")
         logger.info(f"  - Records created: {stats['total_created']}")
-        logger.info(f"  - Records updated: {stats['total_updated']}")
+        logger.info(f"  - Records updated: {stats['total_updated']} (changed fields only: {stats['total_delta']})")
         logger.info(f"  - Errors: {stats['total_errors']}")
         logger.info(f"  - Batches: {stats['total_batches']}")
         logger.info("=" * 60)
@@ -0,0 +1,124 @@
+"""Script for rebuilding listings as of a date from the stored change events (raw_changes)."""
+
+import asyncio
+import re
+import sys
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import MetaData, text
+
+from app.database.connection import AsyncSessionLocal
+from app.loaders.change_store import iter_changes
+from app.loaders.daily_updater import DailyUpdater
+from app.loaders.raw_data_writer import RAW_DATA_TABLE
+from app.utils.logger import logger
+from app.utils.single_instance import SingleInstance
+
+
+def parse_date(value: str):
+    """Parse YYYY-MM-DD argument."""
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+async def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Replay stored change events (raw_changes) into a copy of raw_data as of a date'
+    )
+    parser.add_argument('--as-of', type=parse_date, required=True, help='Last event date replayed (YYYY-MM-DD)')
+    parser.add_argument(
+        '--since',
+        type=parse_date,
+        default=None,
+        help='First event date replayed (default: all stored events)'
+    )
+    parser.add_argument(
+        '--table',
+        default='raw_data_rebuild',
+        help='Target table, created like raw_data (default: raw_data_rebuild; raw_data itself is refused)'
+    )
+    parser.add_argument(
+        '--keep',
+        action='store_true',
+        help='Apply on top of the current contents of the target table instead of emptying it first '
+             '(e.g. a restored raw_data copy from before --since)'
+    )
+    parser.add_argument('--chunk-size', type=int, default=2000, help='Events applied per transaction (default: 2000)')
+
+    args = parser.parse_args()
+
+    if not re.fullmatch(r'[a-z_][a-z0-9_]*', args.table):
+        logger.error(f"Invalid table name: {args.table}")
+        return 1
+    if args.table == RAW_DATA_TABLE.name:
+        logger.error("Refusing to rebuild into raw_data, use a separate table and swap it manually")
+        return 1
+    if args.since and args.since > args.as_of:
+        logger.error("--since is after --as-of")
+        return 1
+
+    # Same lock as daily_update.py: events must not be appended while they are read
+    with SingleInstance("daily_update"):
+        try:
+            logger.info("=" * 60)
+            logger.info(f"Rebuilding {args.table} as of {args.as_of} from raw_changes")
+            logger.info("=" * 60)
+
+            async with AsyncSessionLocal() as session:
+                await session.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {args.table} (LIKE raw_data INCLUDING ALL)"
+                ))
+                if not args.keep:
+                    await session.execute(text(f"TRUNCATE {args.table}"))
+                await session.commit()
+
+            # Replayed events are already stored, sync_state is not touched
+            updater = DailyUpdater(reapply=True)
+            updater.table = RAW_DATA_TABLE.to_metadata(MetaData(), name=args.table)
+
+            totals = {'events': 0, 'loaded': 0, 'updated': 0, 'removed': 0, 'duplicates': 0, 'errors': 0}
+            started = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as session:
+                    async for events in iter_changes(session, args.as_of, args.since, args.chunk_size):
+                        stats = await updater._apply_changes(events)
+                        totals['events'] += len(events)
+                        for key in ('loaded', 'updated', 'removed', 'duplicates', 'errors'):
+                            totals[key] += stats.get(key, 0)
+                        logger.info(
+                            f"Rebuild: {totals['events']:,} events | "
+                            f"up to {events[-1]['created_at'][:10]} | "
+                            f"{totals['events'] / (time.perf_counter() - started):,.0f} events/s"
+                        )
+            finally:
+                await updater.client.close()
+
+            logger.info("=" * 60)
+            logger.info(f"Rebuild of {args.table} completed!")
+            logger.info(f"Statistics:")
+            logger.info(f"  - Events replayed: {totals['events']}")
+            logger.info(f"  - Listings created: {totals['loaded']}")
+            logger.info(f"  - Listings updated: {totals['updated']}")
+            logger.info(f"  - Listings removed: {totals['removed']}")
+            logger.info(f"  - Duplicates (skipped): {totals['duplicates']}")
+            logger.info(f"  - Errors: {totals['errors']}")
+            logger.info("=" * 60)
+            return 1 if totals['errors'] else 0
+
+        except KeyboardInterrupt:
+            logger.warning("Interrupted by user")
+            return 1
+        except Exception as e:
+            logger.error(f"Fatal error: {e}", exc_info=True)
+            return 1
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -0,0 +1,105 @@
+"""Script for following the change feed continuously (instead of the daily cron run)."""
+
+import asyncio
+import signal
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.loaders.daily_updater import DailyUpdater
+from app.normalizers.data_normalizer import DataNormalizer
+from app.utils.logger import logger
+from app.utils.single_instance import SingleInstance
+
+
+async def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Follow the CHE168 change feed until stopped (SIGINT/SIGTERM)')
+    parser.add_argument(
+        '--start-date',
+        type=str,
+        default=None,
+        help='Start from the change_id of this date (format: YYYY-MM-DD) instead of the cursor in sync_state'
+    )
+    parser.add_argument(
+        '--skip-normalization',
+        action='store_true',
+        help='Do not normalize new changes when the feed is drained'
+    )
+    parser.add_argument(
+        '--normalization-batch-size',
+        type=int,
+        default=None,
+        help='Batch size for normalization (default from config)'
+    )
+    
+    args = parser.parse_args()
+    
+    start_date = None
+    if args.start_date:
+        try:
+            from datetime import datetime
+            start_date = datetime.strptime(args.start_date, '%Y-%m-%d').date()
+        except ValueError:
+            logger.error(f"Invalid date format: {args.start_date}. Use YYYY-MM-DD format")
+            return 1
+    
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            # Windows: KeyboardInterrupt ends the loop instead
+            pass
+    
+    # One normalizer for the whole tail: worker processes keep their translation caches
+    normalizer = DataNormalizer(batch_size=args.normalization_batch_size, keep_pool=True)
+    
+    async def normalize():
+        normalization_stats = await normalizer.normalize()
+        logger.info(
+            f"Normalization: processed={normalization_stats['total_processed']}, "
+            f"errors={normalization_stats['total_errors']}"
+        )
+    
+    # Same lock as daily_update.py: both move the sync_state cursor
+    with SingleInstance("daily_update"):
+        try:
+            logger.info("=" * 60)
+            logger.info("Starting change feed tail")
+            if start_date:
+                logger.info(f"Start date specified: {start_date}")
+            logger.info("=" * 60)
+            
+            updater = DailyUpdater(start_date=start_date)
+            stats = await updater.tail(stop, on_idle=None if args.skip_normalization else normalize)
+            
+            logger.info("=" * 60)
+            logger.info("Change feed tail stopped")
+            logger.info(f"Statistics:")
+            logger.info(f"  - Pages applied: {stats['pages']}")
+            logger.info(f"  - Records loaded (new): {stats['total_loaded']}")
+            logger.info(f"  - Records updated: {stats['total_updated']}")
+            logger.info(f"  - Records removed: {stats['total_removed']}")
+            logger.info(f"  - Records duplicates (skipped): {stats['total_duplicates']}")
+            logger.info(f"  - Errors: {stats['total_errors']}")
+            logger.info("=" * 60)
+            return 0
+            
+        except KeyboardInterrupt:
+            logger.warning("Interrupted by user")
+            return 1
+        except Exception as e:
+            logger.error(f"Fatal error: {e}", exc_info=True)
+            return 1
+        finally:
+            normalizer.close()
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -0,0 +1,23 @@
+"""Tests for raw_changes rows built from change events."""
+
+from datetime import date, datetime
+
+from app.loaders.change_store import change_row
+
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+def test_event_date_is_utc():
+    record = {'id': 1, 'inner_id': '1', 'change_type': 'changed', 'created_at': '2024-05-01T23:30:00-03:00'}
+
+    row = change_row(record, NOW)
+
+    assert row['event_date'] == date(2024, 5, 2)
+    assert row['created_at'] == datetime(2024, 5, 2, 2, 30)
+
+
+def test_event_without_created_at_is_not_stored():
+    record = {'id': 1, 'inner_id': '1', 'change_type': 'removed'}
+
+    assert change_row(record, NOW) is None
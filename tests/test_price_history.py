@@ -0,0 +1,72 @@
+"""Tests for price_history increments built from change events."""
+
+from datetime import datetime
+
+from app.loaders.price_history import history_row, price_points
+
+
+NOW = datetime(2024, 5, 2, 12, 0)
+
+PAGE = [
+    {'inner_id': '1', 'change_type': 'added', 'created_at': '2024-05-01T08:00:00', 'data': {'price': '8000'}},
+    {'inner_id': '1', 'change_type': 'changed', 'created_at': '2024-05-01T09:00:00', 'data': {'new_price': 7500}},
+    {'inner_id': '1', 'change_type': 'changed', 'created_at': '2024-05-01T10:00:00', 'data': {'new_price': 7000}},
+]
+
+
+def apply(stored, events):
+    """Apply events like append_prices: build the increment and merge it as ON CONFLICT does."""
+    points = price_points(events)['1']
+    last_point = (stored['recorded_at'][-1], stored['current_price']) if stored else None
+    row = history_row('1', points, last_point, NOW)
+    if row is None:
+        return stored
+    if stored is None:
+        return row
+    return {
+        **stored,
+        'recorded_at': stored['recorded_at'] + row['recorded_at'],
+        'prices': stored['prices'] + row['prices'],
+        'current_price': row['current_price'],
+        'price_drops': stored['price_drops'] + row['price_drops'],
+        'last_drop_at': row['last_drop_at'] or stored['last_drop_at'],
+    }
+
+
+def test_page_applied_once():
+    stored = apply(None, PAGE)
+
+    assert stored['prices'] == [8000, 7500, 7000]
+    assert stored['first_price'] == 8000
+    assert stored['current_price'] == 7000
+    assert stored['price_drops'] == 2
+    assert stored['last_drop_at'] == datetime(2024, 5, 1, 10, 0)
+
+
+def test_reapplied_page_is_ignored():
+    stored = apply(None, PAGE)
+
+    assert apply(stored, PAGE) == stored
+
+
+def test_reapplied_page_with_new_events():
+    stored = apply(None, PAGE[:2])
+    later = {'inner_id': '1', 'change_type': 'changed', 'created_at': '2024-05-01T11:00:00', 'data': {'new_price': 7200}}
+
+    stored = apply(stored, PAGE + [later])
+
+    assert stored['prices'] == [8000, 7500, 7000, 7200]
+    assert stored['price_drops'] == 2
+
+
+def test_repeated_price_is_dropped():
+    stored = apply(None, PAGE[:1])
+    same = {'inner_id': '1', 'change_type': 'changed', 'created_at': '2024-05-01T09:00:00', 'data': {'new_price': '8 000'}}
+
+    assert history_row('1', price_points([same])['1'], (stored['recorded_at'][-1], 8000), NOW) is None
+
+
+def test_event_without_created_at_is_skipped():
+    undated = {'inner_id': '1', 'change_type': 'changed', 'data': {'new_price': 6500}}
+
+    assert price_points(PAGE[:1] + [undated])['1'] == [(datetime(2024, 5, 1, 8, 0), 8000)]
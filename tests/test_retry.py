@@ -0,0 +1,43 @@
+"""Tests for the circuit breaker used by retry_with_policy."""
+
+import asyncio
+
+import pytest
+
+from app.utils.retry import CircuitBreaker, RetryPolicy, retry_with_policy
+
+
+POLICIES = {'other': RetryPolicy(max_attempts=1)}
+
+
+def test_cancelled_probe_releases_breaker():
+    async def scenario():
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=0)
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(3600)
+
+        probe = asyncio.create_task(retry_with_policy(
+            hang, classify=lambda e: 'other', policies=POLICIES, deadline_seconds=5, breaker=breaker
+        ))
+        await started.wait()
+        assert breaker.state == "half_open"
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        async def ok():
+            return 'ok'
+
+        # The next caller becomes the probe instead of waiting for the cancelled one
+        result = await retry_with_policy(
+            ok, classify=lambda e: 'other', policies=POLICIES, deadline_seconds=1, breaker=breaker
+        )
+        return result, breaker.state
+
+    assert asyncio.run(scenario()) == ('ok', 'closed')